@@ -0,0 +1,195 @@
+"""Benchmarks for the resume / cover-letter generation hot paths.
+
+usage (from backend/):
+    python -m benchmarks.bench_rendering                    # compare against the stored baseline
+    python -m benchmarks.bench_rendering --save-baseline    # record a new baseline
+    python -m benchmarks.bench_rendering --only build_md --threshold 0.1
+
+Exits non-zero when a case regresses beyond --threshold against the baseline.
+Pandoc/LaTeX cases are skipped when the tools are not installed.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("BASE_STORAGE_PATH", tempfile.mkdtemp(prefix="resume-bench-"))
+
+from benchmarks.harness import find_regressions, format_row, load_baseline, measure, save_baseline
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+BULLET_COUNTS = (10, 100, 1_000, 10_000)
+TAG_POOL = ["python", "devops", "security", "teaching", "robotics", "leadership", "cloud", "linux"]
+
+
+def synthetic_resume(bullets: int) -> dict:
+    """A resume.yaml-shaped dict with roughly ``bullets`` tagged bullets spread over roles and projects."""
+
+    def bullet(i: int) -> dict:
+        return {
+            "text": f"Delivered improvement {i} across the platform, reducing toil by {i % 50}%.",
+            "tags": [TAG_POOL[i % len(TAG_POOL)], TAG_POOL[(i * 3) % len(TAG_POOL)]],
+        }
+
+    per_role = 10
+    experience_bullets = bullets * 3 // 4
+    project_bullets = bullets - experience_bullets
+    return {
+        "name": "Bench Marker",
+        "location": "Anywhere",
+        "phone": "555-0100",
+        "email": "bench@example.com",
+        "summary": [bullet(i) for i in range(3)],
+        "certification": [{"header": "Cert", "text": "Certified thing", "tags": ["cloud"]}],
+        "skills": [{"header": t.title(), "skill": f"{t} tooling", "tags": [t]} for t in TAG_POOL],
+        "experience": [
+            {
+                "company": f"Company {r}",
+                "title": "Engineer",
+                "location": "Remote",
+                "dates": "2020 - 2024",
+                "bullets": [bullet(r * per_role + i) for i in range(min(per_role, experience_bullets - r * per_role))],
+            }
+            for r in range(max(1, -(-experience_bullets // per_role)))
+        ],
+        "projects": [
+            {
+                "name": f"Project {p}",
+                "dates": "2023",
+                "bullets": [bullet(p * per_role + i) for i in range(min(per_role, project_bullets - p * per_role))],
+            }
+            for p in range(max(1, -(-project_bullets // per_role)))
+        ],
+        "education": [{"school": "State University", "detail": "BSc", "year": "2010"}],
+    }
+
+
+def resume_cases(repeat: int) -> dict:
+    from services.resume_service import build_md, bullet_included, norm_tags
+
+    results = {}
+    include, exclude = {"python", "cloud"}, {"teaching"}
+    for count in BULLET_COUNTS:
+        data = synthetic_resume(count)
+        runs = repeat if count < 10_000 else max(3, repeat // 4)
+        results[f"build_md[{count}]"] = measure(lambda: build_md(data, include, exclude, "any"), repeat=runs)
+
+    tag_inputs = [None, "Python", ["Cloud ", "linux", 3], {"odd": "type"}] * 250
+    results["norm_tags[x1000]"] = measure(lambda: [norm_tags(t) for t in tag_inputs], repeat=repeat)
+    tag_sets = [norm_tags(t) for t in tag_inputs]
+    results["bullet_included[x1000]"] = measure(
+        lambda: [bullet_included(t, include, exclude, "any") for t in tag_sets], repeat=repeat
+    )
+    return results
+
+
+def cover_letter_cases(repeat: int) -> dict:
+    from database import Base, SessionLocal, engine
+    from models.models import (
+        Application, Artifact, ArtifactTypeEnum, Job, LaneEnum, Role, Section, SectionTypeEnum, User,
+        artifact_sections,
+    )
+    from services.document_service import build_cover_letter
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        user = User(username="bench", full_name="Bench Marker", email="bench@example.com",
+                    address="1 Main St", city="Town", state="ST", postal_code="00000")
+        role = Role(lane=LaneEnum.devops, core_skills="k8s")
+        db.add_all([user, role])
+        db.flush()
+        job = Job(company="Acme", title="SRE", required_skills="python", role_id=role.id)
+        db.add(job)
+        db.flush()
+        application = Application(job_id=job.id, user_id=user.id, contact="Pat")
+        db.add(application)
+        db.flush()
+        artifact = Artifact(application_id=application.id, type=ArtifactTypeEnum.cover_letter, version_name="bench")
+        db.add(artifact)
+        db.flush()
+        for order in range(1, 9):
+            section = Section(name=f"s{order}", type=SectionTypeEnum.text,
+                              content=f"Paragraph {order} about {{title}} at {{company}} using {{required_skills}}.")
+            db.add(section)
+            db.flush()
+            db.execute(artifact_sections.insert().values(
+                artifact_id=artifact.id, section_id=section.id, section_order=order))
+        db.commit()
+
+        return {"build_cover_letter[8 sections]": measure(
+            lambda: build_cover_letter("bench", application.id, db), repeat=repeat)}
+    finally:
+        db.close()
+
+
+def conversion_cases(repeat: int) -> dict:
+    if shutil.which("pandoc") is None:
+        print("pandoc not found; skipping conversion benchmarks")
+        return {}
+
+    from config.settings import BASE_STORAGE_PATH
+    from schemas.schemas import ArtifactTypeEnum
+    from services.document_service import create_pdf_from_md
+    from services.resume_service import build_md, create_odt_from_md
+
+    md_path = Path(BASE_STORAGE_PATH) / "resume.md"
+    md_path.write_text(build_md(synthetic_resume(100), set(), set(), "any"), encoding="utf-8")
+
+    runs = max(3, repeat // 5)
+    results = {"md_to_odt[100]": measure(create_odt_from_md, repeat=runs, warmup=1)}
+    if shutil.which("xelatex"):
+        results["md_to_pdf[100]"] = measure(
+            lambda: create_pdf_from_md(ArtifactTypeEnum.resume), repeat=runs, warmup=1)
+    else:
+        print("xelatex not found; skipping PDF benchmark")
+    return results
+
+
+SUITES = {
+    "build_md": resume_cases,
+    "cover_letter": cover_letter_cases,
+    "conversion": conversion_cases,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--only", choices=sorted(SUITES), action="append")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown, 0.2 == 20%%")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.only or SUITES:
+        results.update(SUITES[name](args.repeat))
+    for name, stats in results.items():
+        print(format_row(name, stats))
+
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    regressions = find_regressions(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
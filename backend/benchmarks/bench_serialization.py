@@ -0,0 +1,90 @@
+"""Compare FastAPI's response_model path with the direct TypeAdapter path on large lists.
+
+usage (from backend/):
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from typing import List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models.models import Job, JobStatusEnum, LaneEnum, Role
+from schemas.schemas import JobOut
+from services.serialization_service import dump_rows
+
+
+def make_jobs(count: int) -> list[Job]:
+    now = datetime.now(timezone.utc)
+    role = Role(id=1, lane=LaneEnum.devops, core_skills="terraform, k8s", created_at=now, updated_at=now)
+    return [
+        Job(
+            id=i,
+            company=f"Company {i}",
+            title="Site Reliability Engineer",
+            posting_url=f"https://example.com/jobs/{i}",
+            required_skills="python, postgres, kubernetes",
+            date_found=date(2024, 1, 1),
+            status=JobStatusEnum.applied,
+            fit_score=i % 10,
+            notes="notes " * 40,
+            role_id=1,
+            role=role,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+async def fastapi_path(field, rows) -> bytes:
+    content = await serialize_response(field=field, response_content=rows)
+    # JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    import asyncio
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_jobs(args.rows)
+    field = create_response_field(name="response", type_=List[JobOut], mode="serialization")
+
+    baseline = asyncio.run(fastapi_path(field, rows))
+    fast = dump_rows(JobOut, rows)
+    assert json.loads(baseline) == json.loads(fast), "serialized payloads differ"
+
+    slow_s = best_of(lambda: asyncio.run(fastapi_path(field, rows)), args.repeat)
+    fast_s = best_of(lambda: dump_rows(JobOut, rows), args.repeat)
+    print(f"rows={args.rows} bytes={len(fast)}")
+    print(f"response_model + json.dumps: {slow_s * 1000:8.1f} ms")
+    print(f"TypeAdapter.dump_json:       {fast_s * 1000:8.1f} ms  ({slow_s / fast_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+# Absolute growth below which a change is treated as noise.
+NOISE_FLOOR = {"median_ms": 0.5, "peak_kib": 16.0}
+
+
+def measure(fn: Callable[[], Any], repeat: int = 20, warmup: int = 2) -> dict[str, float]:
+    """Time ``fn`` ``repeat`` times and record its peak traced memory on one extra run."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "min_ms": timings[0],
+        "median_ms": statistics.median(timings),
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max_ms": timings[-1],
+        "stdev_ms": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "peak_kib": peak / 1024,
+        "runs": len(timings),
+    }
+
+
+def format_row(name: str, stats: dict[str, float]) -> str:
+    return (
+        f"{name:<40} median {stats['median_ms']:9.3f}ms  p95 {stats['p95_ms']:9.3f}ms  "
+        f"min {stats['min_ms']:9.3f}ms  max {stats['max_ms']:9.3f}ms  peak {stats['peak_kib']:10.1f}KiB"
+    )
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, float]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Cases whose median time or peak memory grew by more than ``threshold`` (0.2 == 20%).
+
+    Growth below ``NOISE_FLOOR`` in absolute terms is ignored so sub-millisecond cases don't flap.
+    """
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for key in ("median_ms", "peak_kib"):
+            before, after = previous[key], stats[key]
+            if after - before > NOISE_FLOOR[key] and after > before * (1 + threshold):
+                regressions.append(f"{name}: {key} {before:.3f} -> {after:.3f} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
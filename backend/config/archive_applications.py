@@ -0,0 +1,31 @@
+from pathlib import Path
+import argparse
+import sys
+
+# Allow running this file directly from project root or other working dirs.
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from config.settings import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from database import SessionLocal
+from services import archival_service
+
+
+# usage:
+# docker exec -it fastapi_app python /app/config/archive_applications.py
+# docker exec -it fastapi_app python /app/config/archive_applications.py --after-days 180
+
+
+parser = argparse.ArgumentParser(description="Move inactive and stale applications, with their artifacts, to the archive tables.")
+parser.add_argument("--after-days", type=int, default=ARCHIVE_AFTER_DAYS,
+                    help="also archive applications not updated for this many days (0 only archives inactive ones)")
+parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="applications moved per transaction")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    archived = archival_service.archive_applications(db, args.after_days, args.batch_size)
+    print(f"applications archived: {archived}")
+finally:
+    db.close()
@@ -0,0 +1,37 @@
+from pathlib import Path
+import argparse
+import sys
+
+# Allow running this file directly from project root or other working dirs.
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from config.settings import ARTIFACT_GC_GRACE_SECONDS, ARTIFACT_VERSION_RETENTION
+from database import SessionLocal
+from services import artifact_store_service
+
+
+# usage:
+# docker exec -it fastapi_app python /app/config/compact_store.py
+# docker exec -it fastapi_app python /app/config/compact_store.py --keep 5 --grace 0
+
+
+parser = argparse.ArgumentParser(description="Prune old artifact versions and garbage-collect unreferenced blobs.")
+parser.add_argument("--keep", type=int, default=ARTIFACT_VERSION_RETENTION,
+                    help="versions to keep per artifact and format (0 keeps all)")
+parser.add_argument("--grace", type=int, default=ARTIFACT_GC_GRACE_SECONDS,
+                    help="seconds an unreferenced blob or stray file is kept before deletion")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    stats = {
+        "versions_pruned": artifact_store_service.prune_versions(db, args.keep),
+        "ref_counts_fixed": artifact_store_service.reconcile_ref_counts(db),
+        "blobs_collected": artifact_store_service.collect_garbage(db, args.grace),
+        "stray_files_removed": artifact_store_service.sweep_stray_files(db, args.grace),
+    }
+    print(", ".join(f"{name}: {count}" for name, count in stats.items()))
+finally:
+    db.close()
@@ -0,0 +1,37 @@
+from pathlib import Path
+import argparse
+import json
+import sys
+
+# Allow running this file directly from project root or other working dirs.
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from config.settings import IMPORT_BATCH_SIZE
+from database import SessionLocal
+from services import job_import_service
+
+
+# usage:
+# docker exec -it fastapi_app python /app/config/import_jobs.py /app/data/postings.csv
+# docker exec -it fastapi_app python /app/config/import_jobs.py /app/data/postings.ndjson --format ndjson
+
+
+parser = argparse.ArgumentParser(description="Bulk-load scraped job postings (CSV, NDJSON or a JSON array) into jobs.")
+parser.add_argument("path", type=Path, help="file to import")
+parser.add_argument("--format", choices=job_import_service.IMPORT_FORMATS,
+                    help="input format (default: from the file extension)")
+parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows staged per COPY")
+args = parser.parse_args()
+
+fmt = args.format or job_import_service.detect_format(None, args.path.name)
+db = SessionLocal()
+try:
+    with args.path.open("rb") as binary:
+        result = job_import_service.import_jobs(job_import_service.text_stream(binary), fmt, db, args.batch_size)
+    for rejected in result.pop("rejects"):
+        print(f"line {rejected['line']}: {'; '.join(rejected['errors'])}", file=sys.stderr)
+    print(json.dumps(result))
+finally:
+    db.close()
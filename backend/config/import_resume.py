@@ -0,0 +1,50 @@
+from pathlib import Path
+import argparse
+import sys
+
+# Allow running this file directly from project root or other working dirs.
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import yaml
+
+from database import SessionLocal
+from services.resume_store_service import compare_with_yaml, export_yaml, import_yaml
+
+
+# usage:
+# docker exec -it fastapi_app python /app/config/import_resume.py --profile default config/resume.yaml
+# docker exec -it fastapi_app python /app/config/import_resume.py --profile default --export > resume.yaml
+# docker exec -it fastapi_app python /app/config/import_resume.py --profile default --check config/resume.yaml
+
+
+parser = argparse.ArgumentParser(description="Import resume.yaml into the resume tables, or export a profile back to YAML.")
+parser.add_argument("path", nargs="?", default=str(BACKEND_DIR / "config" / "resume.yaml"))
+parser.add_argument("--profile", default="default")
+parser.add_argument("--export", action="store_true", help="write the profile as YAML to stdout")
+parser.add_argument("--check", action="store_true",
+                    help="compare the profile's markdown with the YAML file's for every tag filter variant")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    if args.export:
+        data = export_yaml(args.profile, db)
+        if data is None:
+            sys.exit(f"Profile {args.profile} not found")
+        yaml.safe_dump(data, sys.stdout, sort_keys=False, allow_unicode=True, width=120)
+    elif args.check:
+        data = yaml.safe_load(Path(args.path).read_text(encoding="utf-8"))
+        mismatches = compare_with_yaml(data, args.profile, db)
+        for include, exclude, mode in mismatches:
+            print(f"differs: include={sorted(include)} exclude={sorted(exclude)} mode={mode}")
+        if mismatches:
+            sys.exit(f"{len(mismatches)} filter variants render differently from {args.path}")
+        print(f"Profile {args.profile} matches {args.path} for every filter variant")
+    else:
+        data = yaml.safe_load(Path(args.path).read_text(encoding="utf-8"))
+        profile = import_yaml(data, args.profile, db)
+        print(f"Imported {args.path} into resume profile {profile.name} (id {profile.id})")
+finally:
+    db.close()
@@ -6,6 +6,8 @@ BACKEND_DIR = Path(__file__).resolve().parents[1]
 if str(BACKEND_DIR) not in sys.path:
     sys.path.insert(0, str(BACKEND_DIR))
 
+from sqlalchemy import text
+
 from database import Base, engine
 from models import models  # noqa: F401 - ensures model tables are registered on Base.metadata
 
@@ -19,6 +21,14 @@ if not Base.metadata.tables:
     raise RuntimeError("No tables found in Base.metadata. Ensure models are imported before create_all().")
 
 Base.metadata.create_all(bind=engine)
+# create_all skips tables that already exist; add columns introduced on them since.
+with engine.begin() as connection:
+    connection.execute(text("ALTER TABLE change_events ADD COLUMN IF NOT EXISTS seq INTEGER"))
+    connection.execute(text("ALTER TABLE artifact_renders ADD COLUMN IF NOT EXISTS queued_at TIMESTAMP WITH TIME ZONE"))
+# create_all skips tables that already exist; add indexes declared on them since.
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
 print(f"Initialized tables: {', '.join(sorted(Base.metadata.tables.keys()))}")
 
 
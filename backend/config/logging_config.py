@@ -3,7 +3,7 @@ from logging.handlers import RotatingFileHandler
 import os
 import sys
 import hashlib
-# from utils.settings import BASE_LOG_PATH
+from config.settings import LOG_PATH
 
 
 def setup_logger():
@@ -16,9 +16,9 @@ def setup_logger():
 
     fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 
-    os.makedirs("/log", exist_ok=True)
+    os.makedirs(LOG_PATH, exist_ok=True)
     fh = RotatingFileHandler(
-        os.path.join("/log", "info.log"),
+        os.path.join(LOG_PATH, "info.log"),
         maxBytes=10 * 1024 * 1024,
         backupCount=10,
         delay=True,               # open file lazily; helps with containers
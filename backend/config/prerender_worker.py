@@ -0,0 +1,24 @@
+from pathlib import Path
+import logging
+import sys
+
+# Allow running this file directly from project root or other working dirs.
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from services.prerender_service import start_worker
+
+
+# usage (one instance per deployment, next to API workers running without PRERENDER_ENABLED):
+# docker exec -it fastapi_app python /app/config/prerender_worker.py
+
+
+logging.basicConfig(level=logging.INFO)
+stop = start_worker()
+print("pre-render worker running; Ctrl-C to stop")
+try:
+    while not stop.wait(3600):
+        pass
+except KeyboardInterrupt:
+    stop.set()
@@ -2,4 +2,68 @@ import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 APP_NAME=os.getenv("APP_NAME", "FastAPI App")
-BASE_STORAGE_PATH = os.getenv("BASE_STORAGE_PATH", "/tmp")
\ No newline at end of file
+BASE_STORAGE_PATH = os.getenv("BASE_STORAGE_PATH", "/tmp")
+LOG_PATH = os.getenv("LOG_PATH", "/log")
+DEBUG = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+# Schema management normally runs via config/init_postgresql.py; this keeps the
+# old create-on-boot behaviour available for local development.
+CREATE_TABLES_ON_STARTUP = os.getenv("CREATE_TABLES_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+# Requests issuing more statements than this log a warning with the repeated statement shapes.
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "25"))
+# Per-request profiling is off unless a token is configured; requests opt in with X-Profile: <token>.
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(BASE_STORAGE_PATH, "profiles"))
+PROFILE_RETENTION = int(os.getenv("PROFILE_RETENTION", "50"))
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+TRACE_FILE = os.getenv("TRACE_FILE", os.path.join(BASE_STORAGE_PATH, "traces.jsonl"))
+TRACE_FILE_MAX_BYTES = int(os.getenv("TRACE_FILE_MAX_BYTES", str(20 * 1024 * 1024)))
+PDF_ENGINE = os.getenv("PDF_ENGINE", "xelatex")
+# Build precompiled LaTeX formats / caches in the background at startup.
+PDF_ENGINE_WARMUP = os.getenv("PDF_ENGINE_WARMUP", "false").lower() in ("1", "true", "yes")
+PDF_FORMAT_DIR = os.getenv("PDF_FORMAT_DIR", os.path.join(BASE_STORAGE_PATH, "latex-formats"))
+TECTONIC_CACHE_DIR = os.getenv("TECTONIC_CACHE_DIR", os.path.join(BASE_STORAGE_PATH, "tectonic-cache"))
+# Content-addressed artifact store: blobs live under objects/<aa>/<sha256>.
+ARTIFACT_STORE_PATH = os.getenv("ARTIFACT_STORE_PATH", os.path.join(BASE_STORAGE_PATH, "artifact-store"))
+# Unreferenced blobs and stray files younger than this are left alone (in-flight renders).
+ARTIFACT_GC_GRACE_SECONDS = int(os.getenv("ARTIFACT_GC_GRACE_SECONDS", "3600"))
+# Versions kept per artifact and format by compaction; 0 keeps every version.
+ARTIFACT_VERSION_RETENTION = int(os.getenv("ARTIFACT_VERSION_RETENTION", "0"))
+# Seconds between background compaction runs; 0 disables the job. Off by default: set it in
+# exactly one process (e.g. the instance that runs the pre-render worker), not in every API worker.
+ARTIFACT_COMPACTION_INTERVAL = int(os.getenv("ARTIFACT_COMPACTION_INTERVAL", "0"))
+# Background re-rendering of stored artifacts after their sections or resume data change.
+# Off by default: enable it in exactly one process (e.g. a single-worker instance or
+# config/prerender_worker.py). Other processes flag changed artifacts in artifact_renders,
+# and the worker claims the flags every PRERENDER_POLL_SECONDS.
+PRERENDER_ENABLED = os.getenv("PRERENDER_ENABLED", "false").lower() in ("1", "true", "yes")
+PRERENDER_POLL_SECONDS = float(os.getenv("PRERENDER_POLL_SECONDS", "5"))
+# A change waits this long for further edits before rendering, but never longer than the max delay.
+PRERENDER_DEBOUNCE_SECONDS = float(os.getenv("PRERENDER_DEBOUNCE_SECONDS", "5"))
+PRERENDER_MAX_DELAY_SECONDS = float(os.getenv("PRERENDER_MAX_DELAY_SECONDS", "60"))
+PRERENDER_NICE = int(os.getenv("PRERENDER_NICE", "10"))
+RESUME_YAML_POLL_SECONDS = float(os.getenv("RESUME_YAML_POLL_SECONDS", "30"))
+# Change feed (SSE): how long events stay replayable, and the keep-alive/poll interval for idle streams.
+CHANGE_FEED_RETENTION_HOURS = int(os.getenv("CHANGE_FEED_RETENTION_HOURS", "24"))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+# Delta sync (?updated_since=): how long deletes stay visible, and how far each returned watermark
+# is moved back so rows committed by transactions still in flight are picked up by the next sync.
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "90"))
+SYNC_WATERMARK_OVERLAP_SECONDS = float(os.getenv("SYNC_WATERMARK_OVERLAP_SECONDS", "5"))
+# In-process cache for hot lookups (users, roles): entries per cache and seconds before a reload.
+LOOKUP_CACHE_SIZE = int(os.getenv("LOOKUP_CACHE_SIZE", "256"))
+LOOKUP_CACHE_TTL_SECONDS = float(os.getenv("LOOKUP_CACHE_TTL_SECONDS", "300"))
+# Archival: applications that are inactive, belong to a deactivated user, or have not changed in
+# ARCHIVE_AFTER_DAYS (0 disables the age rule) move to the archived_* tables every ARCHIVE_INTERVAL_SECONDS.
+# Off by default (0): rows leave the live lists, so opt in, and set it in one process only
+# (e.g. a single worker or a cron running config/archive_applications.py), not in every API worker.
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "0"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+# Bulk job import: rows staged per COPY/insert batch, and how many rejected rows are reported back.
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+IMPORT_MAX_REJECTS = int(os.getenv("IMPORT_MAX_REJECTS", "1000"))
+# Table exports (/api/export/...): rows fetched per server-side cursor round trip and sent per chunk.
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+import logging
+import time
+
+logger = logging.getLogger("jobtelem")
+
+
+class StartupTimer:
+    """Records wall time per startup phase so slow worker boots can be traced."""
+
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def record(self, name: str, started_at: float) -> None:
+        self.phases.append((name, time.perf_counter() - started_at))
+
+    def report(self) -> dict:
+        phases = {name: round(elapsed * 1000, 2) for name, elapsed in self.phases}
+        return {"phases_ms": phases, "total_ms": round(sum(phases.values()), 2)}
+
+    def log_report(self) -> None:
+        report = self.report()
+        summary = ", ".join(f"{name}={ms}ms" for name, ms in report["phases_ms"].items())
+        logger.info(f"Startup completed in {report['total_ms']}ms ({summary})")
@@ -1,4 +1,4 @@
-from config.settings import DATABASE_URL
+from config.settings import DATABASE_URL, DB_ECHO
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import logging
@@ -10,7 +10,7 @@ logger = logging.getLogger("jobtelem")
 
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
+    echo=DB_ECHO,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
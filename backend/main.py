@@ -1,24 +1,92 @@
-from config.settings import APP_NAME
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
+from config.settings import APP_NAME, ARCHIVE_INTERVAL_SECONDS, ARTIFACT_COMPACTION_INTERVAL, COMPRESSION_LEVEL, COMPRESSION_MIN_SIZE, CREATE_TABLES_ON_STARTUP, DEBUG, PDF_ENGINE_WARMUP, PRERENDER_ENABLED, PROFILING_TOKEN, QUERY_BUDGET
 from config.logging_config import setup_logger
-from fastapi import FastAPI, Depends, HTTPException
+from config.startup import StartupTimer
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import PlainTextResponse
+from middleware.compression import CompressionMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.query_stats import QueryStatsMiddleware
+from middleware.telemetry import TelemetryMiddleware
+
+from routers import admin, diagnostics, format
+from services import query_stats_service, telemetry_service
+
+startup_timer = StartupTimer()
+startup_timer.record("imports", _import_started)
+
+
+def create_tables():
+    # Schema management lives outside the import path; see config/init_postgresql.py.
+    from database import Base, engine
+    from models import models  # noqa: F401 - ensures model tables are registered on Base.metadata
 
-from database import Base, engine, get_db
+    Base.metadata.create_all(bind=engine)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with startup_timer.phase("logging"):
+        logger = setup_logger()
+    with startup_timer.phase("instrumentation"):
+        from database import engine
 
-logger = setup_logger()
-logger.info("Backend started")
+        telemetry_service.instrument_engine(engine)
+        query_stats_service.instrument_engine(engine)
+    if CREATE_TABLES_ON_STARTUP:
+        with startup_timer.phase("create_tables"):
+            create_tables()
+    if PDF_ENGINE_WARMUP:
+        with startup_timer.phase("pdf_engine_warmup"):
+            # Only starts the background thread; formats and caches are built off the startup path.
+            from services.pdf_engine_service import start_warm_up
 
+            start_warm_up()
+    stop_compaction = None
+    if ARTIFACT_COMPACTION_INTERVAL > 0:
+        with startup_timer.phase("artifact_store"):
+            from services.artifact_store_service import start_compaction_job
 
-# settings = get_settings()
+            stop_compaction = start_compaction_job(ARTIFACT_COMPACTION_INTERVAL)
+    stop_prerender = None
+    if PRERENDER_ENABLED:
+        with startup_timer.phase("prerender"):
+            from services.prerender_service import start_worker
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+            stop_prerender = start_worker()
+    stop_archival = None
+    if ARCHIVE_INTERVAL_SECONDS > 0:
+        with startup_timer.phase("archival"):
+            from services.archival_service import start_archival_job
 
-app = FastAPI(title=APP_NAME)
+            stop_archival = start_archival_job(ARCHIVE_INTERVAL_SECONDS)
+    with startup_timer.phase("change_feed"):
+        from services.change_feed_service import start_change_feed
+
+        stop_change_feed = start_change_feed()
+    startup_timer.log_report()
+    logger.info("Backend started")
+    app.state.startup_report = startup_timer.report()
+    yield
+    for stop in (stop_compaction, stop_prerender, stop_archival, stop_change_feed):
+        if stop is not None:
+            stop.set()
+    logger.info("Backend stopped")
+
+
+app = FastAPI(title=APP_NAME, lifespan=lifespan)
+
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_SIZE, level=COMPRESSION_LEVEL)
+app.add_middleware(QueryStatsMiddleware, budget=QUERY_BUDGET, debug=DEBUG)
+app.add_middleware(TelemetryMiddleware)
+if PROFILING_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
 
 # CORS configuration
 app.add_middleware(
@@ -27,13 +95,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Query-Time-Ms"],
 )
 
-from routers import admin, format
-
 # --- App ---
 
 app.include_router(admin.router, prefix="/api")         # e.g., /api/qa
 app.include_router(format.router, prefix="/api")         # e.g., /api/q
+app.include_router(diagnostics.router, prefix="/api")
+
+
+@app.get("/api/startup/", tags=["health"])
+async def get_startup_report():
+    return startup_timer.report()
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(telemetry_service.REGISTRY.render(), media_type=telemetry_service.CONTENT_TYPE)
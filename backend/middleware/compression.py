@@ -0,0 +1,175 @@
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional: only used when installed and the client asks for it
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """Content-coding -> q-value from an Accept-Encoding header; tokens with a malformed q are dropped."""
+    weights: dict[str, float] = {}
+    for token in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in token.split(";"))
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = -1.0
+        if q >= 0:
+            weights[coding.lower()] = q
+    return weights
+
+
+def encoding_weight(weights: dict[str, float], coding: str) -> float:
+    # An explicit entry wins over "*"; a coding the client does not list is not acceptable.
+    return weights.get(coding, weights.get("*", 0.0))
+
+
+def accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    return encoding_weight(parse_accept_encoding(accept_encoding), coding) > 0
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """The acceptable coding with the highest q-value, preferring br on a tie; None for identity."""
+    weights = parse_accept_encoding(accept_encoding)
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    best = max(offered, key=lambda coding: encoding_weight(weights, coding))
+    return best if encoding_weight(weights, best) > 0 else None
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def weaken_etag(headers: MutableHeaders) -> None:
+    """A strong ETag names exact bytes; once the body is re-encoded it can only be weak."""
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """Compresses text/JSON responses above a size threshold.
+
+    Responses that already carry a Content-Encoding (e.g. pre-compressed
+    artifacts), partial content and binary types are passed through untouched.
+    Streaming bodies are gzip-compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponder(self, encoding, accepts_encoding(accept_encoding, "gzip"), send)(scope, receive)
+
+
+class _CompressedResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, stream_gzip: bool, send: Send):
+        self.middleware = middleware
+        self.app = middleware.app
+        self.encoding = encoding
+        self.stream_gzip = stream_gzip  # streams are only ever gzipped
+        self.send = send
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.streamer = None
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start_message = message
+            self.passthrough = (
+                message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type", ""))
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None and not more_body:
+            # Whole body in one message: compress only when it is worth it.
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if len(body) >= self.middleware.minimum_size:
+                body = compress(body, self.encoding, self.middleware.level)
+                headers["Content-Encoding"] = self.encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                weaken_etag(headers)
+            await self.send(self.start_message)
+            self.start_message = None
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        if self.start_message is not None and not self.stream_gzip:
+            self.passthrough = True
+            await self.send(self.start_message)
+            self.start_message = None
+            await self.send(message)
+            return
+
+        if self.start_message is not None:
+            # Streaming body: gzip incrementally so memory stays flat.
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            weaken_etag(headers)
+            self.streamer = zlib.compressobj(self.middleware.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            await self.send(self.start_message)
+            self.start_message = None
+
+        # Sync-flush every chunk so long-lived streams reach the client promptly.
+        chunk = self.streamer.compress(body)
+        chunk += self.streamer.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,52 @@
+import logging
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from services.profiling_service import ProfilerBusy, RequestProfiler, token_valid
+
+logger = logging.getLogger("jobtelem")
+
+
+class ProfilingMiddleware:
+    """Profiles a single request when it carries the admin profiling token.
+
+    Opt in with ``X-Profile: <token>`` (or ``?_profile=<token>``); pick the profiler with
+    ``X-Profile-Mode: sample|cprofile`` and add tracemalloc with ``X-Profile-Memory: 1``.
+    Only installed when PROFILING_TOKEN is set, so it costs nothing otherwise. The profilers are
+    process-global, so a profiled request arriving while another one runs gets a 409.
+    cProfile mode does not see sync endpoints' work (it runs in the threadpool); sample mode does.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        token = headers.get("x-profile") or (query.get("_profile") or [None])[0]
+        if token is None or not token_valid(token):
+            await self.app(scope, receive, send)
+            return
+
+        mode = headers.get("x-profile-mode") or (query.get("_profile_mode") or ["sample"])[0]
+        memory = (headers.get("x-profile-memory") or (query.get("_profile_memory") or ["0"])[0]) in ("1", "true")
+        profiler = RequestProfiler(mode=mode, memory=memory)
+        try:
+            profiler.start()
+        except ProfilerBusy as exc:
+            await JSONResponse({"detail": str(exc)}, status_code=409)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            label = f"{scope['method']} {scope['path']}"
+            written = await run_in_threadpool(profiler.stop_and_save, label)
+            logger.info(f"Profiled {label}: {', '.join(p.name for p in written)}")
@@ -0,0 +1,49 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from middleware.telemetry import route_template
+from services.query_stats_service import DB_QUERIES_PER_REQUEST, start_tracking, stop_tracking
+
+logger = logging.getLogger("jobtelem")
+
+
+class QueryStatsMiddleware:
+    """Counts SQL statements per request and warns when a request exceeds the query budget.
+
+    With ``debug`` on, the count and DB time are returned as X-DB-Query-Count /
+    X-DB-Query-Time-Ms response headers.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int = 25, debug: bool = False):
+        self.app = app
+        self.budget = budget
+        self.debug = debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_tracking()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.debug:
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Query-Count"] = str(stats.count)
+                headers["X-DB-Query-Time-Ms"] = f"{stats.total_time * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking(token)
+            route = route_template(scope["app"], scope)
+            DB_QUERIES_PER_REQUEST.observe(stats.count, route=route)
+            if stats.count > self.budget:
+                repeated = "; ".join(f"{n}x {shape[:200]}" for shape, n in stats.repeated()[:3])
+                logger.warning(
+                    f"{scope['method']} {route} issued {stats.count} queries "
+                    f"(budget {self.budget}, {stats.total_time * 1000:.1f}ms in DB). Repeated: {repeated or 'none'}"
+                )
@@ -0,0 +1,45 @@
+import time
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.telemetry_service import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+
+def route_template(app, scope: Scope) -> str:
+    """The matched route's path template (``/api/jobs/{job_id}``), so ids don't explode label cardinality."""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class TelemetryMiddleware:
+    """Records request count, latency and in-flight requests per route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope["app"], scope)
+        status = {"code": 500}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status["code"]))
+            HTTP_IN_FLIGHT.dec(method=method, route=route)
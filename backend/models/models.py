@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Date, ForeignKey, Enum, Table
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, Boolean, Date, ForeignKey, Enum, Index, Table, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from pydantic import BaseModel
@@ -58,6 +58,15 @@ class SectionTypeEnum(str, enum.Enum):
     header = "header"
     text = "text"
     bullets = "bullets"
+
+
+class ResumeSectionEnum(str, enum.Enum):
+    summary = "summary"
+    certification = "certification"
+    skills = "skills"
+    experience = "experience"
+    projects = "projects"
+    education = "education"
     
     
 class LabelOut(BaseModel):
@@ -92,7 +101,7 @@ class Role(Base):
     core_skills = Column(Text, nullable=False)
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     jobs = relationship("Job", lazy="selectin", back_populates="role")
@@ -112,7 +121,7 @@ class Job(Base):
     notes = Column(Text)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     role = relationship("Role", back_populates="jobs", lazy="selectin")
@@ -133,7 +142,7 @@ class Application(Base):
     notes = Column(Text)
     active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     job = relationship("Job", back_populates="applications",lazy="selectin")
@@ -153,12 +162,14 @@ class Artifact(Base):
     notes = Column(Text)
     active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     sections = relationship("Section", secondary="artifact_sections", back_populates="artifacts", lazy="selectin")
     metrics = relationship("ArtifactMetric", back_populates="artifact", lazy="selectin", cascade="all, delete-orphan")
     applications = relationship("Application", back_populates="artifacts", lazy="selectin")
+    versions = relationship("ArtifactVersion", back_populates="artifact", lazy="selectin", cascade="all, delete-orphan",
+                            order_by="ArtifactVersion.version")
     
 class ArtifactMetric(Base):
     __tablename__ = "artifact_metrics"
@@ -175,7 +186,7 @@ class ArtifactMetric(Base):
     artifact_format_details = Column(String, info="Format details: two-column/colors_used/headshot_used/serif_font")
     font_size = Column(Enum(FontSizeEnum))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
 
     # Relationships
     artifact = relationship("Artifact", back_populates="metrics", lazy="selectin")
@@ -188,7 +199,7 @@ class Section(Base):
     type = Column(Enum(SectionTypeEnum), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
     artifacts = relationship("Artifact", secondary="artifact_sections", back_populates="sections", lazy="selectin")
 
 
@@ -214,5 +225,245 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
     applications = relationship("Application", back_populates="users", lazy="selectin", cascade="all, delete-orphan")
+
+
+class ResumeProfile(Base):
+    __tablename__ = "resume_profiles"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    full_name = Column(String)
+    location = Column(String)
+    phone = Column(String)
+    email = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    entries = relationship("ResumeEntry", back_populates="profile", lazy="selectin", cascade="all, delete-orphan",
+                           order_by="ResumeEntry.position")
+    bullets = relationship("ResumeBullet", back_populates="profile", lazy="selectin", cascade="all, delete-orphan",
+                           order_by="ResumeBullet.position")
+
+
+class ResumeEntry(Base):
+    """An experience role, project or education line that groups bullets.
+
+    heading/subheading hold company/title for experience, name for projects and
+    school/detail for education; dates holds the year for education.
+    """
+    __tablename__ = "resume_entries"
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("resume_profiles.id"), nullable=False, index=True)
+    section = Column(Enum(ResumeSectionEnum), nullable=False)
+    position = Column(Integer, nullable=False, server_default="0")
+    heading = Column(String)
+    subheading = Column(String)
+    location = Column(String)
+    dates = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    profile = relationship("ResumeProfile", back_populates="entries", lazy="selectin")
+
+
+class ResumeBullet(Base):
+    """A taggable line of resume content: summary, certification, skill or entry bullet."""
+    __tablename__ = "resume_bullets"
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("resume_profiles.id"), nullable=False)
+    section = Column(Enum(ResumeSectionEnum), nullable=False)
+    entry_id = Column(Integer, ForeignKey("resume_entries.id"))
+    position = Column(Integer, nullable=False, server_default="0")
+    header = Column(String)
+    text = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    profile = relationship("ResumeProfile", back_populates="bullets", lazy="selectin")
+    tags = relationship("ResumeTag", secondary="resume_bullet_tags", lazy="selectin")
+
+    __table_args__ = (Index("ix_resume_bullets_profile_section", "profile_id", "section", "position"),)
+
+
+class ResumeTag(Base):
+    __tablename__ = "resume_tags"
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+
+# Tag index: the (tag_id, bullet_id) primary key serves "bullets with tag X" lookups,
+# the secondary index the reverse direction.
+resume_bullet_tags = Table(
+    "resume_bullet_tags",
+    Base.metadata,
+    Column("tag_id", Integer, ForeignKey("resume_tags.id"), primary_key=True),
+    Column("bullet_id", Integer, ForeignKey("resume_bullets.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_resume_bullet_tags_bullet", "bullet_id"),
+)
+
+
+class Blob(Base):
+    """An immutable file in the artifact store, keyed by the sha256 of its content."""
+    __tablename__ = "blobs"
+    hash = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    media_type = Column(String)
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (Index("ix_blobs_ref_count", "ref_count"),)
+
+
+class ArtifactVersion(Base):
+    """One rendered format of an artifact at a point in time; versions count up per artifact and format."""
+    __tablename__ = "artifact_versions"
+    id = Column(Integer, primary_key=True, index=True)
+    artifact_id = Column(Integer, ForeignKey("artifacts.id", ondelete="CASCADE"), nullable=False)
+    format = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    blob_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    artifact = relationship("Artifact", back_populates="versions", lazy="selectin")
+    blob = relationship("Blob", lazy="selectin")
+
+    __table_args__ = (UniqueConstraint("artifact_id", "format", "version", name="uq_artifact_versions_version"),)
+
+
+class ArtifactRender(Base):
+    """How an artifact was last rendered, so it can be rebuilt when its inputs change.
+
+    ``spec`` holds the export parameters as JSON; ``source_version`` the resume.yaml hash a
+    resume artifact was rendered from (cover letters depend on their sections instead).
+    ``queued_at`` is set by processes without the pre-render worker, for the worker to claim.
+    """
+    __tablename__ = "artifact_renders"
+    artifact_id = Column(Integer, ForeignKey("artifacts.id", ondelete="CASCADE"), primary_key=True)
+    spec = Column(Text, nullable=False)
+    source_version = Column(String(64))
+    rendered_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    queued_at = Column(DateTime(timezone=True))
+
+
+class ChangeEvent(Base):
+    """One committed insert/update/delete of a row in a feed table; ``seq`` is the client's resume token.
+
+    Ids are handed out when the row is written, which is not commit order. ``seq`` is assigned after
+    commit, in one pass at a time (see change_feed_service), so it only ever grows; it is null until then.
+    """
+    __tablename__ = "change_events"
+    id = Column(Integer, primary_key=True)
+    seq = Column(Integer, unique=True, index=True)
+    table_name = Column(String, nullable=False)
+    op = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    data = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class Tombstone(Base):
+    """A hard-deleted row, kept so delta syncs (``updated_since``) can tell clients to drop it."""
+    __tablename__ = "tombstones"
+    __table_args__ = (Index("ix_tombstones_table_deleted", "table_name", "deleted_at"),)
+    id = Column(Integer, primary_key=True)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+# ---- archive ----
+# Applications moved out of the live tables by services/archival_service.py, with their artifacts,
+# metrics, section links and stored versions. Rows keep their original ids; there are no foreign keys
+# to the live tables, so jobs, users and sections can change or go away independently.
+
+class ArchivedApplication(Base):
+    __tablename__ = "archived_applications"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    job_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    date_sent = Column(Date)
+    contact = Column(String)
+    contact_address = Column(String)
+    response = Column(Enum(ApplicationResponseEnum))
+    next_action_date = Column(Date)
+    notes = Column(Text)
+    active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), index=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    job = relationship("Job", primaryjoin="foreign(ArchivedApplication.job_id) == Job.id", viewonly=True, lazy="selectin")
+    users = relationship("User", primaryjoin="foreign(ArchivedApplication.user_id) == User.id", viewonly=True, lazy="selectin")
+    artifacts = relationship("ArchivedArtifact", back_populates="applications", lazy="selectin", viewonly=True,
+                             primaryjoin="ArchivedApplication.id == foreign(ArchivedArtifact.application_id)")
+
+
+class ArchivedArtifact(Base):
+    __tablename__ = "archived_artifacts"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    application_id = Column(Integer, nullable=False, index=True)
+    type = Column(Enum(ArtifactTypeEnum), nullable=False)
+    version_name = Column(String, nullable=False)
+    location = Column(String)
+    created = Column(DateTime(timezone=True))
+    notes = Column(Text)
+    active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), index=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    applications = relationship("ArchivedApplication", back_populates="artifacts", lazy="selectin", viewonly=True,
+                                primaryjoin="foreign(ArchivedArtifact.application_id) == ArchivedApplication.id")
+    metrics = relationship("ArchivedArtifactMetric", back_populates="artifact", lazy="selectin", viewonly=True,
+                           primaryjoin="ArchivedArtifact.id == foreign(ArchivedArtifactMetric.artifact_id)")
+    versions = relationship("ArchivedArtifactVersion", lazy="selectin", viewonly=True, order_by="ArchivedArtifactVersion.version",
+                            primaryjoin="ArchivedArtifact.id == foreign(ArchivedArtifactVersion.artifact_id)")
+
+
+class ArchivedArtifactMetric(Base):
+    __tablename__ = "archived_artifact_metrics"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    artifact_id = Column(Integer, nullable=False, index=True)
+    name = Column(String, nullable=False)
+    notes = Column(Text)
+    active = Column(Boolean, default=True)
+    truth_level = Column(Enum(TruthLevelEnum))
+    prompt_strictness = Column(Enum(PromptStrictnessEnum))
+    ai_generated = Column(Boolean, default=False)
+    bullet_points = Column(Boolean)
+    artifact_format_details = Column(String)
+    font_size = Column(Enum(FontSizeEnum))
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), index=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    artifact = relationship("ArchivedArtifact", back_populates="metrics", lazy="selectin", viewonly=True,
+                            primaryjoin="foreign(ArchivedArtifactMetric.artifact_id) == ArchivedArtifact.id")
+
+
+archived_artifact_sections = Table(
+    "archived_artifact_sections",
+    Base.metadata,
+    Column("artifact_id", Integer, primary_key=True),
+    Column("section_id", Integer, primary_key=True),
+    Column("section_order", Integer, nullable=False, server_default="1"),
+)
+
+
+class ArchivedArtifactVersion(Base):
+    """Stored versions of archived artifacts; they keep their blobs referenced (see reconcile_ref_counts)."""
+    __tablename__ = "archived_artifact_versions"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    artifact_id = Column(Integer, nullable=False, index=True)
+    format = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    blob_hash = Column(String(64), ForeignKey("blobs.hash"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True))
@@ -1,8 +1,42 @@
-from typing import List, Optional
+import csv
+from datetime import date, datetime
+from typing import Any, List, Optional
 from services.api_service import enum_to_labels
-from services.database_service import get_target_order, get_user_by_username
+from services.database_service import (
+    APPLICATION_OUT_OPTIONS,
+    ARCHIVED_APPLICATION_OUT_OPTIONS,
+    ARCHIVED_ARTIFACT_METRIC_OUT_OPTIONS,
+    ARCHIVED_ARTIFACT_OUT_OPTIONS,
+    ARTIFACT_METRIC_OUT_OPTIONS,
+    APPLICATION_OUT_RELATIONS,
+    ARTIFACT_OUT_OPTIONS,
+    ARTIFACT_OUT_RELATIONS,
+    JOB_OUT_OPTIONS,
+    JOB_OUT_RELATIONS,
+    ROLE_OUT_OPTIONS,
+    SECTION_OUT_OPTIONS,
+    USER_OUT_OPTIONS,
+    get_target_order,
+    invalidate_user,
+)
+from services.archival_service import with_archived
+from services.archive_service import archive_plan, load_artifacts, resolve_location, stream_archive
+from services.artifact_store_service import FORMATS_BY_MEDIA_TYPE, LOCATION_PREFIX, MEDIA_TYPES, find_version, object_path
+from services.change_feed_service import event_stream
+from services.etag_service import check_etag, collection_etag, make_etag, row_etag
+from services.job_import_service import IMPORT_FORMATS, ImportFormatError, detect_format, import_jobs, spool, text_stream
+from services.prerender_service import enqueue, section_dependents
+from services.projection_service import UnknownFieldsError, project
+from services.response_service import stored_file_response
+from services.serialization_service import json_collections_response, json_rows_response
+from services.sync_service import sync_response
+from services.table_export_service import EXPORT_FORMATS, EXPORTS, stream_export
+from services.template_service import TemplateError, validate_template, warm_section
 from database import get_db
-from models.models import LabelOut, LaneEnum, Role, Job, Application, Artifact, ArtifactMetric, Section, User, artifact_sections
+from models.models import (
+    LabelOut, LaneEnum, Role, Job, Application, Artifact, ArtifactMetric, ArtifactVersion, Blob, Section, User, artifact_sections,
+    ArchivedApplication, ArchivedArtifact, ArchivedArtifactMetric, ArchivedArtifactVersion,
+)
 from schemas.schemas import (
     ArtifactMetricOut,
     RoleOut,
@@ -15,6 +49,7 @@ from schemas.schemas import (
     ArtifactMetricCreate,
     ArtifactMetricUpdate,
     ArtifactUpdate,
+    ArtifactVersionOut,
     JobCreate,
     JobUpdate,
     RoleCreate,
@@ -28,22 +63,88 @@ from schemas.schemas import (
     UserOut,
 )
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, noload
 from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger("jobtelem")
 router = APIRouter()
 
+# Labels come from enums and never change at runtime.
+LABELS = LabelOut.from_enums()
+LABELS_ETAG = make_etag(LABELS.model_dump_json())
+LABELS_JSON = LABELS.model_dump_json().encode()
+
+# Tables nested into each response model; a change in any of them changes the ETag.
+JOB_RELATED = (Role,)
+APPLICATION_RELATED = (Job, Role, User)
+ARTIFACT_RELATED = (Application, Job, Role, User)
+METRIC_RELATED = (Artifact, Application, Job, Role, User)
+
+
+def resolve_fields(schema, model, fields: Optional[str], relations: dict, options: tuple):
+    """Response schema and loader options for an optional ``?fields=`` projection."""
+    if not fields:
+        return schema, options
+    try:
+        return project(schema, model, fields, relations)
+    except UnknownFieldsError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def check_include_archived(include_archived: bool, *other_params: Any) -> None:
+    # Projections and delta sync are defined on the live tables only; archived rows read as deleted there.
+    if include_archived and any(param is not None for param in other_params):
+        raise HTTPException(status_code=400, detail="include_archived cannot be combined with fields or updated_since")
+
+
+def commit_or_404(db: Session, detail: str) -> None:
+    # A referenced row deleted by another request between the existence check and the commit
+    # fails the foreign key; that is a missing row, not a server error.
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=detail)
+
 
 # ===================== CONTEXT =====================
 
 @router.get("/labels/", response_model=LabelOut, tags=["labels"])
-async def get_labels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    # roles = db.query(Role).offset(skip).limit(limit).all()
-    # return roles
-    return LabelOut.from_enums()
-    
+async def get_labels(request: Request, response: Response):
+    cached = check_etag(request, response, LABELS_ETAG)
+    if cached:
+        return cached
+    return LABELS
+
+
+@router.get("/bootstrap/", tags=["bootstrap"])
+async def get_bootstrap(request: Request, response: Response, limit: int = 100, db: Session = Depends(get_db)):
+    """Everything the admin UI loads on first paint, in one response.
+
+    Each list matches its list endpoint's first page (``skip=0``). All queries share this request's
+    session, so they run over one pooled connection in one transaction.
+    """
+    etag = collection_etag(
+        db, (Role, Job, Application, Artifact, Section, User), "bootstrap", limit,
+        where={User: User.is_active == True},
+    )
+    cached = check_etag(request, response, etag)
+    if cached:
+        return cached
+    collections = {
+        "roles": (RoleOut, db.query(Role).options(*ROLE_OUT_OPTIONS).limit(limit).all()),
+        "jobs": (JobOut, db.query(Job).options(*JOB_OUT_OPTIONS).limit(limit).all()),
+        "applications": (ApplicationOut, db.query(Application).options(*APPLICATION_OUT_OPTIONS).limit(limit).all()),
+        "artifacts": (ArtifactOut, db.query(Artifact).options(*ARTIFACT_OUT_OPTIONS).limit(limit).all()),
+        "sections": (SectionOut, db.query(Section).options(*SECTION_OUT_OPTIONS).order_by(Section.id.asc()).limit(limit).all()),
+        "users": (UserOut, db.query(User).options(*USER_OUT_OPTIONS).filter(User.is_active == True).limit(limit).all()),
+    }
+    return json_collections_response(collections, {"labels": LABELS_JSON}, response)
+
 
 
 # ===================== ROLES =====================
@@ -58,14 +159,24 @@ async def create_role(role: RoleCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/roles/", response_model=List[RoleOut], tags=["roles"])
-async def get_roles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    roles = db.query(Role).offset(skip).limit(limit).all()
-    return roles
+async def get_roles(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                    updated_since: Optional[datetime] = None, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, collection_etag(db, (Role,), skip, limit, updated_since))
+    if cached:
+        return cached
+    query = db.query(Role).options(*ROLE_OUT_OPTIONS)
+    if updated_since is not None:
+        return sync_response(RoleOut, query, Role, updated_since, skip, limit, db, response)
+    roles = query.offset(skip).limit(limit).all()
+    return json_rows_response(RoleOut, roles, response)
 
 
 @router.get("/roles/{role_id}", response_model=RoleOut, tags=["roles"])
-async def get_role(role_id: int, db: Session = Depends(get_db)):
-    role = db.query(Role).filter(Role.id == role_id).first()
+async def get_role(request: Request, response: Response, role_id: int, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, row_etag(db, Role, role_id))
+    if cached:
+        return cached
+    role = db.query(Role).options(*ROLE_OUT_OPTIONS).filter(Role.id == role_id).first()
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     return role
@@ -101,27 +212,61 @@ async def delete_role(role_id: int, db: Session = Depends(get_db)):
 
 @router.post("/jobs/", response_model=JobOut, tags=["jobs"])
 async def create_job(job: JobCreate, db: Session = Depends(get_db)):
-    # Verify role exists
-    role = db.query(Role).filter(Role.id == job.role_id).first()
-    if not role:
+    # Verify role exists (in the database, not the lookup cache: another worker may have deleted it)
+    if db.get(Role, job.role_id, options=[noload("*")]) is None:
         raise HTTPException(status_code=404, detail="Role not found")
     
     db_job = Job(**job.dict())
     db.add(db_job)
-    db.commit()
+    commit_or_404(db, "Role not found")
     db.refresh(db_job)
     return db_job
 
 
+@router.post("/jobs/import", tags=["jobs"])
+async def import_jobs_file(request: Request, format: Optional[str] = None, filename: Optional[str] = None,
+                           db: Session = Depends(get_db)):
+    """Bulk-load postings from the request body (CSV, NDJSON or a JSON array of ``JobCreate`` rows).
+
+    Rows may name a ``lane`` instead of a ``role_id``. Postings already stored (same posting_url,
+    or same company and title) get their posting fields updated; the rest are inserted. Invalid
+    rows are skipped and listed in ``rejects``.
+    """
+    try:
+        fmt = format or detect_format(request.headers.get("content-type"), filename)
+        if fmt not in IMPORT_FORMATS:
+            raise ImportFormatError(f"Unknown import format {fmt}; use one of {', '.join(IMPORT_FORMATS)}")
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    body = await spool(request.stream())
+    try:
+        return await run_in_threadpool(import_jobs, text_stream(body), fmt, db)
+    except (ImportFormatError, UnicodeDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=400, detail=f"Cannot read import file: {exc}")
+    finally:
+        body.close()
+
+
 @router.get("/jobs/", response_model=List[JobOut], tags=["jobs"])
-async def get_jobs(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    jobs = db.query(Job).offset(skip).limit(limit).all()
-    return jobs
+async def get_jobs(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                   updated_since: Optional[datetime] = None, fields: Optional[str] = None, db: Session = Depends(get_db)):
+    schema, options = resolve_fields(JobOut, Job, fields, JOB_OUT_RELATIONS, JOB_OUT_OPTIONS)
+    cached = check_etag(request, response, collection_etag(db, (Job, *JOB_RELATED), skip, limit, updated_since, fields))
+    if cached:
+        return cached
+    query = db.query(Job).options(*options)
+    if updated_since is not None:
+        return sync_response(schema, query, Job, updated_since, skip, limit, db, response)
+    jobs = query.offset(skip).limit(limit).all()
+    return json_rows_response(schema, jobs, response)
 
 
 @router.get("/jobs/{job_id}", response_model=JobOut, tags=["jobs"])
-async def get_job(job_id: int, db: Session = Depends(get_db)):
-    job = db.query(Job).filter(Job.id == job_id).first()
+async def get_job(request: Request, response: Response, job_id: int, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, row_etag(db, Job, job_id, JOB_RELATED))
+    if cached:
+        return cached
+    job = db.query(Job).options(*JOB_OUT_OPTIONS).filter(Job.id == job_id).first()
    
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -166,14 +311,52 @@ async def create_artifact(artifact: ArtifactCreate, db: Session = Depends(get_db
 
 
 @router.get("/artifacts/", response_model=List[ArtifactOut], tags=["artifacts"])
-async def get_artifacts(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    artifacts = db.query(Artifact).offset(skip).limit(limit).all()
-    return artifacts
+async def get_artifacts(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                        updated_since: Optional[datetime] = None, fields: Optional[str] = None,
+                        include_archived: bool = False, db: Session = Depends(get_db)):
+    check_include_archived(include_archived, updated_since, fields)
+    schema, options = resolve_fields(ArtifactOut, Artifact, fields, ARTIFACT_OUT_RELATIONS, ARTIFACT_OUT_OPTIONS)
+    tables = (Artifact, *ARTIFACT_RELATED, *((ArchivedArtifact, ArchivedApplication) if include_archived else ()))
+    etag = collection_etag(db, tables, skip, limit, updated_since, fields)
+    cached = check_etag(request, response, etag)
+    if cached:
+        return cached
+    query = db.query(Artifact).options(*options)
+    if updated_since is not None:
+        return sync_response(schema, query, Artifact, updated_since, skip, limit, db, response)
+    if include_archived:
+        archived = db.query(ArchivedArtifact).options(*ARCHIVED_ARTIFACT_OUT_OPTIONS)
+        return json_rows_response(schema, with_archived(query, archived, Artifact, ArchivedArtifact, skip, limit), response)
+    artifacts = query.offset(skip).limit(limit).all()
+    return json_rows_response(schema, artifacts, response)
+
+
+@router.get("/artifacts/archive", tags=["artifacts"])
+async def get_artifact_archive(application_id: Optional[int] = None, date_from: Optional[date] = None,
+                               date_to: Optional[date] = None, include_archived: bool = False,
+                               db: Session = Depends(get_db)):
+    """Zip of the stored artifact files plus manifest.json, for one application or applications sent in a date range."""
+    if application_id is None and date_from is None and date_to is None:
+        raise HTTPException(status_code=400, detail="Pass application_id or a date_from/date_to range")
+    # Metadata is loaded before streaming starts; the body itself only reads files.
+    plan = archive_plan(load_artifacts(db, application_id, date_from, date_to, include_archived))
+    if not plan:
+        raise HTTPException(status_code=404, detail="No artifacts found")
+    filters = {"application_id": application_id, "date_from": date_from, "date_to": date_to, "include_archived": include_archived}
+    name = f"application_{application_id}" if application_id is not None else f"artifacts_{date_from or 'start'}_{date_to or 'end'}"
+    return StreamingResponse(
+        stream_archive(plan, filters),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{name}.zip"'},
+    )
 
 
 @router.get("/artifacts/{artifact_id}", response_model=ArtifactOut, tags=["artifacts"])
-async def get_artifact(artifact_id: int, db: Session = Depends(get_db)):
-    artifact = db.query(Artifact).filter(Artifact.id == artifact_id).first()
+async def get_artifact(request: Request, response: Response, artifact_id: int, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, row_etag(db, Artifact, artifact_id, ARTIFACT_RELATED))
+    if cached:
+        return cached
+    artifact = db.query(Artifact).options(*ARTIFACT_OUT_OPTIONS).filter(Artifact.id == artifact_id).first()
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
     return artifact
@@ -205,26 +388,105 @@ async def delete_artifact(artifact_id: int, db: Session = Depends(get_db)):
     return {"message": "Artifact deleted successfully"}
 
 
+def find_artifact(artifact_id: int, include_archived: bool, db: Session) -> tuple[Any, Any]:
+    """The live artifact, else (with include_archived) the archived one, with the matching version model."""
+    artifact = db.get(Artifact, artifact_id, options=[noload("*")])
+    if artifact is not None:
+        return artifact, ArtifactVersion
+    if include_archived:
+        artifact = db.get(ArchivedArtifact, artifact_id, options=[noload("*")])
+        if artifact is not None:
+            return artifact, ArchivedArtifactVersion
+    raise HTTPException(status_code=404, detail="Artifact not found")
+
+
+@router.get("/artifacts/{artifact_id}/versions/", response_model=List[ArtifactVersionOut], tags=["artifacts"])
+async def get_artifact_versions(artifact_id: int, format: Optional[str] = None, include_archived: bool = False,
+                                db: Session = Depends(get_db)):
+    _, version_model = find_artifact(artifact_id, include_archived, db)
+    query = select(version_model).options(noload("*")).where(version_model.artifact_id == artifact_id)
+    if format:
+        query = query.where(version_model.format == format)
+    return db.scalars(query.order_by(version_model.format, version_model.version)).all()
+
+
+@router.api_route("/artifacts/{artifact_id}/download", methods=["GET", "HEAD"], tags=["artifacts"])
+async def download_artifact(request: Request, artifact_id: int, format: Optional[str] = None,
+                            version: Optional[int] = None, include_archived: bool = False,
+                            db: Session = Depends(get_db)):
+    """Stored artifact file without re-rendering: a given version/format, or the file behind Artifact.location."""
+    artifact, version_model = find_artifact(artifact_id, include_archived, db)
+    if version is not None and not format:
+        raise HTTPException(status_code=400, detail="version requires format")
+
+    if format:
+        stored = find_version(artifact_id, format, version, db, version_model)
+        path = object_path(stored.blob_hash) if stored else None
+        if path is None or not path.is_file():
+            raise HTTPException(status_code=404, detail="Artifact version not found")
+        blob_hash, fmt = stored.blob_hash, stored.format
+        filename = f"{artifact.type.value}_{artifact.id}_v{stored.version}.{fmt}"
+    else:
+        path = resolve_location(artifact.location)
+        if path is None:
+            raise HTTPException(status_code=404, detail="Artifact file not found")
+        if artifact.location.startswith(LOCATION_PREFIX):
+            blob_hash = path.name
+            blob = db.get(Blob, blob_hash, options=[noload("*")])
+            fmt = FORMATS_BY_MEDIA_TYPE.get(blob.media_type if blob else None, "")
+        else:
+            blob_hash, fmt = None, path.suffix.lstrip(".")
+        filename = f"{artifact.type.value}_{artifact.id}" + (f".{fmt}" if fmt else "")
+
+    media_type = MEDIA_TYPES.get(fmt, "application/octet-stream")
+    if blob_hash:
+        etag = f'"{blob_hash}"'
+    else:
+        stat_result = path.stat()
+        etag = f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    # An explicit version never changes bytes; "latest" can move, so it revalidates via the ETag.
+    return stored_file_response(request, path, media_type, etag, filename, immutable=version is not None)
+
+
 # ===================== SECTIONS =====================
 
+def check_section_template(content: str):
+    try:
+        validate_template(content)
+    except TemplateError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 @router.post("/sections/", response_model=SectionOut, tags=["sections"])
 async def create_section(section: SectionCreate, db: Session = Depends(get_db)):
+    check_section_template(section.content)
     db_section = Section(**section.dict())
     db.add(db_section)
     db.commit()
     db.refresh(db_section)
+    warm_section(db_section)
     return db_section
 
 
 @router.get("/sections/", response_model=List[SectionOut], tags=["sections"])
-async def get_sections(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    sections = db.query(Section).order_by(Section.id.asc()).offset(skip).limit(limit).all()
-    return sections
+async def get_sections(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                       updated_since: Optional[datetime] = None, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, collection_etag(db, (Section,), skip, limit, updated_since))
+    if cached:
+        return cached
+    query = db.query(Section).options(*SECTION_OUT_OPTIONS)
+    if updated_since is not None:
+        return sync_response(SectionOut, query, Section, updated_since, skip, limit, db, response)
+    sections = query.order_by(Section.id.asc()).offset(skip).limit(limit).all()
+    return json_rows_response(SectionOut, sections, response)
 
 
 @router.get("/sections/{section_id}", response_model=SectionOut, tags=["sections"])
-async def get_section(section_id: int, db: Session = Depends(get_db)):
-    section = db.query(Section).filter(Section.id == section_id).first()
+async def get_section(request: Request, response: Response, section_id: int, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, row_etag(db, Section, section_id))
+    if cached:
+        return cached
+    section = db.query(Section).options(*SECTION_OUT_OPTIONS).filter(Section.id == section_id).first()
     if not section:
         raise HTTPException(status_code=404, detail="Section not found")
     return section
@@ -237,12 +499,16 @@ async def update_section(section_id: int, section: SectionUpdate, db: Session =
         raise HTTPException(status_code=404, detail="Section not found")
 
     update_data = section.dict(exclude_unset=True)
+    if update_data.get("content") is not None:
+        check_section_template(update_data["content"])
     for key, value in update_data.items():
         setattr(db_section, key, value)
 
     db.add(db_section)
     db.commit()
     db.refresh(db_section)
+    warm_section(db_section)
+    enqueue(section_dependents([section_id], db), db)
     return db_section
 
 
@@ -251,8 +517,10 @@ async def delete_section(section_id: int, db: Session = Depends(get_db)):
     section = db.query(Section).filter(Section.id == section_id).first()
     if not section:
         raise HTTPException(status_code=404, detail="Section not found")
+    dependents = section_dependents([section_id], db)
     db.delete(section)
     db.commit()
+    enqueue(dependents, db)
     return {"message": "Section deleted successfully"}
 
 
@@ -295,6 +563,7 @@ async def create_section_for_artifact(
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
 
+    check_section_template(section.content)
     db_section = Section(**section.dict())
     db.add(db_section)
     db.flush()
@@ -310,6 +579,8 @@ async def create_section_for_artifact(
 
     db.commit()
     db.refresh(db_section)
+    warm_section(db_section)
+    enqueue([artifact_id], db)
     return ArtifactSectionOut(
         id=db_section.id,
         name=db_section.name,
@@ -352,6 +623,7 @@ async def attach_section_to_artifact(
         )
     )
     db.commit()
+    enqueue([artifact_id], db)
 
     return {"message": "Section attached to artifact", "section_order": target_order}
 
@@ -372,6 +644,7 @@ async def detach_section_from_artifact(artifact_id: int, section_id: int, db: Se
         .where(artifact_sections.c.section_id == section_id)
     )
     db.commit()
+    enqueue([artifact_id], db)
 
     return {"message": "Section detached from artifact"}
 
@@ -393,9 +666,36 @@ async def create_artifact_metric(artifact_id: int, metric: ArtifactMetricCreate,
 
 
 @router.get("/artifacts/{artifact_id}/metrics/", response_model=List[ArtifactMetricOut], tags=["artifact_metrics"])
-async def get_artifact_metrics(artifact_id: int, db: Session = Depends(get_db)):
-    metrics = db.query(ArtifactMetric).filter(ArtifactMetric.artifact_id == artifact_id).all()
-    return metrics
+async def get_artifact_metrics(request: Request, response: Response, artifact_id: int,
+                               updated_since: Optional[datetime] = None, include_archived: bool = False,
+                               db: Session = Depends(get_db)):
+    check_include_archived(include_archived, updated_since)
+    archive_tables = (ArchivedArtifactMetric, ArchivedArtifact, ArchivedApplication) if include_archived else ()
+    etag = collection_etag(
+        db, (ArtifactMetric, *METRIC_RELATED, *archive_tables), artifact_id, updated_since,
+        where={ArtifactMetric: ArtifactMetric.artifact_id == artifact_id,
+               ArchivedArtifactMetric: ArchivedArtifactMetric.artifact_id == artifact_id},
+    )
+    cached = check_etag(request, response, etag)
+    if cached:
+        return cached
+    query = (
+        db.query(ArtifactMetric)
+        .options(*ARTIFACT_METRIC_OUT_OPTIONS)
+        .filter(ArtifactMetric.artifact_id == artifact_id)
+    )
+    if updated_since is not None:
+        # Tombstones do not record the parent artifact: deleted ids cover every artifact's metrics.
+        return sync_response(ArtifactMetricOut, query, ArtifactMetric, updated_since, 0, None, db, response)
+    metrics = query.all()
+    if include_archived:
+        metrics += (
+            db.query(ArchivedArtifactMetric)
+            .options(*ARCHIVED_ARTIFACT_METRIC_OUT_OPTIONS)
+            .filter(ArchivedArtifactMetric.artifact_id == artifact_id)
+            .all()
+        )
+    return json_rows_response(ArtifactMetricOut, metrics, response)
 
 
 @router.put("/metrics/{metric_id}", response_model=ArtifactMetricOut, tags=["artifact_metrics"])
@@ -436,13 +736,12 @@ async def create_application(application: ApplicationCreate, db: Session = Depen
     # Temporary fallback user until auth is wired in.
     user_id = application.user_id
     if user_id is None:
-        fallback_user = get_user_by_username("heather", db)
+        fallback_user = db.query(User).options(noload("*")).filter(User.username == "heather").first()
         if not fallback_user:
             raise HTTPException(status_code=404, detail="User not found")
         user_id = fallback_user.id
     else:
-        existing_user = db.query(User).filter(User.id == user_id).first()
-        if not existing_user:
+        if db.get(User, user_id, options=[noload("*")]) is None:
             raise HTTPException(status_code=404, detail="User not found")
 
     # Explicit schema -> ORM mapping.
@@ -457,20 +756,43 @@ async def create_application(application: ApplicationCreate, db: Session = Depen
         active=application.active,
     )
     db.add(db_application)
-    db.commit()
+    commit_or_404(db, "Job or user not found")
     db.refresh(db_application)
     return db_application
 
 
 @router.get("/applications/", response_model=List[ApplicationOut], tags=["applications"])
-async def get_applications(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    applications = db.query(Application).offset(skip).limit(limit).all()
-    return applications
+async def get_applications(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                           updated_since: Optional[datetime] = None, fields: Optional[str] = None,
+                           include_archived: bool = False, db: Session = Depends(get_db)):
+    check_include_archived(include_archived, updated_since, fields)
+    schema, options = resolve_fields(ApplicationOut, Application, fields, APPLICATION_OUT_RELATIONS, APPLICATION_OUT_OPTIONS)
+    tables = (Application, *APPLICATION_RELATED, *((ArchivedApplication,) if include_archived else ()))
+    etag = collection_etag(db, tables, skip, limit, updated_since, fields)
+    cached = check_etag(request, response, etag)
+    if cached:
+        return cached
+    query = db.query(Application).options(*options)
+    if updated_since is not None:
+        return sync_response(schema, query, Application, updated_since, skip, limit, db, response)
+    if include_archived:
+        archived = db.query(ArchivedApplication).options(*ARCHIVED_APPLICATION_OUT_OPTIONS)
+        return json_rows_response(schema, with_archived(query, archived, Application, ArchivedApplication, skip, limit), response)
+    applications = query.offset(skip).limit(limit).all()
+    return json_rows_response(schema, applications, response)
 
 
 @router.get("/applications/{application_id}", response_model=ApplicationOut, tags=["applications"])
-async def get_application(application_id: int, db: Session = Depends(get_db)):
-    application = db.query(Application).filter(Application.id == application_id).first()
+async def get_application(request: Request, response: Response, application_id: int, db: Session = Depends(get_db)):
+    cached = check_etag(request, response, row_etag(db, Application, application_id, APPLICATION_RELATED))
+    if cached:
+        return cached
+    application = (
+        db.query(Application)
+        .options(*APPLICATION_OUT_OPTIONS)
+        .filter(Application.id == application_id)
+        .first()
+    )
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     return application
@@ -508,14 +830,24 @@ async def create_user(user:UserBase, db: Session = Depends(get_db)):
     db.add(db_user)    
     db.commit()
     db.refresh(db_user)
+    invalidate_user(db_user.id, db_user.username)
     logger.info(f"Created user with id {db_user.id} and username {db_user.username}")
     return db_user
 
 @router.get("/users", response_model=List[UserOut], tags=["users"])    
-async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = db.query(User).filter(User.is_active == True).offset(skip).limit(limit).all()
-    # return [User.from_orm(user) for user in users]
-    return users
+async def get_users(request: Request, response: Response, skip: int = 0, limit: int = 100,
+                    updated_since: Optional[datetime] = None, db: Session = Depends(get_db)):
+    etag = collection_etag(db, (User,), skip, limit, updated_since, where={User: User.is_active == True})
+    cached = check_etag(request, response, etag)
+    if cached:
+        return cached
+    query = db.query(User).options(*USER_OUT_OPTIONS).filter(User.is_active == True)
+    if updated_since is not None:
+        # Users are deactivated rather than deleted; deactivations are reported as deletes.
+        return sync_response(UserOut, query, User, updated_since, skip, limit, db, response,
+                             removed=User.is_active == False)
+    users = query.offset(skip).limit(limit).all()
+    return json_rows_response(UserOut, users, response)
 
 @router.delete("/users/{user_id}", tags=["users"])
 async def delete_user(user_id: int, db: Session = Depends(get_db)):
@@ -525,6 +857,7 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
     user.is_active = False
     db.add(user)
     db.commit()
+    invalidate_user(user_id, user.username)
     return {"message": "User deactivated successfully"} 
 
 @router.put("/users/update/{user_id}", response_model=UserOut, tags=["users"])
@@ -532,6 +865,7 @@ async def update_user(user_id:int, u: UserBase, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.id == user_id).first()
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_username = db_user.username
     
     update_data = u.dict(exclude_unset=True)
     for key, value in update_data.items():
@@ -540,5 +874,41 @@ async def update_user(user_id:int, u: UserBase, db: Session = Depends(get_db)):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    invalidate_user(user_id, previous_username, db_user.username)
     logger.info(f"Updated user with id {db_user.id} and username {db_user.username}")
     return db_user
+
+
+# ===================== CHANGES =====================
+@router.get("/changes/stream", tags=["changes"])
+async def stream_changes(request: Request, since: Optional[int] = None,
+                         last_event_id: Optional[int] = Header(default=None)):
+    """Server-sent events for row changes in roles, jobs, applications, artifacts, metrics and sections.
+
+    Reconnecting EventSources resume from their Last-Event-ID; ``since`` does the same for a first connect.
+    """
+    resume_from = last_event_id if last_event_id is not None else since
+    return StreamingResponse(
+        event_stream(request.is_disconnected, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ===================== EXPORT =====================
+@router.get("/export/{name}", tags=["export"])
+async def export_table(name: str, format: str = "csv"):
+    """Stream every row of an export (jobs, applications, artifact_metrics) as CSV or NDJSON.
+
+    ``applications`` carries each application's job and username; ``artifact_metrics`` the artifact it measures.
+    """
+    if name not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export {name}; use one of {', '.join(EXPORTS)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format {format}; use one of {', '.join(EXPORT_FORMATS)}")
+    filename = f"{name}_{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        stream_export(name, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
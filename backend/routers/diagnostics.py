@@ -0,0 +1,44 @@
+from typing import Optional
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from services.profiling_service import list_profiles, profiling_enabled, resolve_profile, token_valid
+from services.tracing_service import read_spans, summarize
+
+router = APIRouter()
+logger = logging.getLogger("jobtelem")
+
+
+def require_profiling_token(x_profile: Optional[str] = Header(default=None)):
+    if not profiling_enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not token_valid(x_profile):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+# ===================== PROFILES =====================
+
+@router.get("/profiles/", tags=["diagnostics"], dependencies=[Depends(require_profiling_token)])
+def get_profiles():
+    return [
+        {"name": path.name, "size": path.stat().st_size, "modified": path.stat().st_mtime}
+        for path in list_profiles()
+    ]
+
+
+@router.get("/profiles/{name}", tags=["diagnostics"], dependencies=[Depends(require_profiling_token)])
+def download_profile(name: str):
+    path = resolve_profile(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path=path, filename=path.name, media_type="application/octet-stream")
+
+
+# ===================== TRACES =====================
+
+@router.get("/traces/summary", tags=["diagnostics"])
+def get_trace_summary(limit: int = 20_000):
+    """Stage timings per artifact pipeline over the last ``limit`` recorded spans."""
+    return summarize(read_spans(limit))
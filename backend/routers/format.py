@@ -1,65 +1,222 @@
-
-from pathlib import Path
-from typing import Any
+from contextlib import contextmanager
 import logging
-from schemas.document_schemas import CoverLetterRequest
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, Iterator, Optional
+from schemas.document_schemas import CoverLetterRequest, ExportFormatEnum, ExportRequest
 from schemas.schemas import ArtifactTypeEnum
-from models.models import Application
-from services.document_service import build_cover_letter, create_cover_letter_odt_from_md, create_pdf_from_md
+from services.response_service import artifact_response, write_precompressed
 from database import get_db
-import config
 from config.settings import BASE_STORAGE_PATH
-from services.resume_service import build_md, create_odt_from_md, create_resume_pdf_from_md, create_resume_pdf_from_md, load_yaml
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from services.tracing_service import span
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
 
 router = APIRouter()
 logger = logging.getLogger("jobtelem")
 
+# The rendering services (pandoc, PDF engines, export, pre-render) are imported inside the
+# endpoints that use them, so loading the app does not load the rendering stack.
+
+
+def resolve_pdf_engine(pdf_engine: Optional[str]) -> str:
+    from services.pdf_engine_service import UnknownPdfEngineError, get_engine
+
+    try:
+        return get_engine(pdf_engine).name
+    except UnknownPdfEngineError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@contextmanager
+def render_dir() -> Iterator[Path]:
+    """A private working directory per request, so concurrent renders never share output files.
+
+    It is removed after the response has been sent (see render_response), or right away on errors.
+    """
+    work_dir = Path(tempfile.mkdtemp(prefix="render-", dir=BASE_STORAGE_PATH))
+    try:
+        yield work_dir
+    except BaseException:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        raise
+
+
+def render_response(request: Request, path: Path, media_type: str, work_dir: Path) -> Response:
+    response = artifact_response(request, path, media_type)
+    response.background = BackgroundTask(shutil.rmtree, work_dir, ignore_errors=True)
+    return response
+
+
+def publish(path: Path) -> None:
+    """Make a rendered markdown file the latest one under BASE_STORAGE_PATH, which the ODT/PDF endpoints convert.
+
+    os.replace swaps it in whole, so a concurrent reader sees the old file or the new one, never a mix.
+    """
+    staged = path.with_name(path.name + ".publish")
+    shutil.copyfile(path, staged)
+    os.replace(staged, Path(BASE_STORAGE_PATH) / path.name)
+
+
+def latest_markdown(name: str, work_dir: Path) -> Path:
+    """Snapshot the latest published markdown into the request's directory before converting it."""
+    md_path = work_dir / name
+    try:
+        shutil.copyfile(Path(BASE_STORAGE_PATH) / name, md_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{name} has not been created yet; create the markdown first")
+    return md_path
+
+
+def cover_letter_request(c: CoverLetterRequest, fmt: ExportFormatEnum, pdf_engine: Optional[str] = None) -> ExportRequest:
+    return ExportRequest(artifact_type=ArtifactTypeEnum.cover_letter, application_id=c.application_id,
+                         username=c.username, formats=[fmt], pdf_engine=pdf_engine)
+
 
 @router.post("/resume/create/md")
-def create_markdown_resume(resume_data: dict[str, Any]):
+def create_markdown_resume(request: Request, resume_data: dict[str, Any], db: Session = Depends(get_db)):
+    from services.export_service import parse_tags, resume_markdown
+
     # include = resume_data.get("include").split(",") if resume_data.get("include") else []
     # exclude = set(resume_data.get("exclude", []))
-    include = {t.strip().lower() for t in resume_data.get("include").split(",") if t.strip()}
-    exclude = {t.strip().lower() for t in resume_data.get("exclude").split(",") if t.strip()}
+    include = parse_tags(resume_data.get("include"))
+    exclude = parse_tags(resume_data.get("exclude"))
 
     mode = resume_data.get("mode", "any")
+    profile = resume_data.get("profile")
 
-    data = load_yaml(Path("config/resume.yaml"))
-    md = build_md(data, include, exclude, mode)
-    resume_path = Path(BASE_STORAGE_PATH) / "resume.md"
-    resume_path.write_text(md, encoding="utf-8")
-    return FileResponse(path=resume_path, filename=resume_path.name, media_type="text/markdown")
+    with span("resume.md", profile=profile), render_dir() as work_dir:
+        md = resume_markdown(include, exclude, mode, profile, db)
+        if md is None:
+            raise HTTPException(status_code=404, detail="Resume profile not found")
+        resume_path = work_dir / "resume.md"
+        with span("write", output_bytes=len(md.encode("utf-8"))):
+            resume_path.write_text(md, encoding="utf-8")
+            write_precompressed(resume_path, "text/markdown")
+            publish(resume_path)
+        with span("file_response"):
+            return render_response(request, resume_path, "text/markdown", work_dir)
 
 @router.post("/resume/create/odt")
-def create_odt_resume():
-    odt_path = create_odt_from_md()
-    return FileResponse(path=odt_path, filename=odt_path.name, media_type="application/vnd.oasis.opendocument.text")
+def create_odt_resume(request: Request):
+    from services.resume_service import create_odt_from_md
+
+    with span("resume.odt"), render_dir() as work_dir:
+        latest_markdown("resume.md", work_dir)
+        odt_path = create_odt_from_md(work_dir)
+        with span("file_response"):
+            return render_response(request, odt_path, "application/vnd.oasis.opendocument.text", work_dir)
 
 
 @router.post("/resume/create/pdf")
-def create_pdf_resume(pdf_engine: str = "tectonic"):
-    pdf_path = create_pdf_from_md(ArtifactTypeEnum.resume, pdf_engine=pdf_engine)
-    return FileResponse(path=pdf_path, filename=pdf_path.name, media_type="application/pdf")
+def create_pdf_resume(request: Request, pdf_engine: Optional[str] = None):
+    from services.document_service import create_pdf_from_md
+
+    pdf_engine = resolve_pdf_engine(pdf_engine)
+    with span("resume.pdf", pdf_engine=pdf_engine), render_dir() as work_dir:
+        latest_markdown("resume.md", work_dir)
+        pdf_path = create_pdf_from_md(ArtifactTypeEnum.resume, pdf_engine=pdf_engine, directory=work_dir)
+        with span("file_response"):
+            return render_response(request, pdf_path, "application/pdf", work_dir)
 
 @router.post("/cover-letter/create/md")
-def create_markdown_cover_letter(c:CoverLetterRequest, db: Session = Depends(get_db)):
+def create_markdown_cover_letter(request: Request, c:CoverLetterRequest, db: Session = Depends(get_db)):
+    from services.document_service import build_cover_letter
+    from services.prerender_service import store_renders
+
     logger.info(f"Received request to create markdown cover letter for application id {c.application_id}")
-    md = build_cover_letter(c.username, c.application_id, db)
-    artifact_name = ArtifactTypeEnum.cover_letter.value
-    cover_letter_path = Path(BASE_STORAGE_PATH) / f"{artifact_name}_{c.application_id}.md"
-    cover_letter_path.write_text(md, encoding="utf-8")
-    return FileResponse(path=cover_letter_path, filename=cover_letter_path.name, media_type="text/markdown") 
+    with span("cover_letter.md", application_id=c.application_id), render_dir() as work_dir:
+        md = build_cover_letter(c.username, c.application_id, db)
+        artifact_name = ArtifactTypeEnum.cover_letter.value
+        cover_letter_path = work_dir / f"{artifact_name}_{c.application_id}.md"
+        with span("write", output_bytes=len(md.encode("utf-8"))):
+            cover_letter_path.write_text(md, encoding="utf-8")
+            write_precompressed(cover_letter_path, "text/markdown")
+            publish(cover_letter_path)
+        with span("store"):
+            store_renders(cover_letter_request(c, ExportFormatEnum.md), {ExportFormatEnum.md: cover_letter_path}, db)
+        with span("file_response"):
+            return render_response(request, cover_letter_path, "text/markdown", work_dir)
 
 @router.post("/cover_letter/create/odt")
-def create_odt_cover_letter(c:CoverLetterRequest, db: Session = Depends(get_db)):
-    odt_path = create_cover_letter_odt_from_md(ArtifactTypeEnum.cover_letter, c.application_id)
-    return FileResponse(path=odt_path, filename=odt_path.name, media_type="application/vnd.oasis.opendocument.text")
+def create_odt_cover_letter(request: Request, c:CoverLetterRequest, db: Session = Depends(get_db)):
+    from services.document_service import create_cover_letter_odt_from_md
+    from services.prerender_service import store_renders
+
+    with span("cover_letter.odt", application_id=c.application_id), render_dir() as work_dir:
+        latest_markdown(f"{ArtifactTypeEnum.cover_letter.value}_{c.application_id}.md", work_dir)
+        odt_path = create_cover_letter_odt_from_md(ArtifactTypeEnum.cover_letter, c.application_id, work_dir)
+        with span("store"):
+            store_renders(cover_letter_request(c, ExportFormatEnum.odt), {ExportFormatEnum.odt: odt_path}, db)
+        with span("file_response"):
+            return render_response(request, odt_path, "application/vnd.oasis.opendocument.text", work_dir)
     
 @router.post("/cover-letter/create/pdf")
-def create_pdf_cover_letter(c:CoverLetterRequest, db: Session = Depends(get_db)):
+def create_pdf_cover_letter(request: Request, c:CoverLetterRequest, pdf_engine: Optional[str] = None, db: Session = Depends(get_db)):
+    from services.document_service import create_pdf_from_md
+    from services.prerender_service import store_renders
+
     logger.info(f"Received request to create PDF cover letter for application id {c.application_id}")
-    pdf_path = create_pdf_from_md(ArtifactTypeEnum.cover_letter, c.application_id, pdf_engine="tectonic")
-    return FileResponse(path=pdf_path, filename=pdf_path.name, media_type="application/pdf") 
+    pdf_engine = resolve_pdf_engine(pdf_engine)
+    with span("cover_letter.pdf", application_id=c.application_id, pdf_engine=pdf_engine), render_dir() as work_dir:
+        latest_markdown(f"{ArtifactTypeEnum.cover_letter.value}_{c.application_id}.md", work_dir)
+        pdf_path = create_pdf_from_md(ArtifactTypeEnum.cover_letter, c.application_id, pdf_engine=pdf_engine, directory=work_dir)
+        with span("store"):
+            store_renders(cover_letter_request(c, ExportFormatEnum.pdf, pdf_engine=pdf_engine), {ExportFormatEnum.pdf: pdf_path}, db)
+        with span("file_response"):
+            return render_response(request, pdf_path, "application/pdf", work_dir)
+
+
+@router.post("/export")
+def export_artifact(req: ExportRequest, db: Session = Depends(get_db)):
+    """md, ODT and PDF for one artifact in a single zip; the markdown is built once and the conversions run in parallel."""
+    from services.document_service import build_cover_letter
+    from services.export_service import export_base_name, export_zip, parse_tags, resume_markdown
+    from services.prerender_service import store_renders
+
+    if req.artifact_type == ArtifactTypeEnum.cover_letter and (req.application_id is None or not req.username):
+        raise HTTPException(status_code=422, detail="Cover letter exports need application_id and username")
+    if "pdf" in req.formats:
+        req.pdf_engine = resolve_pdf_engine(req.pdf_engine)
+    with span("export", artifact_type=req.artifact_type.value, formats=",".join(f.value for f in req.formats)):
+        if req.artifact_type == ArtifactTypeEnum.cover_letter:
+            try:
+                md = build_cover_letter(req.username, req.application_id, db)
+            except ValueError as exc:
+                raise HTTPException(status_code=404, detail=str(exc))
+        else:
+            md = resume_markdown(parse_tags(req.include), parse_tags(req.exclude), req.mode, req.profile, db)
+            if md is None:
+                raise HTTPException(status_code=404, detail="Resume profile not found")
+        data = export_zip(req, md, lambda outputs: store_renders(req, outputs, db))
+    return Response(
+        content=data,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{export_base_name(req)}.zip"'},
+    )
+
+@router.post("/resume/profiles/{profile_name}/import")
+def import_resume_profile(profile_name: str, resume_data: Optional[dict[str, Any]] = None, db: Session = Depends(get_db)):
+    """Replace a profile's content with a resume.yaml-shaped body, or config/resume.yaml when omitted."""
+    from services.prerender_service import enqueue, profile_dependents
+    from services.resume_service import load_yaml
+    from services.resume_store_service import import_yaml
+
+    data = resume_data or load_yaml(Path("config/resume.yaml"))
+    profile = import_yaml(data, profile_name, db)
+    logger.info(f"Imported resume profile {profile.name} (id {profile.id})")
+    enqueue(profile_dependents(profile_name, db), db)
+    return {"message": "Resume profile imported", "id": profile.id, "name": profile.name}
+
+
+@router.get("/resume/profiles/{profile_name}/export")
+def export_resume_profile(profile_name: str, db: Session = Depends(get_db)):
+    from services.resume_store_service import export_yaml
+
+    data = export_yaml(profile_name, db)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Resume profile not found")
+    return data
@@ -3,7 +3,28 @@ from datetime import datetime, date
 from typing import Optional
 from enum import Enum
 
+from models.models import ArtifactTypeEnum
+
 
 class CoverLetterRequest(BaseModel):
     application_id: int
-    username: str
\ No newline at end of file
+    username: str
+
+class ExportFormatEnum(str, Enum):
+    md = "md"
+    odt = "odt"
+    pdf = "pdf"
+
+
+class ExportRequest(BaseModel):
+    artifact_type: ArtifactTypeEnum
+    formats: list[ExportFormatEnum] = Field(default_factory=lambda: list(ExportFormatEnum), min_length=1)
+    # cover letters
+    application_id: Optional[int] = None
+    username: Optional[str] = None
+    # resumes
+    include: str = ""
+    exclude: str = ""
+    mode: str = "any"
+    profile: Optional[str] = None
+    pdf_engine: Optional[str] = None
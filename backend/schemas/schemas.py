@@ -170,6 +170,18 @@ class ArtifactOut(ArtifactBase):
         from_attributes = True
 
 
+class ArtifactVersionOut(BaseModel):
+    id: int
+    artifact_id: int
+    format: str
+    version: int
+    blob_hash: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class SectionBase(BaseModel):
     name: str
     type: SectionTypeEnum
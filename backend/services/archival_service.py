@@ -0,0 +1,135 @@
+"""Move finished applications out of the live tables.
+
+An application is archivable when it is inactive, belongs to a deactivated user, or has not been
+updated for ``ARCHIVE_AFTER_DAYS``. It moves to ``archived_applications`` together with its
+artifacts, metrics, section links and stored versions, in batches of one transaction each, so
+the live tables (and every hot query on them) only hold the active pipeline. Listing endpoints
+read the archive only when asked (``?include_archived=true``).
+"""
+from datetime import datetime, timedelta, timezone
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Query, Session
+
+from config.settings import ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE
+from models.models import (
+    ArchivedApplication,
+    ArchivedArtifact,
+    ArchivedArtifactMetric,
+    ArchivedArtifactVersion,
+    Application,
+    Artifact,
+    ArtifactMetric,
+    ArtifactRender,
+    ArtifactVersion,
+    User,
+    archived_artifact_sections,
+    artifact_sections,
+)
+from services.change_feed_service import record_deletes
+from services.sync_service import record_tombstones
+
+logger = logging.getLogger("jobtelem")
+
+
+def archivable(cutoff: Optional[datetime]):
+    """Condition on Application selecting rows to archive; ``cutoff`` None disables the age rule."""
+    conditions = [Application.active == False, Application.users.has(User.is_active == False)]  # noqa: E712
+    if cutoff is not None:
+        conditions.append(Application.updated_at < cutoff)
+    return or_(*conditions)
+
+
+def archive_cutoff(after_days: int = ARCHIVE_AFTER_DAYS) -> Optional[datetime]:
+    return datetime.now(timezone.utc) - timedelta(days=after_days) if after_days > 0 else None
+
+
+def _copy_rows(db: Session, source, target, where) -> None:
+    """INSERT INTO target SELECT ... FROM source WHERE ..., for the columns both tables share."""
+    names = [column.name for column in source.columns if column.name in target.columns]
+    db.execute(insert(target).from_select(names, select(*(source.c[name] for name in names)).where(where)))
+
+
+def archive_batch(db: Session, cutoff: Optional[datetime], batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Archive up to ``batch_size`` applications in one transaction; returns how many moved."""
+    application_ids = db.scalars(
+        select(Application.id).where(archivable(cutoff)).order_by(Application.id).limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not application_ids:
+        return 0
+    artifact_ids = db.scalars(select(Artifact.id).where(Artifact.application_id.in_(application_ids))).all()
+    metric_ids = db.scalars(select(ArtifactMetric.id).where(ArtifactMetric.artifact_id.in_(artifact_ids))).all()
+
+    applications = Application.__table__
+    artifacts = Artifact.__table__
+    metrics = ArtifactMetric.__table__
+    versions = ArtifactVersion.__table__
+    _copy_rows(db, applications, ArchivedApplication.__table__, applications.c.id.in_(application_ids))
+    _copy_rows(db, artifacts, ArchivedArtifact.__table__, artifacts.c.id.in_(artifact_ids))
+    _copy_rows(db, metrics, ArchivedArtifactMetric.__table__, metrics.c.id.in_(metric_ids))
+    _copy_rows(db, artifact_sections, archived_artifact_sections, artifact_sections.c.artifact_id.in_(artifact_ids))
+    # Versions move with Core statements, so the blobs' ref counts are left as they are:
+    # archived versions keep their files (reconcile_ref_counts counts them too).
+    _copy_rows(db, versions, ArchivedArtifactVersion.__table__, versions.c.artifact_id.in_(artifact_ids))
+
+    db.execute(delete(artifact_sections).where(artifact_sections.c.artifact_id.in_(artifact_ids)))
+    db.execute(delete(metrics).where(metrics.c.id.in_(metric_ids)))
+    db.execute(delete(versions).where(versions.c.artifact_id.in_(artifact_ids)))
+    db.execute(delete(ArtifactRender.__table__).where(ArtifactRender.artifact_id.in_(artifact_ids)))
+    db.execute(delete(artifacts).where(artifacts.c.id.in_(artifact_ids)))
+    db.execute(delete(applications).where(applications.c.id.in_(application_ids)))
+
+    # To live-table readers the rows are gone: tell delta syncs and the change feed.
+    for table_name, ids in (("applications", application_ids), ("artifacts", artifact_ids), ("artifact_metrics", metric_ids)):
+        record_tombstones(db, table_name, ids)
+        record_deletes(db, table_name, ids)
+    db.commit()
+    return len(application_ids)
+
+
+def archive_applications(db: Session, after_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    cutoff = archive_cutoff(after_days)
+    archived = 0
+    while True:
+        try:
+            moved = archive_batch(db, cutoff, batch_size)
+        except Exception:
+            db.rollback()
+            raise
+        archived += moved
+        if moved < batch_size:
+            return archived
+
+
+def with_archived(live: Query, archived: Query, live_model: Any, archived_model: Any, skip: int, limit: int) -> list:
+    """One page over live and archived rows together, ordered by id (archived rows keep their ids)."""
+    window = skip + limit
+    rows = live.order_by(live_model.id).limit(window).all() + archived.order_by(archived_model.id).limit(window).all()
+    return sorted(rows, key=lambda row: row.id)[skip:window]
+
+
+def start_archival_job(interval_seconds: int) -> threading.Event:
+    """Run archival every ``interval_seconds`` in a daemon thread; set the returned event to stop it."""
+    from database import SessionLocal
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval_seconds):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                archived = archive_applications(db)
+                logger.info(f"Archived {archived} applications in {time.perf_counter() - started:.2f}s")
+            except Exception as exc:  # keep the job alive; the next run retries
+                logger.warning(f"Application archival failed: {exc}")
+            finally:
+                db.close()
+
+    threading.Thread(target=run, name="application-archival", daemon=True).start()
+    return stop
@@ -0,0 +1,177 @@
+"""Stream stored artifacts and their metadata as a zip without buffering the archive."""
+from datetime import date, datetime, timezone
+import hashlib
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any, Iterator, Optional
+import zipfile
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config.settings import BASE_STORAGE_PATH
+from models.models import Application, ArchivedApplication, ArchivedArtifact, Artifact, ArtifactVersion
+from schemas.schemas import ArtifactBase, ArtifactMetricBase
+from services.artifact_store_service import LOCATION_PREFIX, object_path, resolve_store_location
+from services.database_service import ARCHIVED_ARTIFACT_ARCHIVE_OPTIONS, ARTIFACT_ARCHIVE_OPTIONS
+
+logger = logging.getLogger("jobtelem")
+
+CHUNK_SIZE = 64 * 1024
+# Already-compressed formats are stored as-is; deflating them again only costs CPU.
+STORED_SUFFIXES = {".pdf", ".odt", ".docx", ".zip", ".png", ".jpg", ".jpeg", ".gz"}
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object; zipfile then emits data descriptors instead of seeking back."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            yield b"".join(chunks)
+
+
+def resolve_location(location: Optional[str]) -> Optional[Path]:
+    """Artifact.location as a store blob or a file under BASE_STORAGE_PATH; None if unset, elsewhere or missing."""
+    if not location:
+        return None
+    if location.startswith(LOCATION_PREFIX):
+        return resolve_store_location(location)
+    root = Path(BASE_STORAGE_PATH).resolve()
+    path = Path(location)
+    path = (path if path.is_absolute() else root / path).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return path
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("_") or "artifact"
+
+
+def _artifact_query(artifact_model: Any, application_model: Any, options: tuple, application_id: Optional[int],
+                    date_from: Optional[date], date_to: Optional[date]):
+    query = (
+        select(artifact_model)
+        .join(application_model, artifact_model.application_id == application_model.id)
+        .options(*options)
+    )
+    if application_id is not None:
+        query = query.where(artifact_model.application_id == application_id)
+    if date_from is not None:
+        query = query.where(application_model.date_sent >= date_from)
+    if date_to is not None:
+        query = query.where(application_model.date_sent <= date_to)
+    return query.order_by(artifact_model.application_id, artifact_model.id)
+
+
+def load_artifacts(db: Session, application_id: Optional[int] = None, date_from: Optional[date] = None,
+                   date_to: Optional[date] = None, include_archived: bool = False) -> list[Any]:
+    """Matching artifacts; with ``include_archived`` also the archived ones, which keep their ids and versions."""
+    artifacts = list(db.scalars(_artifact_query(Artifact, Application, ARTIFACT_ARCHIVE_OPTIONS, application_id, date_from, date_to)))
+    if include_archived:
+        artifacts += db.scalars(_artifact_query(
+            ArchivedArtifact, ArchivedApplication, ARCHIVED_ARTIFACT_ARCHIVE_OPTIONS, application_id, date_from, date_to,
+        ))
+        artifacts.sort(key=lambda artifact: (artifact.application_id, artifact.id))
+    return artifacts
+
+
+def manifest_entry(artifact: Any) -> dict[str, Any]:
+    """Metadata for a live or archived artifact."""
+    application = artifact.applications
+    job = application.job if application else None
+    return {
+        "id": artifact.id,
+        "archived": isinstance(artifact, ArchivedArtifact),
+        **ArtifactBase.model_validate(artifact, from_attributes=True).model_dump(mode="json"),
+        "created_at": artifact.created_at.isoformat() if artifact.created_at else None,
+        "application": {
+            "id": application.id,
+            "date_sent": application.date_sent.isoformat() if application.date_sent else None,
+            "company": job.company if job else None,
+            "title": job.title if job else None,
+        } if application else None,
+        "metrics": [
+            {"id": m.id, **ArtifactMetricBase.model_validate(m, from_attributes=True).model_dump(mode="json")}
+            for m in artifact.metrics
+        ],
+        "files": [],
+    }
+
+
+def latest_versions(artifact: Any) -> dict[str, ArtifactVersion]:
+    latest: dict[str, ArtifactVersion] = {}
+    for version in artifact.versions:
+        if version.format not in latest or version.version > latest[version.format].version:
+            latest[version.format] = version
+    return latest
+
+
+def archive_plan(artifacts: list[Any]) -> list[tuple[dict[str, Any], list[tuple[Path, str]]]]:
+    """(manifest entry, [(source file, name in archive)]) per artifact; resolved up front so streaming needs no DB.
+
+    Stored artifacts contribute the latest version of each format; others the file behind Artifact.location.
+    """
+    plan = []
+    for artifact in artifacts:
+        base = f"application_{artifact.application_id}/{artifact.id}_{artifact.type.value}_{_safe_name(artifact.version_name)}"
+        files = []
+        for fmt, version in sorted(latest_versions(artifact).items()):
+            path = object_path(version.blob_hash)
+            if path.is_file():
+                files.append((path, f"{base}_v{version.version}.{_safe_name(fmt)}"))
+        if not files:
+            path = resolve_location(artifact.location)
+            if path is not None:
+                files.append((path, base + path.suffix))
+        plan.append((manifest_entry(artifact), files))
+    return plan
+
+
+def stream_archive(plan: list[tuple[dict[str, Any], list[tuple[Path, str]]]], filters: dict[str, Any]) -> Iterator[bytes]:
+    """Yield the zip as it is written: one file chunk in memory at a time, manifest.json last."""
+    sink = _ChunkSink()
+    entries = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for entry, files in plan:
+            entries.append(entry)
+            for path, arcname in files:
+                try:
+                    info = zipfile.ZipInfo.from_file(path, arcname)
+                    info.compress_type = zipfile.ZIP_STORED if Path(arcname).suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+                    digest = hashlib.sha256()
+                    with path.open("rb") as src, archive.open(info, "w") as dst:
+                        while chunk := src.read(CHUNK_SIZE):
+                            digest.update(chunk)
+                            dst.write(chunk)
+                            yield from sink.drain()
+                except OSError as exc:
+                    # keep going; the manifest records which file could not be read
+                    logger.warning(f"Could not read artifact file {path}: {exc}")
+                    entry["files"].append({"path": arcname, "error": str(exc)})
+                    continue
+                entry["files"].append({"path": arcname, "size": info.file_size, "sha256": digest.hexdigest()})
+                yield from sink.drain()
+
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "filters": filters,
+            "artifact_count": len(entries),
+            "file_count": sum(1 for e in entries for f in e["files"] if "sha256" in f),
+            "artifacts": entries,
+        }
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    yield from sink.drain()
@@ -0,0 +1,320 @@
+"""Content-addressed artifact store.
+
+Rendered files are copied into ``ARTIFACT_STORE_PATH/objects/<aa>/<sha256>`` once and never
+modified; identical renders across applications share one blob. ``ArtifactVersion`` rows point
+artifacts at blobs, ``Blob.ref_count`` tracks how many versions use each blob (kept current by
+the mapper events below), and compaction prunes old versions, reconciles the counts and deletes
+what nothing references any more.
+"""
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.orm import Session
+
+from config.settings import (
+    ARTIFACT_GC_GRACE_SECONDS,
+    ARTIFACT_STORE_PATH,
+    ARTIFACT_VERSION_RETENTION,
+)
+from models.models import ArchivedArtifactVersion, Artifact, ArtifactTypeEnum, ArtifactVersion, Blob
+
+logger = logging.getLogger("jobtelem")
+
+LOCATION_PREFIX = "sha256:"
+CHUNK_SIZE = 1024 * 1024
+MEDIA_TYPES = {
+    "md": "text/markdown",
+    "odt": "application/vnd.oasis.opendocument.text",
+    "pdf": "application/pdf",
+}
+FORMATS_BY_MEDIA_TYPE = {media_type: fmt for fmt, media_type in MEDIA_TYPES.items()}
+
+
+# ---- blobs on disk ----
+
+def objects_dir() -> Path:
+    return Path(ARTIFACT_STORE_PATH) / "objects"
+
+
+def object_path(blob_hash: str) -> Path:
+    return objects_dir() / blob_hash[:2] / blob_hash
+
+
+def store_location(blob_hash: str) -> str:
+    return f"{LOCATION_PREFIX}{blob_hash}"
+
+
+def resolve_store_location(location: Optional[str]) -> Optional[Path]:
+    """The blob file behind a ``sha256:<hash>`` location, or None for other locations or missing blobs."""
+    if not location or not location.startswith(LOCATION_PREFIX):
+        return None
+    blob_hash = location[len(LOCATION_PREFIX):]
+    if len(blob_hash) != 64 or not all(c in "0123456789abcdef" for c in blob_hash):
+        return None
+    path = object_path(blob_hash)
+    return path if path.is_file() else None
+
+
+def hash_file(path: Path) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as fh:
+        while chunk := fh.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def put_file(path: Path, digest: Optional[tuple[str, int]] = None) -> tuple[str, int]:
+    """Copy a file into the store unless identical content is already there. Returns (hash, size).
+
+    Pass ``digest`` when the file has already been hashed.
+    """
+    blob_hash, size = digest or hash_file(path)
+    target = object_path(blob_hash)
+    if target.exists():
+        return blob_hash, size
+    tmp_dir = Path(ARTIFACT_STORE_PATH) / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as dst, path.open("rb") as src:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.chmod(tmp_name, 0o444)
+        # Atomic within the store's filesystem; a concurrent writer of the same content just wins the rename.
+        # Garbage collection removes emptied prefix directories, so recreate it if it vanished meanwhile.
+        for attempt in range(2):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.replace(tmp_name, target)
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return blob_hash, size
+
+
+# ---- reference counting ----
+
+@event.listens_for(ArtifactVersion, "after_insert")
+def _version_inserted(mapper, connection, target):
+    connection.execute(update(Blob).where(Blob.hash == target.blob_hash).values(ref_count=Blob.ref_count + 1))
+
+
+@event.listens_for(ArtifactVersion, "after_delete")
+def _version_deleted(mapper, connection, target):
+    connection.execute(update(Blob).where(Blob.hash == target.blob_hash).values(ref_count=Blob.ref_count - 1))
+
+
+# ---- versions ----
+
+def latest_version(artifact_id: int, fmt: str, db: Session, model: type = ArtifactVersion) -> Optional[ArtifactVersion]:
+    return db.scalars(
+        select(model)
+        .where(model.artifact_id == artifact_id, model.format == fmt)
+        .order_by(model.version.desc())
+        .limit(1)
+    ).first()
+
+
+def find_version(artifact_id: int, fmt: str, version: Optional[int], db: Session,
+                 model: type = ArtifactVersion) -> Optional[ArtifactVersion]:
+    """A specific version of an artifact in ``fmt``, or the latest one when ``version`` is None.
+
+    ``model`` is ArtifactVersion, or ArchivedArtifactVersion for archived artifacts.
+    """
+    if version is None:
+        return latest_version(artifact_id, fmt, db, model)
+    return db.scalars(
+        select(model).where(
+            model.artifact_id == artifact_id,
+            model.format == fmt,
+            model.version == version,
+        )
+    ).first()
+
+
+def add_version(artifact: Artifact, fmt: str, path: Path, db: Session) -> ArtifactVersion:
+    """Store a rendered file as the next version of ``artifact`` in ``fmt``.
+
+    Re-rendering unchanged content returns the current version instead of adding a new one.
+    """
+    digest = hash_file(path)
+    blob_hash, size = digest
+    # Lock the artifact row before reading the latest version number, so concurrent renders of
+    # the same artifact (API workers, the pre-render worker) take turns instead of both inserting
+    # current + 1 and one failing on the unique version constraint.
+    db.execute(select(Artifact.id).where(Artifact.id == artifact.id).with_for_update())
+    current = latest_version(artifact.id, fmt, db)
+    if current is not None and current.blob_hash == blob_hash:
+        put_file(path, digest)  # referenced, so never collected; this only restores a lost file
+        return current
+    # Lock (or create) the blob row before touching the file: collect_garbage deletes unreferenced
+    # blobs under the same row lock, so it cannot remove this one between the copy and the version
+    # insert that raises its ref_count. Touching updated_at restarts the grace period where
+    # FOR UPDATE is a no-op (SQLite).
+    blob = db.scalars(select(Blob).where(Blob.hash == blob_hash).with_for_update()).first()
+    if blob is None:
+        db.add(Blob(hash=blob_hash, size=size, media_type=MEDIA_TYPES.get(fmt), ref_count=0))
+    else:
+        blob.updated_at = func.now()
+    db.flush()
+    put_file(path, digest)
+    version = ArtifactVersion(
+        artifact_id=artifact.id,
+        format=fmt,
+        version=(current.version + 1) if current else 1,
+        blob_hash=blob_hash,
+    )
+    db.add(version)
+    artifact.location = store_location(blob_hash)
+    db.commit()
+    return version
+
+
+def application_artifact(application_id: int, artifact_type: ArtifactTypeEnum, db: Session) -> Optional[Artifact]:
+    return db.scalars(
+        select(Artifact).where(
+            Artifact.application_id == application_id,
+            Artifact.type == artifact_type,
+        ).order_by(Artifact.id).limit(1)
+    ).first()
+
+
+def store_application_render(application_id: int, artifact_type: ArtifactTypeEnum, fmt: str, path: Path,
+                             db: Session) -> Optional[ArtifactVersion]:
+    """Keep a render as a version of the application's artifact of that type, if it has one."""
+    artifact = application_artifact(application_id, artifact_type, db)
+    if artifact is None:
+        return None
+    return add_version(artifact, fmt, path, db)
+
+
+# ---- garbage collection and compaction ----
+
+def prune_versions(db: Session, keep: int = ARTIFACT_VERSION_RETENTION) -> int:
+    """Delete all but the newest ``keep`` versions per artifact and format. ``keep`` <= 0 keeps everything."""
+    if keep <= 0:
+        return 0
+    ranked = select(
+        ArtifactVersion.id,
+        func.row_number().over(
+            partition_by=(ArtifactVersion.artifact_id, ArtifactVersion.format),
+            order_by=ArtifactVersion.version.desc(),
+        ).label("rank"),
+    ).subquery()
+    stale_ids = db.scalars(select(ranked.c.id).where(ranked.c.rank > keep)).all()
+    for version in db.scalars(select(ArtifactVersion).where(ArtifactVersion.id.in_(stale_ids))):
+        db.delete(version)  # ORM delete so the refcount event fires
+    db.commit()
+    return len(stale_ids)
+
+
+def reconcile_ref_counts(db: Session) -> int:
+    """Recount references from live and archived versions; repairs drift from deletes that bypassed the ORM."""
+    live = select(func.count(ArtifactVersion.id)).where(ArtifactVersion.blob_hash == Blob.hash).scalar_subquery()
+    archived = (
+        select(func.count(ArchivedArtifactVersion.id))
+        .where(ArchivedArtifactVersion.blob_hash == Blob.hash)
+        .scalar_subquery()
+    )
+    actual = live + archived
+    result = db.execute(update(Blob).where(Blob.ref_count != actual).values(ref_count=actual))
+    db.commit()
+    return result.rowcount or 0
+
+
+def collect_garbage(db: Session, grace_seconds: int = ARTIFACT_GC_GRACE_SECONDS) -> int:
+    """Delete blobs nobody has referenced for ``grace_seconds``, row and file, each under its row lock.
+
+    add_version takes the same lock before copying a file and adding a version, so it either
+    waits for the deletion to commit (and then re-creates row and file) or keeps the blob alive.
+    The file goes before the commit; if the commit fails, the row is left without its file, and
+    the next add_version of that content copies it back.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    unreferenced = (Blob.ref_count <= 0, func.coalesce(Blob.updated_at, Blob.created_at) < cutoff)
+    hashes = db.scalars(select(Blob.hash).where(*unreferenced)).all()
+    collected = 0
+    for blob_hash in hashes:
+        # Re-check under the lock: the blob may have been referenced or touched since the select.
+        locked = db.scalar(select(Blob.hash).where(Blob.hash == blob_hash, *unreferenced).with_for_update(skip_locked=True))
+        if locked is None:
+            db.rollback()
+            continue
+        db.execute(delete(Blob).where(Blob.hash == blob_hash))
+        path = object_path(blob_hash)
+        path.unlink(missing_ok=True)
+        try:
+            path.parent.rmdir()  # only succeeds once the prefix directory is empty
+        except OSError:
+            pass
+        db.commit()
+        collected += 1
+    return collected
+
+
+def sweep_stray_files(db: Session, grace_seconds: int = ARTIFACT_GC_GRACE_SECONDS) -> int:
+    """Remove object files with no blob row and abandoned temp files, once older than the grace period."""
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    tmp_dir = Path(ARTIFACT_STORE_PATH) / "tmp"
+    candidates = [p for p in tmp_dir.glob("*") if p.is_file()] if tmp_dir.exists() else []
+    known = set(db.scalars(select(Blob.hash)))
+    if objects_dir().exists():
+        candidates += [p for p in objects_dir().glob("*/*") if p.is_file() and p.name not in known]
+    for path in candidates:
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError as exc:
+            logger.warning(f"Could not remove stray store file {path}: {exc}")
+    return removed
+
+
+def compact(db: Session) -> dict[str, int]:
+    stats = {
+        "versions_pruned": prune_versions(db),
+        "ref_counts_fixed": reconcile_ref_counts(db),
+        "blobs_collected": collect_garbage(db),
+    }
+    stats["stray_files_removed"] = sweep_stray_files(db)
+    return stats
+
+
+def start_compaction_job(interval_seconds: int) -> threading.Event:
+    """Run compaction every ``interval_seconds`` in a daemon thread; set the returned event to stop it."""
+    from database import SessionLocal
+
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval_seconds):
+            db = SessionLocal()
+            try:
+                started = time.perf_counter()
+                stats = compact(db)
+                logger.info(f"Artifact store compaction in {time.perf_counter() - started:.2f}s: {stats}")
+            except Exception as exc:  # keep the job alive; the next run retries
+                db.rollback()
+                logger.warning(f"Artifact store compaction failed: {exc}")
+            finally:
+                db.close()
+
+    threading.Thread(target=run, name="artifact-store-compaction", daemon=True).start()
+    return stop
@@ -0,0 +1,308 @@
+"""Row-level change feed for the admin tables, served to the frontend as server-sent events.
+
+Every ORM flush that touches a feed table writes ``change_events`` rows in the same
+transaction, so events exist exactly when the change commits. Writers never wait on each other:
+event ids follow insert order, not commit order, so a transaction that commits late can make a
+small id appear after readers have moved past it. Clients therefore resume from ``seq`` instead,
+which readers assign to committed events that have none yet, in id order, one pass at a time
+(a try-lock on PostgreSQL; SQLite allows one writer at a time anyway). Whatever commits later gets
+a larger ``seq``, so a client that has seen a seq can never later find a smaller one appearing.
+Streams are woken after commit in this process; on PostgreSQL the flush also issues ``pg_notify``
+(delivered at commit), and a ``LISTEN`` thread wakes the streams of every worker. Idle streams
+re-poll at each heartbeat, which covers anything else.
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+import json
+import logging
+import select as select_module
+import threading
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import delete, event, exists, func, insert, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from config.settings import CHANGE_FEED_HEARTBEAT_SECONDS, CHANGE_FEED_RETENTION_HOURS
+from database import SessionLocal, engine
+from models.models import ChangeEvent
+
+logger = logging.getLogger("jobtelem")
+
+FEED_TABLES = {"roles", "jobs", "applications", "artifacts", "artifact_metrics", "sections", "users"}
+NOTIFY_CHANNEL = "change_feed"
+# Key of the pg_try_advisory_xact_lock held while numbering events, so one pass runs at a time.
+SEQUENCE_LOCK_KEY = 4304
+BATCH_SIZE = 500
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _row_data(obj: Any) -> str:
+    mapper = inspect(obj).mapper
+    return json.dumps({attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}, default=_json_default)
+
+
+def _event_rows(session: Session) -> list[dict[str, Any]]:
+    rows = []
+    for op, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            table = getattr(obj, "__tablename__", None)
+            if table not in FEED_TABLES or (op == "update" and not session.is_modified(obj)):
+                continue
+            rows.append({
+                "table_name": table,
+                "op": op,
+                "row_id": obj.id,
+                "data": None if op == "delete" else _row_data(obj),
+            })
+    return rows
+
+
+# ---- capture ----
+
+def _after_flush(session: Session, flush_context) -> None:
+    _write_events(session, _event_rows(session))
+
+
+def record_deletes(session: Session, table_name: str, row_ids: list[int]) -> None:
+    """Feed events for rows removed by Core statements, which the flush hook does not see."""
+    _write_events(session, [{"table_name": table_name, "op": "delete", "row_id": row_id, "data": None} for row_id in row_ids])
+
+
+def record_changes(session: Session, table_name: str, op: str, rows: list[Any]) -> None:
+    """Feed events for rows inserted or updated by Core statements; ``rows`` are full rows, e.g. from RETURNING."""
+    _write_events(session, [
+        {"table_name": table_name, "op": op, "row_id": row["id"], "data": json.dumps(dict(row), default=_json_default)}
+        for row in rows
+    ])
+
+
+def _write_events(session: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    connection = session.connection()
+    connection.execute(insert(ChangeEvent), rows)
+    if connection.dialect.name == "postgresql":
+        # NOTIFY is transactional: listeners hear it only if this transaction commits.
+        connection.execute(text("SELECT pg_notify(:channel, '')"), {"channel": NOTIFY_CHANNEL})
+    session.info["change_feed_pending"] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop("change_feed_pending", False):
+        BROKER.notify()
+
+
+def _after_soft_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("change_feed_pending", None)
+
+
+def register(session_factory=SessionLocal) -> None:
+    """Capture changes made through ``session_factory`` sessions; bulk Core statements are not captured."""
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+        event.listen(session_factory, "after_commit", _after_commit)
+        event.listen(session_factory, "after_soft_rollback", _after_soft_rollback)
+
+
+register()
+
+
+# ---- fan-out ----
+
+class ChangeBroker:
+    """Wakes waiting SSE streams, from any thread, when new events may be available."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def subscribe(self) -> asyncio.Event:
+        wakeup = asyncio.Event()
+        with self._lock:
+            self._waiters.add((asyncio.get_running_loop(), wakeup))
+        return wakeup
+
+    def unsubscribe(self, wakeup: asyncio.Event) -> None:
+        with self._lock:
+            self._waiters = {w for w in self._waiters if w[1] is not wakeup}
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, wakeup in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(wakeup.set)
+
+
+BROKER = ChangeBroker()
+
+
+# ---- reading ----
+
+def assign_sequence(db: Session) -> int:
+    """Give committed events without a ``seq`` the next numbers, in id order; returns how many. Commits.
+
+    Returns 0 without waiting when another process is already numbering; it wakes the streams when done.
+    """
+    if not db.scalar(select(exists().where(ChangeEvent.seq.is_(None)))):
+        return 0
+    connection = db.connection()
+    if connection.dialect.name == "postgresql":
+        if not connection.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": SEQUENCE_LOCK_KEY}).scalar():
+            db.rollback()
+            return 0
+    events = ChangeEvent.__table__
+    latest = events.alias("latest")
+    numbered = select(
+        events.c.id,
+        (select(func.coalesce(func.max(latest.c.seq), 0)).scalar_subquery()
+         + func.row_number().over(order_by=events.c.id)).label("seq"),
+    ).where(events.c.seq.is_(None)).subquery("numbered")
+    assigned = connection.execute(update(events).where(events.c.id == numbered.c.id).values(seq=numbered.c.seq)).rowcount
+    if assigned and connection.dialect.name == "postgresql":
+        connection.execute(text("SELECT pg_notify(:channel, '')"), {"channel": NOTIFY_CHANNEL})
+    db.commit()
+    if assigned:
+        BROKER.notify()
+    return assigned
+
+
+def read_events(since: int, limit: int = BATCH_SIZE) -> list[ChangeEvent]:
+    db = SessionLocal()
+    try:
+        assign_sequence(db)
+        return list(db.scalars(
+            select(ChangeEvent).where(ChangeEvent.seq > since).order_by(ChangeEvent.seq).limit(limit)
+        ))
+    finally:
+        db.close()
+
+
+def event_bounds() -> tuple[Optional[int], Optional[int]]:
+    """(oldest, newest) retained event seq."""
+    db = SessionLocal()
+    try:
+        assign_sequence(db)
+        return tuple(db.execute(select(func.min(ChangeEvent.seq), func.max(ChangeEvent.seq))).one())
+    finally:
+        db.close()
+
+
+def format_event(event: ChangeEvent) -> str:
+    payload = {
+        "id": event.seq,
+        "table": event.table_name,
+        "op": event.op,
+        "row_id": event.row_id,
+        "data": json.loads(event.data) if event.data else None,
+    }
+    return f"id: {event.seq}\nevent: change\ndata: {json.dumps(payload)}\n\n"
+
+
+async def event_stream(is_disconnected, since: Optional[int]) -> AsyncIterator[str]:
+    """SSE body: replay events after ``since``, then follow new ones until the client goes away.
+
+    Without a token the stream starts at the current end. A token older than the retained
+    history, or newer than any event (e.g. from before a database reset), gets a ``reset``
+    event, after which the client should reload its lists.
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    wakeup = BROKER.subscribe()
+    try:
+        oldest, newest = await run_in_threadpool(event_bounds)
+        if since is None:
+            since = newest or 0
+        elif since > (newest or 0):
+            yield f"event: reset\ndata: {json.dumps({'oldest': oldest})}\n\n"
+            since = newest or 0
+        elif oldest is not None and since < oldest - 1:
+            yield f"event: reset\ndata: {json.dumps({'oldest': oldest})}\n\n"
+            since = oldest - 1
+        yield f"retry: 3000\nevent: ready\ndata: {json.dumps({'since': since})}\n\n"
+        while not await is_disconnected():
+            # Clear before reading so a commit landing during the read still wakes the next wait.
+            wakeup.clear()
+            events = await run_in_threadpool(read_events, since)
+            for event in events:
+                yield format_event(event)
+                since = event.seq
+            if len(events) == BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(wakeup.wait(), CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        BROKER.unsubscribe(wakeup)
+
+
+# ---- background: LISTEN and retention ----
+
+def prune_events(retention_hours: int = CHANGE_FEED_RETENTION_HOURS) -> int:
+    db = SessionLocal()
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+        result = db.execute(delete(ChangeEvent).where(ChangeEvent.created_at < cutoff))
+        db.commit()
+        return result.rowcount or 0
+    finally:
+        db.close()
+
+
+def _listen(stop: threading.Event) -> None:
+    connection = engine.raw_connection()
+    try:
+        dbapi_connection = connection.dbapi_connection
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        logger.info(f"Listening for change notifications on {NOTIFY_CHANNEL}")
+        while not stop.is_set():
+            if select_module.select([dbapi_connection], [], [], 5.0) == ([], [], []):
+                continue
+            dbapi_connection.poll()
+            if dbapi_connection.notifies:
+                dbapi_connection.notifies.clear()
+                BROKER.notify()
+    finally:
+        connection.invalidate()  # autocommit LISTEN connections must not go back to the pool
+
+
+def start_change_feed() -> threading.Event:
+    """Start the LISTEN (PostgreSQL) thread and the hourly pruning of events and tombstones; set the returned event to stop them."""
+    stop = threading.Event()
+
+    def listen_forever():
+        while not stop.is_set():
+            try:
+                _listen(stop)
+            except Exception as exc:  # reconnect; streams fall back to heartbeat polling meanwhile
+                logger.warning(f"Change feed listener failed: {exc}")
+                stop.wait(5.0)
+
+    def prune_forever():
+        from services.sync_service import prune_tombstones
+
+        while not stop.wait(3600):
+            try:
+                pruned = prune_events()
+                db = SessionLocal()
+                try:
+                    pruned += prune_tombstones(db)
+                finally:
+                    db.close()
+                if pruned:
+                    logger.info(f"Pruned {pruned} change feed events and tombstones")
+            except Exception as exc:
+                logger.warning(f"Change feed pruning failed: {exc}")
+
+    if engine.dialect.name == "postgresql":
+        threading.Thread(target=listen_forever, name="change-feed-listen", daemon=True).start()
+    threading.Thread(target=prune_forever, name="change-feed-prune", daemon=True).start()
+    return stop
@@ -1,7 +1,13 @@
-from schemas.schemas import UserBase
-from models.models import Role, Job, Application, Artifact, ArtifactMetric, Section, User, artifact_sections
+from typing import Optional
 
-from sqlalchemy.orm import Session
+from schemas.schemas import UserOut
+from models.models import (
+    Role, Job, Application, Artifact, ArtifactMetric, Section, User, artifact_sections,
+    ArchivedApplication, ArchivedArtifact, ArchivedArtifactMetric,
+)
+from services.lookup_cache_service import USER_CACHE
+
+from sqlalchemy.orm import Session, noload, selectinload
 from sqlalchemy import select, func
 
 
@@ -14,13 +20,86 @@ def get_target_order(artifact_id:int, db:Session) -> int:
     target_order = next_order
     return target_order
 
-def get_user_by_username(username:str, db:Session):
-    user_orm = db.query(User).filter(User.username == username).first()
-    return UserBase.from_orm(user_orm) if user_orm else None
+def _user_snapshot(user_orm: Optional[User]) -> Optional[UserOut]:
+    """Detached copy of a user row, cached under both its id and its username."""
+    if user_orm is None:
+        return None
+    user = UserOut.model_validate(user_orm, from_attributes=True)
+    USER_CACHE.put(("id", user.id), user)
+    USER_CACHE.put(("username", user.username), user)
+    return user
+
+
+def get_user_by_username(username:str, db:Session) -> Optional[UserOut]:
+    # Cached: runs on every cover-letter render.
+    return USER_CACHE.get_or_load(
+        ("username", username),
+        lambda: _user_snapshot(db.query(User).options(noload("*")).filter(User.username == username).first()),
+    )
+
+
+def invalidate_user(user_id:int, *usernames:str) -> None:
+    USER_CACHE.invalidate(("id", user_id), *(("username", username) for username in usernames))
+
 
 # def insert_user(name:str, email:str, address:str, db:Session):
 #     new_user = User(name=name)
 #     db.add(new_user)
 #     db.commit()
 #     db.refresh(new_user)
-#     return new_user
\ No newline at end of file
+#     return new_user
+
+# Loader options matching each response schema: load exactly the relationships
+# the schema serializes and stop the selectin cascade everywhere else.
+def _leaf(relationship):
+    return selectinload(relationship).noload("*")
+
+
+def _job_out(relationship):
+    return selectinload(relationship).options(_leaf(Job.role), noload("*"))
+
+
+def _application_out(relationship):
+    return selectinload(relationship).options(
+        _job_out(Application.job), _leaf(Application.users), noload("*")
+    )
+
+
+ROLE_OUT_OPTIONS = (noload("*"),)
+JOB_OUT_OPTIONS = (_leaf(Job.role), noload("*"))
+APPLICATION_OUT_OPTIONS = (_job_out(Application.job), _leaf(Application.users), noload("*"))
+ARTIFACT_OUT_OPTIONS = (_application_out(Artifact.applications), noload("*"))
+ARTIFACT_METRIC_OUT_OPTIONS = (
+    selectinload(ArtifactMetric.artifact).options(_application_out(Artifact.applications), noload("*")),
+    noload("*"),
+)
+# Artifact metadata for archive manifests: metrics, stored versions and the application's job.
+ARTIFACT_ARCHIVE_OPTIONS = (
+    _leaf(Artifact.metrics),
+    _leaf(Artifact.versions),
+    selectinload(Artifact.applications).options(_leaf(Application.job), noload("*")),
+    noload("*"),
+)
+# The same shapes for rows in the archive tables.
+ARCHIVED_APPLICATION_OUT_OPTIONS = (_job_out(ArchivedApplication.job), _leaf(ArchivedApplication.users), noload("*"))
+_ARCHIVED_APPLICATION_OUT = selectinload(ArchivedArtifact.applications).options(*ARCHIVED_APPLICATION_OUT_OPTIONS)
+ARCHIVED_ARTIFACT_OUT_OPTIONS = (_ARCHIVED_APPLICATION_OUT, noload("*"))
+ARCHIVED_ARTIFACT_ARCHIVE_OPTIONS = (
+    _leaf(ArchivedArtifact.metrics),
+    _leaf(ArchivedArtifact.versions),
+    selectinload(ArchivedArtifact.applications).options(_leaf(ArchivedApplication.job), noload("*")),
+    noload("*"),
+)
+ARCHIVED_ARTIFACT_METRIC_OUT_OPTIONS = (
+    selectinload(ArchivedArtifactMetric.artifact).options(_ARCHIVED_APPLICATION_OUT, noload("*")),
+    noload("*"),
+)
+SECTION_OUT_OPTIONS = (noload("*"),)
+USER_OUT_OPTIONS = (noload("*"),)
+# Response field -> (relationship, loader) as in the options above, for ?fields= projections.
+JOB_OUT_RELATIONS = {"role": (Job.role, _leaf(Job.role))}
+APPLICATION_OUT_RELATIONS = {
+    "job": (Application.job, _job_out(Application.job)),
+    "users": (Application.users, _leaf(Application.users)),
+}
+ARTIFACT_OUT_RELATIONS = {"application": (Artifact.applications, _application_out(Artifact.applications))}
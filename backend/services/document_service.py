@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-import argparse
 from datetime import datetime
-import shutil
-import subprocess
 import logging
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
 
-import psycopg2
-import yaml
 from services.database_service import get_user_by_username
+from services.pandoc_service import run_pandoc
+from services.pdf_engine_service import render_pdf
+from services.template_service import render_section
+from services.tracing_service import span
 from schemas.schemas import ArtifactTypeEnum
 from config.settings import BASE_STORAGE_PATH
 from models.models import Role, Job, Application, Artifact, ArtifactMetric, Section, artifact_sections
@@ -21,43 +18,40 @@ from sqlalchemy import select, func, and_
 
 logger = logging.getLogger("jobtelem")
 
-class SafeFormatDict(dict):
-    def __missing__(self, key: str) -> str:
-        return "{" + key + "}"
-
 def build_cover_letter(username: str, application_id: int, db: Session) -> str:
-    user = get_user_by_username(username, db)
-    if not user:
-        raise ValueError(f"User with username {username} not found")
-
-    application = db.query(Application).filter(Application.id == application_id).first()
-    if not application:
-        raise ValueError(f"Application with id {application_id} not found")
-
-    job = db.query(Job).filter(Job.id == application.job_id).first()
-    if not job:
-        raise ValueError(f"Job with id {application.job_id} not found")
-
-    artifact = (
-        db.query(Artifact)
-        .filter(and_(
-            Artifact.application_id == application_id,
-            Artifact.type == ArtifactTypeEnum.cover_letter
-        ))
-        .first()
-    )
-    if not artifact:
-        raise ValueError(f"Cover letter artifact for application id {application_id} not found")
-
-    sections = (
-        db.query(Section)
-        .join(artifact_sections)
-        .filter(artifact_sections.c.artifact_id == artifact.id)
-        .order_by(artifact_sections.c.section_order)
-        .all()
-    )
-    if not sections:
-        raise ValueError(f"No sections found for cover letter artifact id {artifact.id}")
+    with span("load_rows"):
+        user = get_user_by_username(username, db)
+        if not user:
+            raise ValueError(f"User with username {username} not found")
+
+        application = db.query(Application).filter(Application.id == application_id).first()
+        if not application:
+            raise ValueError(f"Application with id {application_id} not found")
+
+        job = db.query(Job).filter(Job.id == application.job_id).first()
+        if not job:
+            raise ValueError(f"Job with id {application.job_id} not found")
+
+        artifact = (
+            db.query(Artifact)
+            .filter(and_(
+                Artifact.application_id == application_id,
+                Artifact.type == ArtifactTypeEnum.cover_letter
+            ))
+            .first()
+        )
+        if not artifact:
+            raise ValueError(f"Cover letter artifact for application id {application_id} not found")
+
+        sections = (
+            db.query(Section)
+            .join(artifact_sections)
+            .filter(artifact_sections.c.artifact_id == artifact.id)
+            .order_by(artifact_sections.c.section_order)
+            .all()
+        )
+        if not sections:
+            raise ValueError(f"No sections found for cover letter artifact id {artifact.id}")
 
     contact = application.contact or "Hiring Manager"
     date_str = datetime.now().strftime("%B %d, %Y")
@@ -80,7 +74,7 @@ def build_cover_letter(username: str, application_id: int, db: Session) -> str:
     recipient_block = "\n".join(line for line in recipient_lines if line)
 
     # Body paragraphs (double newlines between paragraphs)
-    template_values = SafeFormatDict(
+    template_values = dict(
         company=job.company or "",
         title=job.title or "",
         contact=contact or "",
@@ -89,11 +83,12 @@ def build_cover_letter(username: str, application_id: int, db: Session) -> str:
         full_name=user.full_name or "",
         email=user.email or "",
     )
-    body_paragraphs = [
-        section.content.strip().format_map(template_values)
-        for section in sections
-        if section.content and section.content.strip()
-    ]
+    with span("template_fill", sections=len(sections)):
+        body_paragraphs = [
+            render_section(section, template_values)
+            for section in sections
+            if section.content and section.content.strip()
+        ]
 
     # if job.required_skills and job.title and job.company:
     #     body_paragraphs.append(
@@ -123,7 +118,7 @@ def build_cover_letter(username: str, application_id: int, db: Session) -> str:
     # Critical: blank line between major blocks for markdown->latex paragraph spacing
     return "\n\n  ".join(block for block in blocks if block.strip())
 
-def create_cover_letter_odt_from_md(artifact_type:ArtifactTypeEnum, application_id:int = None):
+def create_cover_letter_odt_from_md(artifact_type:ArtifactTypeEnum, application_id:int = None, directory: Path = None):
     artifact_name = artifact_type.value
     if artifact_type == ArtifactTypeEnum.cover_letter:
         # template_name = "cover_letter_template.tex"
@@ -131,8 +126,9 @@ def create_cover_letter_odt_from_md(artifact_type:ArtifactTypeEnum, application_
     else:
         # template_name = "resume_template.tex"
         file_base_name = f"{artifact_name}"
-    md_path = Path(BASE_STORAGE_PATH) / f"{file_base_name}.md"
-    odt_path = Path(BASE_STORAGE_PATH) / f"{file_base_name}.odt"
+    directory = directory or Path(BASE_STORAGE_PATH)
+    md_path = directory / f"{file_base_name}.md"
+    odt_path = directory / f"{file_base_name}.odt"
     # template_path = Path(__file__).resolve().parents[1] / "config" / template_name
     
     ref_doc_path = Path(__file__).resolve().parents[1] / "config" / "custom-reference.odt"
@@ -143,10 +139,10 @@ def create_cover_letter_odt_from_md(artifact_type:ArtifactTypeEnum, application_
     "-t","odt",
     "-o", str(odt_path),
     ]    
-    subprocess.run(cmd, check=True)
+    run_pandoc(cmd, "odt")
     return odt_path
 
-def create_pdf_from_md(artifact_type:ArtifactTypeEnum, application_id:int = None, pdf_engine: str = "tectonic"):
+def create_pdf_from_md(artifact_type:ArtifactTypeEnum, application_id:int = None, pdf_engine: str = None, directory: Path = None):
     artifact_name = artifact_type.value
     if artifact_type == ArtifactTypeEnum.cover_letter:
         template_name = "cover_letter_template.tex"
@@ -154,20 +150,7 @@ def create_pdf_from_md(artifact_type:ArtifactTypeEnum, application_id:int = None
     else:
         template_name = "resume_template.tex"
         file_base_name = f"{artifact_name}"
-    md_path = Path(BASE_STORAGE_PATH) / f"{file_base_name}.md"
-    pdf_path = Path(BASE_STORAGE_PATH) / f"{file_base_name}.pdf"
-    template_path = Path(__file__).resolve().parents[1] / "config" / template_name
-    cmd = [
-        "pandoc",
-        str(md_path),
-        "--pdf-engine", "xelatex",
-        "--template", str(template_path),
-        # "-V", "geometry:margin=0.75in",
-        "-V", "fontsize=10pt",
-        "-V", "mainfont=DejaVu Sans",
-        "-V", "sansfont=DejaVu Sans",
-        # "-V", "linestretch=1.05",
-        "-o", str(pdf_path),
-    ]
-    subprocess.run(cmd, check=True)
-    return pdf_path
+    directory = directory or Path(BASE_STORAGE_PATH)
+    md_path = directory / f"{file_base_name}.md"
+    pdf_path = directory / f"{file_base_name}.pdf"
+    return render_pdf(md_path, template_name, pdf_path, pdf_engine)
@@ -0,0 +1,89 @@
+import hashlib
+from typing import Any, Iterable, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.models import ChangeEvent
+from services.change_feed_service import FEED_TABLES
+from services.telemetry_service import record_cache
+
+# Bump when a response schema changes shape so clients drop stale bodies.
+ETAG_VERSION = "1"
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in (ETAG_VERSION, *parts)).encode("utf-8")
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def table_fingerprints(db: Session, models: Iterable[Any], where: dict[Any, Any] = None) -> list:
+    """Row count and max(updated_at) for each model plus the tables' change feed position, in a single round trip.
+
+    count and max(updated_at) alone can miss a write: updated_at is the writing transaction's start
+    time, so a long transaction can commit a row stamped older than the current max. Every committed
+    write adds a change event, which either raises the count of events not yet numbered or, once
+    numbered, the max(seq); so together they move whenever one of the tables changes.
+    """
+    models = tuple(models)
+    where = where or {}
+    columns = []
+    for model in models:
+        count_q = select(func.count()).select_from(model)
+        max_q = select(func.max(model.updated_at))
+        if model in where:
+            count_q = count_q.where(where[model])
+            max_q = max_q.where(where[model])
+        columns.extend([count_q.scalar_subquery(), max_q.scalar_subquery()])
+    # Archived rows only change when archival deletes their live rows, which writes events.
+    feed_tables = {model.__tablename__.removeprefix("archived_") for model in models} & FEED_TABLES
+    if feed_tables:
+        in_tables = ChangeEvent.table_name.in_(feed_tables)
+        columns.extend([
+            select(func.max(ChangeEvent.seq)).where(in_tables).scalar_subquery(),
+            select(func.count()).select_from(ChangeEvent).where(in_tables, ChangeEvent.seq.is_(None)).scalar_subquery(),
+        ])
+    return list(db.execute(select(*columns)).one())
+
+
+def collection_etag(db: Session, models: Iterable[Any], *params: Any, where: dict[Any, Any] = None) -> str:
+    models = tuple(models)
+    return make_etag(
+        *(model.__tablename__ for model in models),
+        *table_fingerprints(db, models, where),
+        *params,
+    )
+
+
+def row_etag(db: Session, model: Any, row_id: int, related: Iterable[Any] = ()) -> Optional[str]:
+    """ETag for one row plus the tables nested into its response; None when the row is missing."""
+    related = tuple(related)
+    fingerprints = table_fingerprints(db, (model, *related), where={model: model.id == row_id})
+    if not fingerprints[0]:
+        return None
+    return make_etag(model.__tablename__, row_id, *fingerprints)
+
+
+def check_etag(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """Attach the ETag to the response, or return a 304 when the client already holds it."""
+    if etag is None:
+        return None
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    hit = etag_matches(request.headers.get("if-none-match"), etag)
+    record_cache("etag", hit)
+    if hit:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
@@ -0,0 +1,120 @@
+"""One-call export: build the markdown once, convert to the other formats concurrently, zip the results."""
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import io
+import logging
+from pathlib import Path
+import tempfile
+from typing import Callable, Optional
+import zipfile
+
+from sqlalchemy.orm import Session
+
+from models.models import ArtifactTypeEnum
+from schemas.document_schemas import ExportFormatEnum, ExportRequest
+from services.document_service import build_cover_letter
+from services.pandoc_service import run_pandoc
+from services.pdf_engine_service import render_pdf
+from services.resume_service import build_md, load_yaml
+from services.resume_store_service import load_resume_data
+from services.tracing_service import span
+
+logger = logging.getLogger("jobtelem")
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "config"
+PDF_TEMPLATES = {
+    ArtifactTypeEnum.resume: "resume_template.tex",
+    ArtifactTypeEnum.cover_letter: "cover_letter_template.tex",
+}
+# ODT and PDF are already compressed; deflating them again only costs time.
+ZIP_COMPRESSION = {
+    ExportFormatEnum.md: zipfile.ZIP_DEFLATED,
+    ExportFormatEnum.odt: zipfile.ZIP_STORED,
+    ExportFormatEnum.pdf: zipfile.ZIP_STORED,
+}
+
+
+def parse_tags(value: Optional[str]) -> set[str]:
+    return {t.strip().lower() for t in (value or "").split(",") if t.strip()}
+
+
+def resume_markdown(include: set[str], exclude: set[str], mode: str, profile: Optional[str], db: Session) -> Optional[str]:
+    """Resume markdown from a stored profile, or config/resume.yaml. None if the profile does not exist."""
+    if profile:
+        # Tag filtering runs in the database; the returned data is already filtered.
+        with span("db_load"):
+            data = load_resume_data(profile, include, exclude, mode, db)
+        if data is None:
+            return None
+        return build_md(data, set(), set(), mode)
+    with span("yaml_load"):
+        data = load_yaml(CONFIG_DIR / "resume.yaml")
+    return build_md(data, include, exclude, mode)
+
+
+def export_base_name(req: ExportRequest) -> str:
+    if req.artifact_type == ArtifactTypeEnum.cover_letter:
+        return f"{req.artifact_type.value}_{req.application_id}"
+    return req.artifact_type.value
+
+
+def markdown_to_odt(md_path: Path, odt_path: Path) -> Path:
+    cmd = [
+        "pandoc",
+        str(md_path),
+        "--reference-doc", str(CONFIG_DIR / "custom-reference.odt"),
+        "-t", "odt",
+        "-o", str(odt_path),
+    ]
+    run_pandoc(cmd, "odt")
+    return odt_path
+
+
+def convert(md_path: Path, fmt: ExportFormatEnum, req: ExportRequest) -> Path:
+    out_path = md_path.with_suffix(f".{fmt.value}")
+    if fmt == ExportFormatEnum.odt:
+        return markdown_to_odt(md_path, out_path)
+    return render_pdf(md_path, PDF_TEMPLATES[req.artifact_type], out_path, req.pdf_engine)
+
+
+def render_outputs(req: ExportRequest, md: str, work_dir: Path) -> dict[ExportFormatEnum, Path]:
+    """Write md into ``work_dir`` and run the remaining requested conversions in parallel."""
+    md_path = work_dir / f"{export_base_name(req)}.md"
+    md_path.write_text(md, encoding="utf-8")
+    outputs = {ExportFormatEnum.md: md_path}
+    conversions = [fmt for fmt in dict.fromkeys(req.formats) if fmt != ExportFormatEnum.md]
+    if conversions:
+        with ThreadPoolExecutor(max_workers=len(conversions), thread_name_prefix="export") as pool:
+            # copy_context keeps each conversion's spans under the caller's trace
+            futures = {
+                fmt: pool.submit(contextvars.copy_context().run, convert, md_path, fmt, req)
+                for fmt in conversions
+            }
+            for fmt, future in futures.items():
+                outputs[fmt] = future.result()
+    return outputs
+
+
+def export_zip(req: ExportRequest, md: str,
+               store: Optional[Callable[[dict[ExportFormatEnum, Path]], None]] = None) -> bytes:
+    """Render all requested formats in a private work dir and zip them.
+
+    Each export gets its own directory, so concurrent exports never share intermediate files.
+    ``store`` sees the finished files before the directory is removed.
+    """
+    base_name = export_base_name(req)
+    with tempfile.TemporaryDirectory(prefix="export-") as work_dir:
+        outputs = render_outputs(req, md, Path(work_dir))
+
+        if store is not None:
+            with span("store"):
+                store(outputs)
+
+        with span("zip") as zip_span:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w") as archive:
+                for fmt in dict.fromkeys(req.formats):
+                    archive.write(outputs[fmt], f"{base_name}.{fmt.value}", compress_type=ZIP_COMPRESSION[fmt])
+            data = buffer.getvalue()
+            zip_span.set(output_bytes=len(data))
+    return data
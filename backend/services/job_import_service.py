@@ -0,0 +1,295 @@
+"""Bulk import of job postings from CSV, NDJSON or JSON-array files.
+
+Rows are read one at a time, validated against ``JobCreate`` (``role_id`` may be given directly or
+resolved from a ``lane`` column) and written in batches to a temporary staging table: with
+PostgreSQL ``COPY ... FROM STDIN``, elsewhere with executemany. The staging table is then merged
+into ``jobs`` with one set-based UPDATE and one INSERT ... SELECT, so memory stays flat and the
+database does the matching. Postings match an existing job by ``posting_url``, or by company and
+title when there is no URL; within one file the last row for a key wins. Both statements return
+the rows they wrote, which go to the change feed in batches.
+"""
+import csv
+from datetime import date
+import io
+import json
+import logging
+import tempfile
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table, Text, cast, delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from config.settings import IMPORT_BATCH_SIZE, IMPORT_MAX_REJECTS
+from models.models import Job, Role
+from services.change_feed_service import record_changes
+from schemas.schemas import JobCreate
+
+logger = logging.getLogger("jobtelem")
+
+IMPORT_FORMATS = ("csv", "ndjson", "json")
+# Columns the staging table carries into jobs. Existing jobs only take the posting fields,
+# and only where the file has a value; status, fit_score and notes stay as the user set them.
+JOB_COLUMNS = ("company", "title", "posting_url", "required_skills", "date_found", "status", "fit_score", "notes", "role_id")
+STAGED_COLUMNS = ("line_no", *JOB_COLUMNS)
+POSTING_COLUMNS = ("company", "title", "posting_url", "required_skills", "date_found", "role_id")
+
+_staging_metadata = MetaData()
+staging = Table(
+    "job_import_staging",
+    _staging_metadata,
+    Column("line_no", Integer, primary_key=True),
+    Column("company", String, nullable=False),
+    Column("title", String, nullable=False),
+    Column("posting_url", String),
+    Column("required_skills", Text),
+    Column("date_found", Date),
+    Column("status", String, nullable=False),
+    Column("fit_score", Integer),
+    Column("notes", Text),
+    Column("role_id", Integer, nullable=False),
+    Column("match_key", String, index=True),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+# ---- reading ----
+
+def iter_json_array(stream: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Items of a top-level JSON array, decoded one at a time without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            if buffer[position] == "," and not started:
+                raise ImportFormatError("Expected a JSON array")
+            position += 1
+        if position < len(buffer):
+            if not started:
+                if buffer[position] != "[":
+                    raise ImportFormatError("Expected a JSON array")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ImportFormatError("Truncated or invalid JSON array")
+                item = None
+            else:
+                if end < len(buffer) or eof:
+                    yield item
+                    position = end
+                    continue
+        if eof:
+            raise ImportFormatError("Truncated JSON array")
+        # Need more input: drop what was consumed and read the next chunk.
+        buffer = buffer[position:]
+        position = 0
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[tuple[int, Any]]:
+    """(line or item number, record) pairs; records are dicts unless the input is malformed."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "ndjson":
+        for line_no, line in enumerate(stream, start=1):
+            if line.strip():
+                try:
+                    yield line_no, json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield line_no, exc
+    elif fmt == "json":
+        yield from enumerate(iter_json_array(stream), start=1)
+    else:
+        raise ImportFormatError(f"Unknown import format {fmt}; use one of {', '.join(IMPORT_FORMATS)}")
+
+
+# ---- validation ----
+
+def lane_roles(db: Session) -> dict[str, int]:
+    """Lane -> role id, taking the oldest role when a lane has several."""
+    roles: dict[str, int] = {}
+    for role_id, lane in db.execute(select(Role.id, Role.lane).order_by(Role.id.desc())):
+        roles[lane.value] = role_id
+    return roles
+
+
+def validate_record(record: Any, roles: dict[str, int], role_ids: set[int]) -> tuple[Optional[JobCreate], list[str]]:
+    if isinstance(record, Exception):
+        return None, [f"invalid JSON: {record}"]
+    if not isinstance(record, dict):
+        return None, ["expected an object"]
+    # CSV gives "" for empty cells; treat them as missing so optional fields and defaults apply.
+    data = {key: value for key, value in record.items() if key is not None and value not in ("", None)}
+    lane = data.pop("lane", None)
+    if "role_id" not in data and lane is not None:
+        if str(lane) not in roles:
+            return None, [f"lane: no role for lane {lane!r}"]
+        data["role_id"] = roles[str(lane)]
+    try:
+        job = JobCreate.model_validate(data)
+    except ValidationError as exc:
+        return None, [f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()]
+    if job.role_id not in role_ids:
+        return None, [f"role_id: role {job.role_id} not found"]
+    return job, []
+
+
+def staging_row(line_no: int, job: JobCreate) -> dict[str, Any]:
+    row = job.model_dump(include=set(JOB_COLUMNS))
+    row["status"] = job.status.name
+    row["line_no"] = line_no
+    return row
+
+
+# ---- loading ----
+
+def _copy_batch(db: Session, rows: list[dict[str, Any]]) -> None:
+    connection = db.connection()
+    if connection.dialect.name != "postgresql":
+        connection.execute(insert(staging), rows)
+        return
+    columns = STAGED_COLUMNS
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[name] is None else row[name].isoformat() if isinstance(row[name], date) else row[name]
+                         for name in columns])
+    buffer.seek(0)
+    with connection.connection.cursor() as cursor:  # DBAPI cursor on this transaction's connection
+        cursor.copy_expert(f"COPY {staging.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _match_key(table):
+    """Identity of a posting: its URL, else lower-cased company and title."""
+    return func.coalesce(table.c.posting_url, func.lower(table.c.company) + "|" + func.lower(table.c.title))
+
+
+def _merge(db: Session) -> tuple[int, int, int]:
+    """Upsert the staged rows into jobs; returns (duplicates, inserted, updated)."""
+    connection = db.connection()
+    # Key the staged rows once; with match_key indexed both statements below are index joins
+    # (the jobs side has no stored key to index).
+    connection.execute(update(staging).values(match_key=_match_key(staging)))
+    # Within the file the last row for a posting wins.
+    latest = select(func.max(staging.c.line_no)).group_by(staging.c.match_key)
+    duplicates = connection.execute(delete(staging).where(staging.c.line_no.not_in(latest))).rowcount
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(f"ANALYZE {staging.name}"))  # autovacuum never analyzes temporary tables
+
+    jobs = Job.__table__
+    updated = _record_returned(db, "update", db.execute(
+        update(jobs)
+        .where(staging.c.match_key == _match_key(jobs))
+        .values({name: func.coalesce(staging.c[name], jobs.c[name]) for name in POSTING_COLUMNS})
+        .returning(*jobs.c)
+        .execution_options(synchronize_session=False)
+    ))
+    source = select(*(
+        cast(staging.c.status, jobs.c.status.type) if name == "status" else staging.c[name] for name in JOB_COLUMNS
+    )).where(staging.c.match_key.not_in(select(_match_key(jobs))))
+    inserted = _record_returned(db, "insert", db.execute(
+        insert(jobs).from_select(list(JOB_COLUMNS), source).returning(*jobs.c)
+    ))
+    return duplicates, inserted, updated
+
+
+def _record_returned(db: Session, op: str, result, batch_size: int = IMPORT_BATCH_SIZE) -> int:
+    """Write change feed events for the rows a RETURNING statement wrote; returns how many."""
+    count = 0
+    for rows in result.mappings().partitions(batch_size):
+        record_changes(db, Job.__tablename__, op, rows)
+        count += len(rows)
+    return count
+
+
+def import_jobs(stream: TextIO, fmt: str, db: Session, batch_size: int = IMPORT_BATCH_SIZE) -> dict[str, Any]:
+    """Validate, stage and merge every posting in ``stream``; one transaction for the whole file."""
+    roles = lane_roles(db)
+    role_ids = set(roles.values()) | set(db.scalars(select(Role.id)))
+    connection = db.connection()
+    staging.drop(connection, checkfirst=True)
+    staging.create(connection)
+    received = staged = rejected = 0
+    rejects: list[dict[str, Any]] = []
+    batch: list[dict[str, Any]] = []
+    try:
+        for line_no, record in iter_records(stream, fmt):
+            received += 1
+            job, errors = validate_record(record, roles, role_ids)
+            if errors:
+                rejected += 1
+                if len(rejects) < IMPORT_MAX_REJECTS:
+                    rejects.append({"line": line_no, "errors": errors})
+                continue
+            batch.append(staging_row(line_no, job))
+            if len(batch) >= batch_size:
+                _copy_batch(db, batch)
+                staged += len(batch)
+                batch = []
+        if batch:
+            _copy_batch(db, batch)
+            staged += len(batch)
+        duplicates, inserted, updated = _merge(db) if staged else (0, 0, 0)
+        if connection.dialect.name != "postgresql":
+            staging.drop(connection)  # PostgreSQL drops it on commit
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info(f"Imported jobs: {received} rows, {inserted} inserted, {updated} updated, {rejected} rejected")
+    return {
+        "received": received,
+        "inserted": inserted,
+        "updated": updated,
+        "duplicates": duplicates,
+        "rejected": rejected,
+        "rejects": rejects,
+    }
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> str:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return "ndjson"
+    if content_type == "application/json":
+        return "json"
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    if suffix in ("ndjson", "jsonl"):
+        return "ndjson"
+    if suffix in IMPORT_FORMATS:
+        return suffix
+    raise ImportFormatError("Cannot tell the import format; pass format=csv, ndjson or json")
+
+
+async def spool(chunks: AsyncIterator[bytes], max_memory: int = 1024 * 1024) -> BinaryIO:
+    """Copy an upload into a temporary file (in memory up to ``max_memory``), rewound for reading."""
+    spooled = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    async for chunk in chunks:
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def text_stream(binary: BinaryIO) -> TextIO:
+    # utf-8-sig drops the BOM spreadsheet exports start with; newline="" is what the csv module expects.
+    return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
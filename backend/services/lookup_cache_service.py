@@ -0,0 +1,74 @@
+"""Bounded, expiring in-process caches for hot lookups that rarely change (users).
+
+Values are detached pydantic snapshots, so they are safe to share across sessions and threads.
+Writers invalidate the keys they touch; the TTL bounds staleness from writes in other processes.
+That makes them fit for reads such as cover-letter renders, not for existence checks before a
+write: a row deleted by another worker stays cached until the TTL runs out.
+"""
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from config.settings import LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TTL_SECONDS
+from services.telemetry_service import CACHE_EVICTIONS, record_cache
+
+
+class LookupCache:
+    """LRU cache with per-entry expiry; lookups are counted in cache_requests_total{cache=name}."""
+
+    def __init__(self, name: str, max_size: int = LOOKUP_CACHE_SIZE, ttl: float = LOOKUP_CACHE_TTL_SECONDS):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                CACHE_EVICTIONS.inc(cache=self.name, reason="expired")
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        record_cache(self.name, entry is not None)
+        return entry[1] if entry is not None else None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.inc(cache=self.name, reason="size")
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Cached value for ``key``, else ``load()``; missing rows (None) are not cached."""
+        value = self.get(key)
+        if value is None:
+            value = load()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    CACHE_EVICTIONS.inc(cache=self.name, reason="invalidated")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+USER_CACHE = LookupCache("user_lookup")
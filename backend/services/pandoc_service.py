@@ -0,0 +1,82 @@
+import logging
+import os
+from pathlib import Path
+import subprocess
+import time
+from typing import Optional
+
+from services.telemetry_service import (
+    LATEX_DURATION,
+    LATEX_RUNS,
+    PANDOC_DURATION,
+    PANDOC_RUNS,
+    RENDER_IN_PROGRESS,
+)
+from services.tracing_service import span
+
+logger = logging.getLogger("jobtelem")
+
+
+def _output_path(cmd: list[str]) -> Path | None:
+    if "-o" in cmd:
+        return Path(cmd[cmd.index("-o") + 1])
+    return None
+
+
+def run_traced(
+    cmd: list[str],
+    stage: str,
+    output_format: str,
+    output: Optional[Path] = None,
+    cwd: Optional[Path] = None,
+    env: Optional[dict[str, str]] = None,
+) -> int:
+    """Run a subprocess inside a span, recording wall/CPU time and output size.
+
+    Returns the exit code; callers decide whether a non-zero code is fatal.
+    """
+    with span(stage, format=output_format) as current:
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env)
+        # wait4 reaps this child and returns its own rusage, unaffected by concurrent renders.
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        current.set(
+            exit_code=proc.returncode,
+            cpu_user_ms=round(usage.ru_utime * 1000, 3),
+            cpu_sys_ms=round(usage.ru_stime * 1000, 3),
+            max_rss_kib=usage.ru_maxrss,
+            output_bytes=output.stat().st_size if output and output.exists() else None,
+        )
+    return proc.returncode
+
+
+def run_pandoc(cmd: list[str], output_format: str) -> None:
+    """Run a pandoc conversion, recording its exit code, wall/CPU time and output size."""
+    RENDER_IN_PROGRESS.inc(format=output_format)
+    start = time.perf_counter()
+    exit_code = "error"
+    try:
+        returncode = run_traced(cmd, "pandoc", output_format, output=_output_path(cmd))
+        exit_code = str(returncode)
+        if returncode != 0:
+            logger.error(f"pandoc exited with {returncode} converting to {output_format}: {' '.join(cmd)}")
+            raise subprocess.CalledProcessError(returncode, cmd)
+    finally:
+        RENDER_IN_PROGRESS.dec(format=output_format)
+        PANDOC_RUNS.inc(format=output_format, exit_code=exit_code)
+        PANDOC_DURATION.observe(time.perf_counter() - start, format=output_format)
+
+
+def run_latex(cmd: list[str], engine: str, output: Path, cwd: Path, env: Optional[dict[str, str]] = None) -> int:
+    """Run a LaTeX engine compile; returns the exit code so callers can fall back."""
+    RENDER_IN_PROGRESS.inc(format="pdf")
+    start = time.perf_counter()
+    exit_code = "error"
+    try:
+        returncode = run_traced(cmd, "latex_compile", "pdf", output=output, cwd=cwd, env=env)
+        exit_code = str(returncode)
+        return returncode
+    finally:
+        RENDER_IN_PROGRESS.dec(format="pdf")
+        LATEX_RUNS.inc(engine=engine, exit_code=exit_code)
+        LATEX_DURATION.observe(time.perf_counter() - start, engine=engine)
@@ -0,0 +1,205 @@
+"""Pluggable PDF engines for the markdown -> LaTeX -> PDF step.
+
+Rendering is split in two: pandoc turns markdown into a standalone .tex with our
+template, then the selected engine compiles it. Engines can be warmed up ahead of
+the first request: LaTeX engines dump the template preamble (everything above
+``\\endofdump`` in the template) into a precompiled format with mylatexformat and
+refresh the fontconfig cache, tectonic fills a persistent bundle cache.
+"""
+from abc import ABC, abstractmethod
+import hashlib
+import logging
+import os
+from pathlib import Path
+import shutil
+import subprocess
+import threading
+from typing import Iterable, Optional
+
+from config.settings import PDF_ENGINE, PDF_FORMAT_DIR, TECTONIC_CACHE_DIR
+from services.pandoc_service import run_latex, run_pandoc, run_traced
+from services.tracing_service import span
+
+logger = logging.getLogger("jobtelem")
+
+CONFIG_DIR = Path(__file__).resolve().parents[1] / "config"
+TEMPLATES = ("resume_template.tex", "cover_letter_template.tex")
+PANDOC_VARIABLES = [
+    # "-V", "geometry:margin=0.75in",
+    "-V", "fontsize=10pt",
+    "-V", "mainfont=DejaVu Sans",
+    "-V", "sansfont=DejaVu Sans",
+    # "-V", "linestretch=1.05",
+]
+
+
+class UnknownPdfEngineError(ValueError):
+    pass
+
+
+def template_path(template_name: str) -> Path:
+    return CONFIG_DIR / template_name
+
+
+def markdown_to_latex(md_path: Path, template_name: str, tex_path: Path) -> Path:
+    cmd = [
+        "pandoc",
+        str(md_path),
+        "--standalone",
+        "--template", str(template_path(template_name)),
+        *PANDOC_VARIABLES,
+        "-t", "latex",
+        "-o", str(tex_path),
+    ]
+    run_pandoc(cmd, "latex")
+    return tex_path
+
+
+def _empty_document(directory: Path, template_name: str) -> Path:
+    """The template rendered around an empty body, used to build formats and warm caches."""
+    directory.mkdir(parents=True, exist_ok=True)
+    md_path = directory / f"{Path(template_name).stem}_empty.md"
+    md_path.write_text("\n", encoding="utf-8")
+    return markdown_to_latex(md_path, template_name, md_path.with_suffix(".tex"))
+
+
+class PdfEngine(ABC):
+    name = ""
+    binary = ""
+
+    def available(self) -> bool:
+        return shutil.which(self.binary) is not None
+
+    def warm_up(self, templates: Iterable[str]) -> None:
+        """Prepare caches so the first real compile is fast. Optional."""
+
+    @abstractmethod
+    def compile(self, tex_path: Path, pdf_path: Path, template_name: str) -> None:
+        """Compile ``tex_path`` into ``pdf_path``."""
+
+
+class LatexEngine(PdfEngine):
+    """xelatex / pdflatex, optionally starting from a precompiled preamble format."""
+
+    def __init__(self, binary: str):
+        self.name = binary
+        self.binary = binary
+        self._formats: dict[str, str] = {}
+
+    def format_name(self, template_name: str) -> str:
+        digest = hashlib.sha1(
+            template_path(template_name).read_bytes() + " ".join(PANDOC_VARIABLES).encode("utf-8")
+        ).hexdigest()[:12]
+        return f"{self.binary}-{Path(template_name).stem}-{digest}"
+
+    def build_format(self, template_name: str) -> Optional[str]:
+        format_dir = Path(PDF_FORMAT_DIR)
+        name = self.format_name(template_name)
+        fmt_path = format_dir / f"{name}.fmt"
+        if not fmt_path.exists():
+            preamble = _empty_document(format_dir, template_name)
+            cmd = [
+                self.binary, "-ini", "-interaction=nonstopmode", "-halt-on-error",
+                f"-jobname={name}", f"&{self.binary}", "mylatexformat.ltx", str(preamble),
+            ]
+            returncode = run_traced(cmd, "latex_format_build", "fmt", output=fmt_path, cwd=format_dir)
+            if returncode != 0 or not fmt_path.exists():
+                logger.warning(f"Could not build {self.binary} format for {template_name}; compiling without it")
+                return None
+        self._formats[template_name] = name
+        logger.info(f"Using precompiled {self.binary} format {fmt_path}")
+        return name
+
+    def warm_up(self, templates: Iterable[str]) -> None:
+        if shutil.which("fc-cache"):
+            # Refreshes only out-of-date fontconfig caches, so font discovery is warm for XeTeX.
+            run_traced(["fc-cache"], "font_cache", "fonts")
+        for template_name in templates:
+            self.build_format(template_name)
+
+    def compile(self, tex_path: Path, pdf_path: Path, template_name: str) -> None:
+        base = [
+            self.binary, "-interaction=nonstopmode", "-halt-on-error",
+            f"-output-directory={pdf_path.parent}", f"-jobname={pdf_path.stem}",
+        ]
+        fmt = self._formats.get(template_name)
+        if fmt:
+            env = {**os.environ, "TEXFORMATS": f"{PDF_FORMAT_DIR}:"}
+            if run_latex(base + [f"-fmt={fmt}", str(tex_path)], self.name, pdf_path, tex_path.parent, env) == 0:
+                return
+            logger.warning(f"{self.binary} failed with format {fmt}; dropping it and retrying without")
+            self._formats.pop(template_name, None)
+        cmd = base + [str(tex_path)]
+        if run_latex(cmd, self.name, pdf_path, tex_path.parent) != 0:
+            raise subprocess.CalledProcessError(1, cmd)
+
+
+class TectonicEngine(PdfEngine):
+    """tectonic with its bundle cache on a persistent path instead of ~/.cache."""
+
+    name = "tectonic"
+    binary = "tectonic"
+
+    def _env(self) -> dict[str, str]:
+        return {**os.environ, "TECTONIC_CACHE_DIR": TECTONIC_CACHE_DIR}
+
+    def warm_up(self, templates: Iterable[str]) -> None:
+        warm_dir = Path(TECTONIC_CACHE_DIR) / "warmup"
+        for template_name in templates:
+            tex_path = _empty_document(warm_dir, template_name)
+            run_latex([self.binary, "--outdir", str(warm_dir), str(tex_path)], self.name,
+                      tex_path.with_suffix(".pdf"), warm_dir, self._env())
+
+    def compile(self, tex_path: Path, pdf_path: Path, template_name: str) -> None:
+        cmd = [self.binary, "--outdir", str(pdf_path.parent), str(tex_path)]
+        if run_latex(cmd, self.name, pdf_path, tex_path.parent, self._env()) != 0:
+            raise subprocess.CalledProcessError(1, cmd)
+
+
+PDF_ENGINES: dict[str, PdfEngine] = {}
+
+
+def register_engine(engine: PdfEngine) -> PdfEngine:
+    PDF_ENGINES[engine.name] = engine
+    return engine
+
+
+register_engine(LatexEngine("xelatex"))
+register_engine(LatexEngine("pdflatex"))
+register_engine(TectonicEngine())
+
+
+def get_engine(name: Optional[str] = None) -> PdfEngine:
+    engine = PDF_ENGINES.get(name or PDF_ENGINE)
+    if engine is None:
+        raise UnknownPdfEngineError(f"Unknown PDF engine {name}; available: {', '.join(sorted(PDF_ENGINES))}")
+    return engine
+
+
+def render_pdf(md_path: Path, template_name: str, pdf_path: Path, engine_name: Optional[str] = None) -> Path:
+    engine = get_engine(engine_name)
+    # The .tex shares the PDF's stem so every engine writes <stem>.pdf next to it.
+    tex_path = pdf_path.with_suffix(".tex")
+    with span("pdf_render", engine=engine.name):
+        markdown_to_latex(md_path, template_name, tex_path)
+        engine.compile(tex_path, pdf_path, template_name)
+    return pdf_path
+
+
+def start_warm_up(engine_names: Iterable[str] = (PDF_ENGINE,)) -> threading.Thread:
+    """Warm engines in a background thread so startup is not blocked on LaTeX."""
+    def warm():
+        for name in engine_names:
+            engine = PDF_ENGINES.get(name)
+            if engine is None or not engine.available():
+                logger.info(f"Skipping warm-up for unavailable PDF engine {name}")
+                continue
+            try:
+                with span("pdf_engine_warmup", engine=name):
+                    engine.warm_up(TEMPLATES)
+            except Exception as exc:  # warm-up is best effort
+                logger.warning(f"PDF engine warm-up for {name} failed: {exc}")
+
+    thread = threading.Thread(target=warm, name="pdf-engine-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,287 @@
+"""Dependency tracking and debounced background re-rendering of stored artifacts.
+
+An artifact becomes re-renderable once it has been rendered into the artifact store: the
+render parameters are kept in ``artifact_renders``. Its inputs are then known:
+
+* cover letters depend on the sections linked through ``artifact_sections``;
+* resume artifacts depend on config/resume.yaml (tracked by content hash) or a stored profile.
+
+Edits to those inputs queue the dependent artifacts. The queue waits for edits to settle
+(debounce), holds each artifact at most once, and is drained by a single worker thread at
+reduced CPU priority, so user-facing downloads find a fresh version already stored.
+
+The worker runs in one process only (PRERENDER_ENABLED), so several API workers do not
+render the same artifacts. Edits handled by other processes set ``artifact_renders.queued_at``,
+which the worker claims every PRERENDER_POLL_SECONDS.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, noload
+
+from config.settings import (
+    PRERENDER_DEBOUNCE_SECONDS,
+    PRERENDER_ENABLED,
+    PRERENDER_MAX_DELAY_SECONDS,
+    PRERENDER_NICE,
+    PRERENDER_POLL_SECONDS,
+    RESUME_YAML_POLL_SECONDS,
+)
+from models.models import Artifact, ArtifactRender, ArtifactTypeEnum, artifact_sections
+from schemas.document_schemas import ExportFormatEnum, ExportRequest
+from services.artifact_store_service import add_version, store_application_render
+from services.telemetry_service import PRERENDER_QUEUE_DEPTH, PRERENDER_RUNS
+from services.tracing_service import span
+
+logger = logging.getLogger("jobtelem")
+
+RESUME_YAML = Path(__file__).resolve().parents[1] / "config" / "resume.yaml"
+# Request fields that identify the artifact rather than how it is rendered.
+SPEC_EXCLUDE = {"artifact_type", "application_id"}
+
+
+class RenderQueue:
+    """Debounced, deduplicated set of artifact ids waiting for a re-render."""
+
+    def __init__(self, debounce: float, max_delay: float):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._cond = threading.Condition()
+        self._pending: dict[int, tuple[float, float]] = {}  # id -> (first queued, due)
+        self._running: set[int] = set()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def enqueue(self, artifact_ids: Iterable[int]) -> None:
+        now = time.monotonic()
+        with self._cond:
+            for artifact_id in artifact_ids:
+                first = self._pending.get(artifact_id, (now, now))[0]
+                # Each edit pushes the render back, up to max_delay after the first one.
+                self._pending[artifact_id] = (first, min(now + self.debounce, first + self.max_delay))
+            PRERENDER_QUEUE_DEPTH.set(len(self._pending))
+            self._cond.notify()
+
+    def take(self, timeout: float) -> Optional[int]:
+        """The next due artifact id, or None after ``timeout`` seconds.
+
+        An artifact re-queued while it renders stays pending until ``done`` is called.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                waiting = {aid: due for aid, (_, due) in self._pending.items() if aid not in self._running}
+                due_id = min(waiting, key=waiting.get, default=None)
+                if due_id is not None and waiting[due_id] <= now:
+                    del self._pending[due_id]
+                    self._running.add(due_id)
+                    PRERENDER_QUEUE_DEPTH.set(len(self._pending))
+                    return due_id
+                if now >= deadline:
+                    return None
+                next_due = waiting[due_id] if due_id is not None else deadline
+                self._cond.wait(max(min(next_due, deadline) - now, 0.01))
+
+    def done(self, artifact_id: int) -> None:
+        with self._cond:
+            self._running.discard(artifact_id)
+            self._cond.notify()
+
+
+QUEUE = RenderQueue(PRERENDER_DEBOUNCE_SECONDS, PRERENDER_MAX_DELAY_SECONDS)
+
+_yaml_version: tuple[Optional[tuple[int, int]], Optional[str]] = (None, None)
+
+
+def resume_yaml_version() -> Optional[str]:
+    """sha256 of config/resume.yaml, rehashed only when its mtime or size changes."""
+    global _yaml_version
+    try:
+        stat_result = RESUME_YAML.stat()
+    except OSError:
+        return None
+    key = (stat_result.st_mtime_ns, stat_result.st_size)
+    if _yaml_version[0] != key:
+        _yaml_version = (key, hashlib.sha256(RESUME_YAML.read_bytes()).hexdigest())
+    return _yaml_version[1]
+
+
+# ---- recording renders ----
+
+def remember_render(artifact_id: int, req: ExportRequest, db: Session) -> None:
+    """Record how ``artifact_id`` was rendered; formats accumulate across single-format renders."""
+    spec = req.model_dump(mode="json", exclude=SPEC_EXCLUDE)
+    render = db.get(ArtifactRender, artifact_id)
+    if render is None:
+        render = ArtifactRender(artifact_id=artifact_id)
+        db.add(render)
+    else:
+        previous = json.loads(render.spec)
+        spec["formats"] = list(dict.fromkeys(previous.get("formats", []) + spec["formats"]))
+        spec["pdf_engine"] = spec["pdf_engine"] or previous.get("pdf_engine")
+    render.spec = json.dumps(spec)
+    render.source_version = resume_yaml_version() if req.artifact_type == ArtifactTypeEnum.resume and not req.profile else None
+    render.rendered_at = func.now()
+    db.commit()
+
+
+def store_renders(req: ExportRequest, outputs: dict[ExportFormatEnum, Path], db: Session) -> None:
+    """Store the requested formats as versions of the application's artifact and remember the render."""
+    if req.application_id is None:
+        return
+    artifact_id = None
+    for fmt in dict.fromkeys(req.formats):
+        version = store_application_render(req.application_id, req.artifact_type, fmt.value, outputs[fmt], db)
+        if version is not None:
+            artifact_id = version.artifact_id
+    if artifact_id is not None:
+        remember_render(artifact_id, req, db)
+
+
+# ---- change notifications ----
+
+def enqueue(artifact_ids: Iterable[int], db: Session) -> None:
+    """Queue re-renders: onto the worker's queue in its own process, else flagged for it in artifact_renders."""
+    artifact_ids = list(artifact_ids)
+    if not artifact_ids:
+        return
+    if PRERENDER_ENABLED:
+        QUEUE.enqueue(artifact_ids)
+        return
+    db.execute(
+        update(ArtifactRender).where(ArtifactRender.artifact_id.in_(artifact_ids)).values(queued_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def claim_queued(db: Session) -> list[int]:
+    """Artifact ids flagged by other processes; the flags are cleared in the same statement."""
+    artifact_ids = list(db.scalars(
+        update(ArtifactRender).where(ArtifactRender.queued_at.is_not(None)).values(queued_at=None)
+        .returning(ArtifactRender.artifact_id).execution_options(synchronize_session=False)
+    ))
+    db.commit()
+    return artifact_ids
+
+
+def section_dependents(section_ids: Iterable[int], db: Session) -> list[int]:
+    """Rendered artifacts that include any of the given sections."""
+    return list(db.scalars(
+        select(artifact_sections.c.artifact_id)
+        .join(ArtifactRender, ArtifactRender.artifact_id == artifact_sections.c.artifact_id)
+        .where(artifact_sections.c.section_id.in_(list(section_ids)))
+        .distinct()
+    ))
+
+
+def profile_dependents(profile_name: str, db: Session) -> list[int]:
+    renders = db.execute(
+        select(ArtifactRender.artifact_id, ArtifactRender.spec)
+        .join(Artifact, Artifact.id == ArtifactRender.artifact_id)
+        .where(Artifact.type == ArtifactTypeEnum.resume)
+    ).all()
+    return [row.artifact_id for row in renders if json.loads(row.spec).get("profile") == profile_name]
+
+
+def stale_resume_yaml_dependents(db: Session) -> list[int]:
+    current = resume_yaml_version()
+    if current is None:
+        return []
+    return list(db.scalars(
+        select(ArtifactRender.artifact_id).where(
+            ArtifactRender.source_version.is_not(None),
+            ArtifactRender.source_version != current,
+        )
+    ))
+
+
+# ---- rendering ----
+
+def rerender(artifact_id: int, db: Session) -> str:
+    # Imported here so the section/profile endpoints that only enqueue do not load the rendering stack.
+    from services.document_service import build_cover_letter
+    from services.export_service import parse_tags, render_outputs, resume_markdown
+
+    render = db.get(ArtifactRender, artifact_id)
+    artifact = db.get(Artifact, artifact_id, options=[noload("*")])
+    if render is None or artifact is None:
+        return "skipped"
+    req = ExportRequest(artifact_type=artifact.type, application_id=artifact.application_id, **json.loads(render.spec))
+    if artifact.type == ArtifactTypeEnum.cover_letter:
+        md = build_cover_letter(req.username, req.application_id, db)
+    else:
+        md = resume_markdown(parse_tags(req.include), parse_tags(req.exclude), req.mode, req.profile, db)
+        if md is None:
+            return "skipped"
+    with tempfile.TemporaryDirectory(prefix="prerender-") as work_dir:
+        outputs = render_outputs(req, md, Path(work_dir))
+        with span("store"):
+            for fmt in dict.fromkeys(req.formats):
+                add_version(artifact, fmt.value, outputs[fmt], db)
+    remember_render(artifact_id, req, db)
+    return "ok"
+
+
+def _lower_priority() -> None:
+    # Linux applies nice values per thread, and subprocesses (pandoc, LaTeX) inherit it.
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), PRERENDER_NICE)
+    except (AttributeError, OSError) as exc:
+        logger.info(f"Could not lower pre-render priority: {exc}")
+
+
+def start_worker() -> threading.Event:
+    """Drain the queue in a daemon thread, claiming other processes' flags and polling resume.yaml; set the event to stop."""
+    from database import SessionLocal
+
+    stop = threading.Event()
+
+    def poll(next_poll: float, interval: float, find) -> float:
+        if interval <= 0 or time.monotonic() < next_poll:
+            return next_poll
+        db = SessionLocal()
+        try:
+            QUEUE.enqueue(find(db))
+        except Exception as exc:
+            db.rollback()
+            logger.warning(f"Pre-render poll failed: {exc}")
+        finally:
+            db.close()
+        return time.monotonic() + interval
+
+    def run():
+        _lower_priority()
+        next_claim = next_yaml_poll = 0.0
+        while not stop.is_set():
+            next_claim = poll(next_claim, PRERENDER_POLL_SECONDS, claim_queued)
+            next_yaml_poll = poll(next_yaml_poll, RESUME_YAML_POLL_SECONDS, stale_resume_yaml_dependents)
+            artifact_id = QUEUE.take(timeout=1.0)
+            if artifact_id is None:
+                continue
+            db = SessionLocal()
+            try:
+                with span("prerender", artifact_id=artifact_id):
+                    result = rerender(artifact_id, db)
+            except Exception as exc:  # a failing artifact must not stop the worker
+                db.rollback()
+                result = "error"
+                logger.warning(f"Background re-render of artifact {artifact_id} failed: {exc}")
+            finally:
+                db.close()
+                QUEUE.done(artifact_id)
+            PRERENDER_RUNS.inc(result=result)
+
+    threading.Thread(target=run, name="prerender", daemon=True).start()
+    return stop
@@ -0,0 +1,165 @@
+"""Profilers for single opted-in requests and storage of the resulting profiles."""
+from collections import Counter
+import cProfile
+from datetime import datetime, timezone
+import hmac
+from pathlib import Path
+import re
+import sys
+import threading
+import tracemalloc
+from typing import Optional
+
+from config.settings import PROFILE_DIR, PROFILE_RETENTION, PROFILING_TOKEN
+
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_SUFFIXES = (".folded", ".prof", ".mem.txt")
+
+
+def profiling_enabled() -> bool:
+    return bool(PROFILING_TOKEN)
+
+
+def token_valid(token: Optional[str]) -> bool:
+    return profiling_enabled() and token is not None and hmac.compare_digest(token, PROFILING_TOKEN)
+
+
+class StackSampler:
+    """Samples every thread's Python stack at a fixed interval.
+
+    Sync endpoints run in the threadpool, where cProfile on the event-loop thread
+    cannot see them; sampling all threads does. Concurrent requests on other
+    threads show up in the samples too, so profile on a quiet worker when you can.
+    Output is the collapsed-stack format understood by flamegraph tools.
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+# tracemalloc and cProfile are process-global: one profiled request at a time.
+_active = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+class RequestProfiler:
+    """Profiles one request; only one can run per process (``start`` raises ProfilerBusy otherwise).
+
+    ``cprofile`` mode profiles the event-loop thread only, so it does not see the body of
+    sync endpoints, which run in the threadpool; use ``sample`` mode for those.
+    """
+
+    def __init__(self, mode: str = "sample", memory: bool = False):
+        self.mode = mode if mode in PROFILE_MODES else "sample"
+        self.memory = memory
+        self._sampler: Optional[StackSampler] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._snapshot = None
+        self._after = None
+
+    def start(self) -> None:
+        if not _active.acquire(blocking=False):
+            raise ProfilerBusy("Another request is being profiled")
+        try:
+            if self.memory:
+                tracemalloc.start(25)
+                self._snapshot = tracemalloc.take_snapshot()
+            if self.mode == "cprofile":
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            else:
+                self._sampler = StackSampler()
+                self._sampler.start()
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if tracemalloc.is_tracing() and self._snapshot is not None:
+            self._after = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+        _active.release()
+
+    def stop_and_save(self, label: str) -> list[Path]:
+        self._release()
+
+        base = profile_base_name(label)
+        directory = Path(PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        if self._profile is not None:
+            path = directory / f"{base}.prof"
+            self._profile.dump_stats(str(path))
+            written.append(path)
+        if self._sampler is not None:
+            path = directory / f"{base}.folded"
+            path.write_text(self._sampler.folded(), encoding="utf-8")
+            written.append(path)
+        if self._snapshot is not None and self._after is not None:
+            top = self._after.compare_to(self._snapshot, "lineno")[:50]
+            path = directory / f"{base}.mem.txt"
+            path.write_text("\n".join(str(stat) for stat in top) + "\n", encoding="utf-8")
+            written.append(path)
+        prune_profiles()
+        return written
+
+
+def profile_base_name(label: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")[:80]
+    return f"{stamp}_{slug}"
+
+
+def list_profiles() -> list[Path]:
+    directory = Path(PROFILE_DIR)
+    if not directory.exists():
+        return []
+    files = [p for p in directory.iterdir() if p.is_file() and p.name.endswith(PROFILE_SUFFIXES)]
+    return sorted(files, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def prune_profiles(keep: int = PROFILE_RETENTION) -> None:
+    for path in list_profiles()[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def resolve_profile(name: str) -> Optional[Path]:
+    """Look a profile up by file name without letting the name escape PROFILE_DIR."""
+    for path in list_profiles():
+        if path.name == name:
+            return path
+    return None
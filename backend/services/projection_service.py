@@ -0,0 +1,58 @@
+"""Sparse fieldsets (``?fields=``): project list responses onto a subset of their schema's fields.
+
+Requested columns become the SELECT list (``load_only``); relationships are loaded only when their
+field is requested; the rows are serialized through a schema generated for exactly those fields.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, noload
+
+
+class UnknownFieldsError(ValueError):
+    pass
+
+
+def parse_fields(value: Optional[str]) -> tuple[str, ...]:
+    """Requested field names in request order, always including ``id``."""
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    return tuple(dict.fromkeys(["id", *names]))
+
+
+@lru_cache(maxsize=256)
+def projection_schema(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    """A model with only ``fields`` of ``schema``, keeping their types, defaults and aliases."""
+    definitions = {name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields}
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True, populate_by_name=True),
+        **definitions,
+    )
+
+
+def projection_options(model: Any, fields: tuple[str, ...], relations: dict[str, tuple[Any, Any]]) -> tuple:
+    """Loader options selecting only the requested columns and relationships of ``model``."""
+    mapper = inspect(model)
+    columns = set()
+    loaders = []
+    for name in fields:
+        if name in relations:
+            relationship, loader = relations[name]
+            loaders.append(loader)
+            # Selectin loading of a many-to-one reads the foreign key from the parent row.
+            columns.update(column.key for column in relationship.property.local_columns)
+        else:
+            columns.add(name)
+    return (load_only(*(getattr(model, key) for key in sorted(columns))), *loaders, noload("*"))
+
+
+def project(schema: type[BaseModel], model: Any, value: str, relations: dict[str, tuple[Any, Any]]) -> tuple[type[BaseModel], tuple]:
+    """(response schema, loader options) for ``?fields=value`` on a list of ``model`` rows."""
+    fields = parse_fields(value)
+    columns = inspect(model).column_attrs.keys()
+    unknown = [name for name in fields if name not in schema.model_fields or (name not in relations and name not in columns)]
+    if unknown:
+        raise UnknownFieldsError(f"Unknown fields: {', '.join(unknown)}")
+    return projection_schema(schema, fields), projection_options(model, fields, relations)
@@ -0,0 +1,108 @@
+"""Per-request SQL statement counting, hooked into SQLAlchemy engine events."""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import re
+import time
+from typing import Optional
+
+from sqlalchemy import event
+
+from services.telemetry_service import Histogram, REGISTRY
+
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    "db_queries_per_request", "SQL statements issued per HTTP request.", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250)))
+
+_IN_LIST = re.compile(r"\((\s*(\?|%\([^)]+\)s|:\w+|\$\d+)\s*,?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse expanded IN lists and whitespace so repeats of one query compare equal."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(…)", statement)).strip()
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, minimum: int = 2) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= minimum]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Collectors that see every statement on the engine regardless of context (test helpers).
+_global_collectors: list[QueryStats] = []
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def start_tracking() -> tuple[QueryStats, object]:
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop_tracking(token) -> None:
+    _current.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    elapsed = time.perf_counter() - start
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for collector in _global_collectors:
+        collector.record(statement, elapsed)
+
+
+def instrument_engine(engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Count every statement the engine runs inside the block, e.g. in tests::
+
+        with count_queries() as stats:
+            client.get("/api/applications/")
+        assert stats.count <= 4, stats.repeated()
+
+    Unlike the per-request tracking this is not context-local, so it also sees
+    statements issued from TestClient's portal thread.
+    """
+    if engine is None:
+        from database import engine
+    instrument_engine(engine)
+    stats = QueryStats()
+    _global_collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None):
+    """Fail when the block issues more than ``limit`` statements, listing each statement shape."""
+    with count_queries(engine) as stats:
+        yield stats
+    if stats.count > limit:
+        shapes = "\n".join(f"  {n}x {shape}" for shape, n in stats.shapes.most_common())
+        raise AssertionError(f"expected at most {limit} queries, got {stats.count}\n{shapes}")
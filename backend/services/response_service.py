@@ -0,0 +1,168 @@
+from email.utils import formatdate, parsedate_to_datetime
+import gzip
+import mmap
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+from config.settings import COMPRESSION_LEVEL
+from middleware.compression import accepts_encoding, is_compressible
+from services.etag_service import etag_matches
+from services.telemetry_service import record_cache
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "no-cache"
+
+
+def precompressed_path(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
+
+
+def write_precompressed(path: Path, media_type: str) -> Path | None:
+    """Store a gzip sibling of a generated artifact so it is not recompressed per request."""
+    if not is_compressible(media_type):
+        return None
+    gz_path = precompressed_path(path)
+    with path.open("rb") as src, gzip.open(gz_path, "wb", compresslevel=COMPRESSION_LEVEL) as dst:
+        shutil.copyfileobj(src, dst)
+    return gz_path
+
+
+def artifact_response(request: Request, path: Path, media_type: str, immutable: bool = False) -> FileResponse:
+    """FileResponse with explicit Cache-Control, serving the stored .gz copy when the client accepts it.
+
+    ``immutable`` is for content-addressed files whose bytes can never change under the same URL.
+    """
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else MUTABLE_CACHE_CONTROL}
+    gz_path = precompressed_path(path)
+    accepts_gzip = accepts_encoding(request.headers.get("accept-encoding", ""), "gzip")
+    if accepts_gzip and is_compressible(media_type):
+        fresh = gz_path.exists() and gz_path.stat().st_mtime >= path.stat().st_mtime
+        record_cache("precompressed", fresh)
+        if fresh:
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+            return FileResponse(path=gz_path, filename=path.name, media_type=media_type, headers=headers)
+    return FileResponse(path=path, filename=path.name, media_type=media_type, headers=headers)
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Inclusive (start, end) for a single ``bytes=`` range; None means serve the whole file.
+
+    Multi-range and malformed headers are ignored (RFC 9110 allows answering them with 200).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def if_range_allows(if_range: Optional[str], etag: str, last_modified: str) -> bool:
+    """Range applies unless If-Range names a different representation (strong comparison only)."""
+    if not if_range:
+        return True
+    if if_range.startswith(("W/", '"')):
+        return not etag.startswith("W/") and if_range == etag
+    return if_range == last_modified
+
+
+class RangeFileResponse(Response):
+    """Serve a byte range of a file without reading it through Python file objects.
+
+    Uses the ASGI zero-copy send extension (sendfile) when the server offers it and
+    otherwise sends slices of an mmap of the file, which stay in the page cache.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: Path, size: int, media_type: str, headers: dict[str, str],
+                 byte_range: Optional[tuple[int, int]] = None):
+        super().__init__(status_code=206 if byte_range else 200, media_type=media_type, headers=headers)
+        self.path = path
+        self.start, self.end = byte_range if byte_range else (0, size - 1)
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        length = self.end - self.start + 1
+        if scope["method"].upper() == "HEAD" or length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                await send({"type": "http.response.zerocopysend", "file": fd, "offset": self.start, "count": length})
+            finally:
+                os.close(fd)
+            return
+        with self.path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = self.start
+            while position <= self.end:
+                stop = min(position + self.chunk_size, self.end + 1)
+                await send({"type": "http.response.body", "body": mapped[position:stop], "more_body": stop <= self.end})
+                position = stop
+
+
+def stored_file_response(request: Request, path: Path, media_type: str, etag: str, filename: str,
+                         immutable: bool = False) -> Response:
+    """Conditional, range-capable response for a stored artifact file.
+
+    ``etag`` is the content hash for store blobs (strong) or a weak stat-based tag for legacy files.
+    """
+    stat_result = path.stat()
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else MUTABLE_CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = etag_matches(if_none_match, etag.removeprefix("W/"))
+    else:
+        not_modified = False
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                not_modified = int(stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                pass
+    record_cache("artifact_download", not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    byte_range = None
+    if if_range_allows(request.headers.get("if-range"), etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers.get("range"), stat_result.st_size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{stat_result.st_size}"})
+    return RangeFileResponse(path, stat_result.st_size, media_type, headers, byte_range)
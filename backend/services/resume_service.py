@@ -1,21 +1,20 @@
 
 from __future__ import annotations
 
-import argparse
-import shutil
-import subprocess
 import logging
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
 
-import psycopg2
-import yaml
 from config.settings import BASE_STORAGE_PATH
+from services.pandoc_service import run_pandoc
+from services.pdf_engine_service import render_pdf
+from services.tracing_service import span
 
 logger = logging.getLogger("jobtelem")
 
 def load_yaml(path: Path) -> dict[str, Any]:
+    import yaml  # imported lazily; only the resume endpoints need it
+
     return yaml.safe_load(path.read_text(encoding="utf-8"))
 
 
@@ -128,21 +127,20 @@ def render_skills(data: dict[str, Any],
                   mode: str,
                   ) -> str:
     skills = data.get("skills") or []
-    if not skills:
-        return ""
-    out = ["## Technical Skills", "", "----", "\n"]
     kept = []
 
-    for s in skills or []:
+    for s in skills:
         header = md_escape(s.get("header"))
         text = md_escape(s.get("skill"))
         tags = norm_tags(s.get("tags"))
         if header and text and bullet_included(tags, include, exclude, mode):
             kept.append(f"- **{md_escape(str(header))}** {md_escape(str(text))}")
 
-    if kept:
-        for t in kept:
-            out.append(f"{t}")
+    # No heading when the filter left no skills, whether the list was empty or not.
+    if not kept:
+        return ""
+    out = ["## Technical Skills", "", "----", "\n"]
+    out.extend(kept)
     out.append("")
     return "\n".join(out)
 
@@ -231,21 +229,30 @@ def render_education(data: dict[str, Any]) -> str:
 
 def build_md(data: dict[str, Any], include: set[str], exclude: set[str], mode: str) -> str:
     logger.info(f"Building markdown with include={include}, exclude={exclude}, mode={mode}")
-    parts = [
-        render_header(data),
-        render_summary(data, include, exclude, mode),
-        render_certification(data, include, exclude, mode),
-        render_skills(data, include, exclude, mode),
-        render_experience(data, include, exclude, mode),
-        render_projects(data, include, exclude, mode),
-        render_education(data),
-    ]
-    return "\n".join([p for p in parts if p]).strip() + "\n"
-
-
-def create_odt_from_md():
-    md_path = Path(BASE_STORAGE_PATH) / "resume.md"
-    odt_path = Path(BASE_STORAGE_PATH) / "resume.odt"
+    # Tag filtering happens inside each renderer, so each span covers filter + assembly.
+    with span("build_md"):
+        with span("render.header"):
+            header = render_header(data)
+        with span("render.summary"):
+            summary = render_summary(data, include, exclude, mode)
+        with span("render.certification"):
+            certification = render_certification(data, include, exclude, mode)
+        with span("render.skills"):
+            skills = render_skills(data, include, exclude, mode)
+        with span("render.experience"):
+            experience = render_experience(data, include, exclude, mode)
+        with span("render.projects"):
+            projects = render_projects(data, include, exclude, mode)
+        with span("render.education"):
+            education = render_education(data)
+        parts = [header, summary, certification, skills, experience, projects, education]
+        return "\n".join([p for p in parts if p]).strip() + "\n"
+
+
+def create_odt_from_md(directory: Path | None = None):
+    directory = directory or Path(BASE_STORAGE_PATH)
+    md_path = directory / "resume.md"
+    odt_path = directory / "resume.odt"
     
     ref_doc_path = Path(__file__).resolve().parents[1] / "config" / "custom-reference.odt"
     cmd = [
@@ -255,27 +262,11 @@ def create_odt_from_md():
     "-t","odt",
     "-o", str(odt_path),
     ]    
-    subprocess.run(cmd, check=True)
+    run_pandoc(cmd, "odt")
     return odt_path
 
 
-def create_resume_pdf_from_md(pdf_engine: str = "tectonic"):
+def create_resume_pdf_from_md(pdf_engine: str = None):
     md_path = Path(BASE_STORAGE_PATH) / "resume.md"
     pdf_path = Path(BASE_STORAGE_PATH) / "resume.pdf"
-    template_path = Path(__file__).resolve().parents[1] / "config" / "resume_template.tex"
-    cmd = [
-        "pandoc",
-        str(md_path),
-        "--pdf-engine", pdf_engine,
-        "--template", str(template_path),
-        # "-V", "geometry:margin=0.75in",
-        "-V", "fontsize=10pt",
-        "-V", "mainfont=DejaVu Sans",
-        "-V", "sansfont=DejaVu Sans",
-        # "-V", "linestretch=1.05",
-        "-o", str(pdf_path),
-    ]
-    subprocess.run(cmd, check=True)
-    return pdf_path
-            
-    
\ No newline at end of file
+    return render_pdf(md_path, "resume_template.tex", pdf_path, pdf_engine)
@@ -0,0 +1,234 @@
+"""Database-backed resume content: YAML import/export and tag-filtered loading."""
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session, noload
+
+from models.models import ResumeBullet, ResumeEntry, ResumeProfile, ResumeSectionEnum, ResumeTag, resume_bullet_tags
+from services.resume_service import norm_tags
+
+# YAML keys for the grouped sections, mapped onto ResumeEntry columns.
+ENTRY_FIELDS = {
+    ResumeSectionEnum.experience: {"company": "heading", "title": "subheading", "location": "location", "dates": "dates"},
+    ResumeSectionEnum.projects: {"name": "heading", "dates": "dates"},
+    ResumeSectionEnum.education: {"school": "heading", "detail": "subheading", "year": "dates"},
+}
+# YAML keys for the flat taggable sections, mapped onto ResumeBullet columns.
+BULLET_FIELDS = {
+    ResumeSectionEnum.summary: {"text": "text"},
+    ResumeSectionEnum.certification: {"header": "header", "text": "text"},
+    ResumeSectionEnum.skills: {"header": "header", "skill": "text"},
+}
+ENTRY_BULLET_FIELDS = {"text": "text"}
+
+
+def get_profile(name: str, db: Session) -> Optional[ResumeProfile]:
+    # noload: the selectin bullets/entries relationships would pull the whole profile in.
+    return db.execute(
+        select(ResumeProfile).options(noload("*")).where(ResumeProfile.name == name)
+    ).scalar_one_or_none()
+
+
+def _tag_ids(names: set[str], db: Session, cache: dict[str, int]) -> list[int]:
+    missing = [n for n in names if n not in cache]
+    if missing:
+        for tag in db.execute(select(ResumeTag).where(ResumeTag.name.in_(missing))).scalars():
+            cache[tag.name] = tag.id
+        for name in missing:
+            if name not in cache:
+                tag = ResumeTag(name=name)
+                db.add(tag)
+                db.flush()
+                cache[name] = tag.id
+    return [cache[n] for n in names]
+
+
+def import_yaml(data: dict[str, Any], profile_name: str, db: Session, user_id: Optional[int] = None) -> ResumeProfile:
+    """Replace the content of ``profile_name`` with a resume.yaml-shaped dict."""
+    profile = get_profile(profile_name, db)
+    if profile is None:
+        profile = ResumeProfile(name=profile_name)
+        db.add(profile)
+    else:
+        bullet_ids = select(ResumeBullet.id).where(ResumeBullet.profile_id == profile.id)
+        db.execute(delete(resume_bullet_tags).where(resume_bullet_tags.c.bullet_id.in_(bullet_ids)))
+        db.execute(delete(ResumeBullet).where(ResumeBullet.profile_id == profile.id))
+        db.execute(delete(ResumeEntry).where(ResumeEntry.profile_id == profile.id))
+        db.expire(profile)
+
+    profile.user_id = user_id if user_id is not None else profile.user_id
+    profile.full_name = data.get("name")
+    profile.location = data.get("location")
+    profile.phone = None if data.get("phone") is None else str(data.get("phone"))
+    profile.email = data.get("email")
+    db.flush()
+
+    tag_cache: dict[str, int] = {}
+    links: list[dict[str, int]] = []
+
+    def add_bullet(section, item, fields, position, entry_id=None):
+        bullet = ResumeBullet(profile_id=profile.id, section=section, entry_id=entry_id, position=position)
+        for key, column in fields.items():
+            value = item.get(key)
+            setattr(bullet, column, None if value is None else str(value))
+        db.add(bullet)
+        db.flush()
+        for tag_id in _tag_ids(norm_tags(item.get("tags")), db, tag_cache):
+            links.append({"tag_id": tag_id, "bullet_id": bullet.id})
+
+    for section, fields in BULLET_FIELDS.items():
+        for position, item in enumerate(data.get(section.value) or []):
+            add_bullet(section, item, fields, position)
+
+    for section, fields in ENTRY_FIELDS.items():
+        for position, item in enumerate(data.get(section.value) or []):
+            entry = ResumeEntry(profile_id=profile.id, section=section, position=position)
+            for key, column in fields.items():
+                value = item.get(key)
+                setattr(entry, column, None if value is None else str(value))
+            db.add(entry)
+            db.flush()
+            for bullet_position, bullet in enumerate(item.get("bullets") or []):
+                add_bullet(section, bullet, ENTRY_BULLET_FIELDS, bullet_position, entry.id)
+
+    if links:
+        db.execute(resume_bullet_tags.insert(), links)
+    db.commit()
+    db.refresh(profile)
+    return profile
+
+
+def _profile_header(profile: ResumeProfile) -> dict[str, Any]:
+    return {"name": profile.full_name, "location": profile.location, "phone": profile.phone, "email": profile.email}
+
+
+def _entry_dict(entry: ResumeEntry) -> dict[str, Any]:
+    return {key: getattr(entry, column) for key, column in ENTRY_FIELDS[entry.section].items()}
+
+
+def _bullet_dict(section: ResumeSectionEnum, header: Optional[str], text: Optional[str]) -> dict[str, Any]:
+    fields = BULLET_FIELDS.get(section, ENTRY_BULLET_FIELDS)
+    values = {"header": header, "text": text}
+    return {key: values[column] for key, column in fields.items() if values[column] is not None}
+
+
+def _assemble(profile: ResumeProfile, entries: list[ResumeEntry], bullets, tags_by_bullet=None) -> dict[str, Any]:
+    data = _profile_header(profile)
+    for section in ResumeSectionEnum:
+        data[section.value] = []
+
+    entry_dicts = {}
+    for entry in entries:
+        item = _entry_dict(entry)
+        if entry.section != ResumeSectionEnum.education:
+            item["bullets"] = []
+        entry_dicts[entry.id] = item
+        data[entry.section.value].append(item)
+
+    for bullet in bullets:
+        item = _bullet_dict(bullet.section, bullet.header, bullet.text)
+        if tags_by_bullet is not None:
+            item["tags"] = sorted(tags_by_bullet.get(bullet.id, ()))
+        if bullet.entry_id is not None:
+            entry_dicts[bullet.entry_id]["bullets"].append(item)
+        else:
+            data[bullet.section.value].append(item)
+    return data
+
+
+def _entries(profile_id: int, db: Session) -> list[ResumeEntry]:
+    return list(db.execute(
+        select(ResumeEntry)
+        .options(noload("*"))
+        .where(ResumeEntry.profile_id == profile_id)
+        .order_by(ResumeEntry.section, ResumeEntry.position)
+    ).scalars())
+
+
+def export_yaml(profile_name: str, db: Session) -> Optional[dict[str, Any]]:
+    """The profile as a resume.yaml-shaped dict, tags included."""
+    profile = get_profile(profile_name, db)
+    if profile is None:
+        return None
+    bullets = db.execute(
+        select(ResumeBullet.id, ResumeBullet.section, ResumeBullet.entry_id, ResumeBullet.header, ResumeBullet.text)
+        .where(ResumeBullet.profile_id == profile.id)
+        .order_by(ResumeBullet.entry_id.nulls_first(), ResumeBullet.position)
+    ).all()
+    tags_by_bullet: dict[int, set[str]] = {}
+    for bullet_id, tag in db.execute(
+        select(resume_bullet_tags.c.bullet_id, ResumeTag.name)
+        .join(ResumeTag, ResumeTag.id == resume_bullet_tags.c.tag_id)
+        .join(ResumeBullet, ResumeBullet.id == resume_bullet_tags.c.bullet_id)
+        .where(ResumeBullet.profile_id == profile.id)
+    ):
+        tags_by_bullet.setdefault(bullet_id, set()).add(tag)
+    data = _assemble(profile, _entries(profile.id, db), bullets, tags_by_bullet)
+    return {key: value for key, value in data.items() if value not in (None, [])}
+
+
+def filtered_bullets_query(profile_id: int, include: set[str], exclude: set[str], mode: str):
+    """One query selecting the bullets that pass the tag filter, mirroring bullet_included()."""
+    def bullets_tagged(names):
+        return (
+            select(resume_bullet_tags.c.bullet_id)
+            .join(ResumeTag, ResumeTag.id == resume_bullet_tags.c.tag_id)
+            .where(ResumeTag.name.in_(names))
+        )
+
+    query = (
+        select(ResumeBullet.id, ResumeBullet.section, ResumeBullet.entry_id, ResumeBullet.header, ResumeBullet.text)
+        .where(ResumeBullet.profile_id == profile_id)
+        .order_by(ResumeBullet.entry_id.nulls_first(), ResumeBullet.position)
+    )
+    if exclude:
+        query = query.where(ResumeBullet.id.not_in(bullets_tagged(exclude)))
+    if include:
+        if mode == "any":
+            query = query.where(ResumeBullet.id.in_(bullets_tagged(include)))
+        elif mode == "all":
+            query = query.where(ResumeBullet.id.in_(
+                bullets_tagged(include)
+                .group_by(resume_bullet_tags.c.bullet_id)
+                .having(func.count(func.distinct(ResumeTag.name)) == len(include))
+            ))
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+    return query
+
+
+def load_resume_data(profile_name: str, include: set[str], exclude: set[str], mode: str, db: Session) -> Optional[dict[str, Any]]:
+    """resume.yaml-shaped data holding only the bullets that pass the filter.
+
+    The result is already filtered, so render it with ``build_md(data, set(), set(), mode)``.
+    """
+    profile = get_profile(profile_name, db)
+    if profile is None:
+        return None
+    bullets = db.execute(filtered_bullets_query(profile.id, include, exclude, mode)).all()
+    return _assemble(profile, _entries(profile.id, db), bullets)
+
+
+def filter_variants(data: dict[str, Any]) -> list[tuple[set[str], set[str], str]]:
+    """(include, exclude, mode) combinations over the tags used in a resume.yaml-shaped dict."""
+    tags: set[str] = set()
+    for section in ResumeSectionEnum:
+        for item in data.get(section.value) or []:
+            tags |= norm_tags(item.get("tags"))
+            for bullet in item.get("bullets") or []:
+                tags |= norm_tags(bullet.get("tags"))
+    includes = [set(), *({tag} for tag in sorted(tags)), tags]
+    excludes = [set(), *({tag} for tag in sorted(tags))]
+    return [(include, exclude, mode) for include in includes for exclude in excludes for mode in ("any", "all")]
+
+
+def compare_with_yaml(data: dict[str, Any], profile_name: str, db: Session) -> list[tuple[set[str], set[str], str]]:
+    """Filter variants for which the stored profile renders different markdown than ``data`` does."""
+    from services.resume_service import build_md
+
+    mismatches = []
+    for include, exclude, mode in filter_variants(data):
+        stored = load_resume_data(profile_name, include, exclude, mode, db)
+        if stored is None or build_md(stored, set(), set(), mode) != build_md(data, include, exclude, mode):
+            mismatches.append((include, exclude, mode))
+    return mismatches
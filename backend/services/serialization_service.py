@@ -0,0 +1,40 @@
+from functools import lru_cache
+import json
+from typing import Any, Iterable, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# Headers owned by the body we build; everything else set on the injected Response is kept.
+_BODY_HEADERS = {"content-length", "content-type"}
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: type) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def dump_rows(schema: type, rows: Iterable[Any]) -> bytes:
+    """Validate ORM rows once and encode them to JSON bytes in pydantic-core."""
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True), by_alias=True)
+
+
+def carried_headers(response: Optional[Response]) -> dict[str, str]:
+    """Headers already set on an injected ``response`` (ETag, Cache-Control, ...) that a new Response keeps."""
+    if response is None:
+        return {}
+    return {k: v for k, v in response.headers.items() if k not in _BODY_HEADERS}
+
+
+def json_rows_response(schema: type, rows: Iterable[Any], response: Optional[Response] = None) -> Response:
+    """Serialize a list endpoint's rows directly, skipping FastAPI's response_model round trip."""
+    return Response(content=dump_rows(schema, rows), media_type="application/json", headers=carried_headers(response))
+
+
+def json_collections_response(collections: dict[str, tuple[type, Iterable[Any]]], extra: Optional[dict[str, bytes]] = None,
+                              response: Optional[Response] = None) -> Response:
+    """One JSON object holding several serialized lists (``key -> (schema, rows)``) and pre-encoded ``extra`` values."""
+    parts = [json.dumps(key).encode() + b":" + value for key, value in (extra or {}).items()]
+    parts += [json.dumps(key).encode() + b":" + dump_rows(schema, rows) for key, (schema, rows) in collections.items()]
+    return Response(content=b"{" + b",".join(parts) + b"}", media_type="application/json", headers=carried_headers(response))
@@ -0,0 +1,110 @@
+"""Delta sync for the list endpoints: rows changed since a client's watermark, plus tombstones for deletes."""
+from datetime import datetime, timedelta, timezone
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+from sqlalchemy import delete, event, func, insert, or_, select
+from sqlalchemy.orm import Query, Session
+
+from config.settings import SYNC_WATERMARK_OVERLAP_SECONDS, TOMBSTONE_RETENTION_DAYS
+from database import SessionLocal
+from models.models import Application, Artifact, ArtifactMetric, Job, Role, Section, Tombstone, User
+from services.serialization_service import carried_headers, dump_rows
+
+SYNC_MODELS = (Role, Job, Application, Artifact, ArtifactMetric, Section, User)
+SYNC_TABLES = {model.__tablename__ for model in SYNC_MODELS}
+
+# Relationships serialized into each list response; a change to a nested row changes the parent's body.
+NESTED = {
+    Job: (Job.role,),
+    Application: (Application.job, Application.users),
+    Artifact: (Artifact.applications,),
+    ArtifactMetric: (ArtifactMetric.artifact,),
+}
+
+
+# ---- tombstones ----
+
+def _record_tombstones(session: Session, flush_context) -> None:
+    rows = [
+        {"table_name": obj.__tablename__, "row_id": obj.id}
+        for obj in session.deleted
+        if getattr(obj, "__tablename__", None) in SYNC_TABLES
+    ]
+    if rows:
+        session.connection().execute(insert(Tombstone), rows)
+
+
+if not event.contains(SessionLocal, "after_flush", _record_tombstones):
+    event.listen(SessionLocal, "after_flush", _record_tombstones)
+
+
+def record_tombstones(session: Session, table_name: str, row_ids: list[int]) -> None:
+    """Tombstones for rows removed by Core statements, which the flush hook does not see."""
+    if row_ids:
+        session.connection().execute(insert(Tombstone), [{"table_name": table_name, "row_id": row_id} for row_id in row_ids])
+
+
+def prune_tombstones(db: Session, retention_days: int = TOMBSTONE_RETENTION_DAYS) -> int:
+    result = db.execute(delete(Tombstone).where(Tombstone.deleted_at < sync_horizon(retention_days)))
+    db.commit()
+    return result.rowcount or 0
+
+
+# ---- queries ----
+
+def sync_horizon(retention_days: int = TOMBSTONE_RETENTION_DAYS) -> datetime:
+    """Oldest watermark for which deletes are still known."""
+    return datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def changed_since(model: Any, since: datetime):
+    """Rows of ``model`` updated after ``since``, directly or through a nested row in their response."""
+    nested = [rel.has(changed_since(rel.property.mapper.class_, since)) for rel in NESTED.get(model, ())]
+    return or_(model.updated_at > since, *nested)
+
+
+def deleted_ids(db: Session, model: Any, since: datetime) -> list[int]:
+    return list(db.scalars(
+        select(Tombstone.row_id)
+        .where(Tombstone.table_name == model.__tablename__, Tombstone.deleted_at > since)
+        .distinct()
+    ))
+
+
+def sync_response(schema: type, query: Query, model: Any, since: datetime, skip: int, limit: int, db: Session,
+                  response: Optional[Response] = None, removed: Any = None) -> Response:
+    """The ``?updated_since=`` form of a list endpoint.
+
+    Body: ``{"items": [...], "deleted": [ids], "watermark": ..., "reset": bool}``. ``items`` are rows
+    changed after ``since`` (paged with skip/limit), ``deleted`` the ids removed since then (plus rows
+    matching ``removed`` that changed, e.g. deactivated users), and ``watermark`` the value to send
+    next time. A watermark older than the tombstone retention yields every row with ``reset`` set,
+    and the client should replace what it holds.
+    """
+    # Taken before reading and moved back, so rows committed while this runs are seen next time.
+    now = as_utc(db.scalar(select(func.now())))
+    watermark = now - timedelta(seconds=SYNC_WATERMARK_OVERLAP_SECONDS)
+    since = as_utc(since)
+    reset = since < sync_horizon()
+    deleted: list[int] = []
+    if not reset:
+        query = query.filter(changed_since(model, since))
+        deleted = deleted_ids(db, model, since)
+        if removed is not None:
+            deleted += db.scalars(select(model.id).where(removed, model.updated_at > since)).all()
+    rows = query.order_by(model.id).offset(skip).limit(limit).all()
+
+    body = b"".join((
+        b'{"items":', dump_rows(schema, rows),
+        b',"deleted":', json.dumps(sorted(set(deleted))).encode(),
+        b',"watermark":', json.dumps(watermark.isoformat()).encode(),
+        b',"reset":', b"true" if reset else b"false",
+        b"}",
+    ))
+    return Response(content=body, media_type="application/json", headers=carried_headers(response))
@@ -0,0 +1,110 @@
+"""Streaming CSV / NDJSON exports of the tracking tables.
+
+Each export is one flat SELECT (joined columns included) read through a server-side cursor
+(``yield_per`` implies ``stream_results``), ``EXPORT_BATCH_ROWS`` rows at a time; every batch is
+encoded and sent as one chunk, so memory stays flat whatever the table size. The stream opens its
+own session: it outlives the request's ``get_db`` session.
+"""
+import csv
+from datetime import date, datetime
+import enum
+import io
+import json
+import logging
+from typing import Any, Iterator
+
+from sqlalchemy import Select, select
+
+from config.settings import EXPORT_BATCH_ROWS
+from database import SessionLocal
+from models.models import Application, Artifact, ArtifactMetric, Job, Role, User
+
+logger = logging.getLogger("jobtelem")
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _columns(model: Any, prefix: str = "", exclude: tuple[str, ...] = ()) -> list:
+    return [column.label(f"{prefix}{column.key}") for column in model.__table__.columns if column.key not in exclude]
+
+
+def jobs_export() -> Select:
+    return (
+        select(*_columns(Job), Role.lane.label("role_lane"))
+        .join(Role, Role.id == Job.role_id)
+        .order_by(Job.id)
+    )
+
+
+def applications_export() -> Select:
+    """Applications with their response, the job applied to and the applicant."""
+    return (
+        select(
+            *_columns(Application),
+            *_columns(Job, "job_", exclude=("id", "notes", "created_at", "updated_at")),
+            User.username.label("username"),
+        )
+        .join(Job, Job.id == Application.job_id)
+        .join(User, User.id == Application.user_id)
+        .order_by(Application.id)
+    )
+
+
+def artifact_metrics_export() -> Select:
+    return (
+        select(
+            *_columns(ArtifactMetric),
+            Artifact.type.label("artifact_type"),
+            Artifact.version_name.label("artifact_version_name"),
+            Artifact.application_id.label("application_id"),
+        )
+        .join(Artifact, Artifact.id == ArtifactMetric.artifact_id)
+        .order_by(ArtifactMetric.id)
+    )
+
+
+EXPORTS = {
+    "jobs": jobs_export,
+    "applications": applications_export,
+    "artifact_metrics": artifact_metrics_export,
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _csv_chunk(rows: list[tuple]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else _plain(value) for value in row])
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(keys: list[str], rows: list[tuple]) -> bytes:
+    return "".join(
+        json.dumps({key: _plain(value) for key, value in zip(keys, row)}) + "\n" for row in rows
+    ).encode()
+
+
+def stream_export(name: str, fmt: str, batch_rows: int = EXPORT_BATCH_ROWS) -> Iterator[bytes]:
+    """Yield the export ``name`` in ``fmt`` (csv with a header row, or ndjson), one batch per chunk."""
+    statement = EXPORTS[name]().execution_options(yield_per=batch_rows)
+    db = SessionLocal()
+    exported = 0
+    try:
+        result = db.execute(statement)
+        keys = list(result.keys())
+        if fmt == "csv":
+            yield _csv_chunk([keys])
+        for rows in result.partitions():
+            exported += len(rows)
+            yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(keys, rows)
+    finally:
+        db.close()  # also closes the server-side cursor when the client disconnects early
+        logger.info(f"Exported {exported} {name} rows as {fmt}")
@@ -0,0 +1,219 @@
+"""In-process metrics registry rendered in the Prometheus text exposition format.
+
+Each worker process keeps its own registry; scrape workers individually (or run one
+worker) when you need exact per-process numbers.
+"""
+import threading
+import time
+from typing import Callable, Iterable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        with self._lock:
+            items = [(key, list(state[0]), state[1], state[2]) for key, state in self._values.items()]
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method", "route")))
+
+DB_POOL_CHECKOUT = REGISTRY.register(Histogram(
+    "db_pool_checkout_seconds", "Time spent acquiring a connection from the pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)))
+DB_POOL_CHECKED_OUT = REGISTRY.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool."))
+DB_POOL_SIZE = REGISTRY.register(Gauge("db_pool_size", "Configured pool size."))
+DB_POOL_OVERFLOW = REGISTRY.register(Gauge("db_pool_overflow", "Connections open beyond the pool size."))
+
+RENDER_IN_PROGRESS = REGISTRY.register(Gauge(
+    "render_in_progress", "Document conversions waiting on or running pandoc.", ("format",)))
+PANDOC_RUNS = REGISTRY.register(Counter(
+    "pandoc_runs_total", "pandoc invocations by output format and exit code.", ("format", "exit_code")))
+PANDOC_DURATION = REGISTRY.register(Histogram(
+    "pandoc_duration_seconds", "pandoc wall time by output format.", ("format",)))
+LATEX_RUNS = REGISTRY.register(Counter(
+    "latex_runs_total", "LaTeX engine compiles by engine and exit code.", ("engine", "exit_code")))
+LATEX_DURATION = REGISTRY.register(Histogram(
+    "latex_duration_seconds", "LaTeX engine compile wall time.", ("engine",)))
+PRERENDER_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "prerender_queue_depth", "Artifacts waiting for a background re-render."))
+PRERENDER_RUNS = REGISTRY.register(Counter(
+    "prerender_runs_total", "Background re-renders by result (ok/error/skipped).", ("result",)))
+
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result")))
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "cache_hit_ratio", "Hits / lookups per cache since process start.", ("cache",)))
+CACHE_EVICTIONS = REGISTRY.register(Counter(
+    "cache_evictions_total", "Entries dropped from lookup caches by reason (size/expired/invalidated).",
+    ("cache", "reason")))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _update_cache_ratios() -> None:
+    caches = {key[0] for key in list(CACHE_REQUESTS._values)}
+    for cache in caches:
+        hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+        CACHE_HIT_RATIO.set(hits / total if total else 0.0, cache=cache)
+
+
+REGISTRY.add_collector(_update_cache_ratios)
+
+
+def instrument_engine(engine) -> None:
+    """Time pool checkouts and expose pool usage gauges for ``engine``."""
+    pool = engine.pool
+    if getattr(pool, "_telemetry_instrumented", False):
+        return
+    pool._telemetry_instrumented = True
+    connect = pool.connect
+
+    def timed_connect():
+        start = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - start)
+
+    pool.connect = timed_connect
+
+    def collect_pool() -> None:
+        for gauge, attr in ((DB_POOL_CHECKED_OUT, "checkedout"), (DB_POOL_SIZE, "size"), (DB_POOL_OVERFLOW, "overflow")):
+            if hasattr(pool, attr):
+                gauge.set(getattr(pool, attr)())
+
+    REGISTRY.add_collector(collect_pool)
@@ -0,0 +1,115 @@
+"""Compiled cover-letter section templates.
+
+Section content uses str.format placeholders (``{company}``). Parsing that on every
+render adds up in batch runs, so each section is split once into literal and
+placeholder segments, cached by (section id, content hash), and rendered by joining.
+The key follows the content itself: updated_at has one-second resolution on SQLite,
+so an edit within the same second would otherwise keep serving the old segments.
+"""
+from collections import OrderedDict
+import hashlib
+from string import Formatter
+import threading
+from typing import Any, Hashable, Optional
+
+from services.telemetry_service import record_cache
+
+# Placeholders build_cover_letter provides.
+TEMPLATE_FIELDS = frozenset({
+    "company", "title", "contact", "contact_address", "required_skills", "full_name", "email",
+})
+TEMPLATE_CACHE_SIZE = 1024
+
+_formatter = Formatter()
+_cache: "OrderedDict[Hashable, tuple]" = OrderedDict()
+_lock = threading.Lock()
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class _KeepMissing(dict):
+    """Unknown placeholders format as themselves, as SafeFormatDict did under format_map."""
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def compile_template(content: str) -> tuple[tuple[str, Optional[str], str, Optional[str], str], ...]:
+    """Split ``content`` into (literal, field, original placeholder text, conversion, spec) segments."""
+    segments = []
+    try:
+        for literal, field, spec, conversion in _formatter.parse(content):
+            original = None
+            if field is not None:
+                original = "{" + field + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+            segments.append((literal, field, original, conversion, spec or ""))
+    except ValueError as exc:
+        raise TemplateError(f"Invalid template: {exc}") from exc
+    return tuple(segments)
+
+
+def validate_template(content: str) -> None:
+    """Reject content whose placeholders build_cover_letter cannot fill."""
+    for _, field, original, _, _ in compile_template(content):
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS or original != "{" + field + "}":
+            allowed = ", ".join("{" + f + "}" for f in sorted(TEMPLATE_FIELDS))
+            raise TemplateError(f"Unsupported placeholder {original}; use one of {allowed} (escape braces as {{{{ }}}})")
+
+
+def _format_field(field: str, conversion: Optional[str], spec: str, values: dict[str, str]) -> str:
+    # What str.format_map does for one placeholder: look up, convert (!r/!s/!a), then apply the spec.
+    mapping = _KeepMissing(values)
+    value, _ = _formatter.get_field(field, (), mapping)
+    value = _formatter.convert_field(value, conversion)
+    if "{" in spec:
+        spec = _formatter.vformat(spec, (), mapping)
+    return _formatter.format_field(value, spec)
+
+
+def render_template(segments: tuple, values: dict[str, str]) -> str:
+    """Same output as ``content.format_map(SafeFormatDict(values))``; plain ``{field}`` placeholders skip the formatter."""
+    parts = []
+    for literal, field, original, conversion, spec in segments:
+        parts.append(literal)
+        if field is None:
+            continue
+        if conversion or spec or not field.isidentifier():
+            parts.append(_format_field(field, conversion, spec, values))
+        else:
+            parts.append(values[field] if field in values else original)
+    return "".join(parts)
+
+
+def get_compiled(key: Hashable, content: str, record: bool = True) -> tuple:
+    with _lock:
+        segments = _cache.get(key)
+        if segments is not None:
+            _cache.move_to_end(key)
+    if record:
+        record_cache("section_template", segments is not None)
+    if segments is None:
+        segments = compile_template(content)
+        with _lock:
+            _cache[key] = segments
+            while len(_cache) > TEMPLATE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return segments
+
+
+def section_key(section_id: Any, content: str) -> Hashable:
+    return (section_id, hashlib.sha256(content.encode("utf-8")).digest())
+
+
+def render_section(section: Any, values: dict[str, str]) -> str:
+    content = section.content.strip()
+    return render_template(get_compiled(section_key(section.id, content), content), values)
+
+
+def warm_section(section: Any) -> None:
+    """Compile a freshly saved section so the next render is a cache hit."""
+    content = section.content.strip()
+    get_compiled(section_key(section.id, content), content, record=False)
@@ -0,0 +1,141 @@
+"""Lightweight span tracing for the document pipeline, exported as JSON lines."""
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import os
+from pathlib import Path
+import statistics
+import threading
+import time
+from typing import Any, Optional
+import uuid
+
+from config.settings import TRACE_FILE, TRACE_FILE_MAX_BYTES, TRACING_ENABLED
+
+logger = logging.getLogger("jobtelem")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "root", "started_at", "start", "duration", "attrs", "finished")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.root = parent.root if parent else self
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.attrs = attrs
+        self.finished: list[Span] = []
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "root": self.root.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attrs": self.attrs,
+        }
+
+
+class _NoopSpan:
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+@contextmanager
+def span(name: str, **attrs: Any):
+    """Time a pipeline stage. The outermost span exports the whole trace when it ends."""
+    if not TRACING_ENABLED:
+        yield _NoopSpan()
+        return
+
+    parent = _current_span.get()
+    current = Span(name, parent, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as exc:
+        current.attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+        current.root.finished.append(current)
+        if parent is None:
+            export(current.finished)
+
+
+def export(spans: list[Span]) -> None:
+    lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+    path = Path(TRACE_FILE)
+    try:
+        with _write_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists() and path.stat().st_size > TRACE_FILE_MAX_BYTES:
+                os.replace(path, path.with_name(path.name + ".1"))
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(lines)
+    except OSError as exc:
+        logger.warning(f"Could not write trace to {path}: {exc}")
+
+
+def read_spans(limit: int = 20_000) -> list[dict[str, Any]]:
+    path = Path(TRACE_FILE)
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as fh:
+        lines = fh.readlines()[-limit:]
+    spans = []
+    for line in lines:
+        try:
+            spans.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return spans
+
+
+def summarize(spans: list[dict[str, Any]]) -> dict[str, dict[str, dict[str, float]]]:
+    """Per artifact pipeline (root span) and stage: count and duration distribution in ms.
+
+    Subprocess stages also report mean child CPU time and output size.
+    """
+    grouped: dict[str, dict[str, list[float]]] = {}
+    extras: dict[tuple[str, str], dict[str, list[float]]] = {}
+    for s in spans:
+        grouped.setdefault(s["root"], {}).setdefault(s["name"], []).append(s["duration_ms"])
+        attrs = s.get("attrs") or {}
+        if "cpu_user_ms" in attrs:
+            stage_extras = extras.setdefault((s["root"], s["name"]), {"cpu_ms": [], "output_bytes": []})
+            stage_extras["cpu_ms"].append(attrs["cpu_user_ms"] + attrs.get("cpu_sys_ms", 0))
+            if attrs.get("output_bytes") is not None:
+                stage_extras["output_bytes"].append(attrs["output_bytes"])
+
+    summary = {}
+    for root, stages in grouped.items():
+        summary[root] = {}
+        for stage, durations in stages.items():
+            durations.sort()
+            summary[root][stage] = {
+                "count": len(durations),
+                "mean_ms": round(statistics.fmean(durations), 3),
+                "p50_ms": round(statistics.median(durations), 3),
+                "p95_ms": round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3),
+                "max_ms": round(durations[-1], 3),
+            }
+            for key, values in extras.get((root, stage), {}).items():
+                if values:
+                    summary[root][stage][f"mean_{key}"] = round(statistics.fmean(values), 3)
+    return summary
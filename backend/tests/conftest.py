@@ -0,0 +1,79 @@
+"""Shared fixtures: the app runs against a throwaway SQLite database and storage directory.
+
+Settings are read from the environment at import time, so they are set here before
+anything from the backend is imported. Run from backend/: python -m pytest -q
+"""
+import os
+from pathlib import Path
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+_storage = Path(tempfile.mkdtemp(prefix="jobtelem-tests-"))
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_storage / 'test.db'}",
+    "BASE_STORAGE_PATH": str(_storage),
+    "LOG_PATH": str(_storage / "log"),
+    "ARTIFACT_STORE_PATH": str(_storage / "artifact-store"),
+    "CREATE_TABLES_ON_STARTUP": "true",
+    "PRERENDER_ENABLED": "false",
+    "ARTIFACT_COMPACTION_INTERVAL": "0",
+    "ARCHIVE_INTERVAL_SECONDS": "0",
+    "TRACING_ENABLED": "false",
+})
+sys.path.insert(0, str(BACKEND_DIR))
+os.chdir(BACKEND_DIR)  # config/resume.yaml and friends are opened relative to the backend root
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from services import template_service  # noqa: E402
+from services.lookup_cache_service import USER_CACHE  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def clean_state(client):
+    """Every test starts from empty tables and empty in-process caches."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    USER_CACHE.clear()
+    with template_service._lock:
+        template_service._cache.clear()
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def seed(client):
+    """One user, role, job and application with a cover letter made of one section."""
+    role = client.post("/api/roles/", json={"lane": "devops", "core_skills": "k8s"}).json()
+    user = client.post("/api/users/create", json={
+        "username": "heather", "email": "h@example.com", "full_name": "Heather H",
+        "address": "1 Main St", "city": "Springfield", "state": "IL", "postal_code": "62701",
+    }).json()
+    job = client.post("/api/jobs/", json={"company": "Acme", "title": "SRE", "role_id": role["id"]}).json()
+    application = client.post("/api/applications/", json={"job_id": job["id"], "user_id": user["id"]}).json()
+    artifact = client.post("/api/artifacts/", json={
+        "type": "cover_letter", "version_name": "v1", "application_id": application["id"],
+    }).json()
+    section = client.post(f"/api/artifacts/{artifact['id']}/sections/", json={
+        "name": "intro", "type": "text", "content": "I want the {title} role at {company}.",
+    }).json()
+    return {"role": role, "user": user, "job": job, "application": application, "artifact": artifact, "section": section}
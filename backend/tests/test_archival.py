@@ -0,0 +1,54 @@
+import io
+import json
+import zipfile
+
+from services.archival_service import archive_applications
+
+
+def archive_seeded_application(client, seed, db):
+    rendered = client.post("/api/cover-letter/create/md", json={
+        "application_id": seed["application"]["id"], "username": seed["user"]["username"],
+    })
+    assert rendered.status_code == 200
+    client.put(f"/api/applications/{seed['application']['id']}", json={"active": False})
+    assert archive_applications(db, after_days=0) == 1
+    return rendered.content
+
+
+def test_archived_application_leaves_live_lists(client, seed, db):
+    archive_seeded_application(client, seed, db)
+
+    assert client.get(f"/api/applications/{seed['application']['id']}").status_code == 404
+    assert client.get("/api/artifacts/").json() == []
+    archived = client.get("/api/artifacts/?include_archived=true").json()
+    assert [artifact["id"] for artifact in archived] == [seed["artifact"]["id"]]
+
+
+def test_archived_artifacts_can_be_exported(client, seed, db):
+    body = archive_seeded_application(client, seed, db)
+    params = {"application_id": seed["application"]["id"]}
+
+    assert client.get("/api/artifacts/archive", params=params).status_code == 404
+    response = client.get("/api/artifacts/archive", params={**params, "include_archived": "true"})
+    assert response.status_code == 200
+
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    manifest = json.loads(archive.read("manifest.json"))
+    [entry] = manifest["artifacts"]
+    assert entry["id"] == seed["artifact"]["id"] and entry["archived"]
+    [stored] = entry["files"]
+    assert archive.read(stored["path"]) == body
+
+
+def test_archived_artifacts_can_be_downloaded(client, seed, db):
+    body = archive_seeded_application(client, seed, db)
+    artifact_id = seed["artifact"]["id"]
+
+    assert client.get(f"/api/artifacts/{artifact_id}/download?format=md").status_code == 404
+    versions = client.get(f"/api/artifacts/{artifact_id}/versions/?include_archived=true").json()
+    assert [(version["format"], version["version"]) for version in versions] == [("md", 1)]
+    response = client.get(f"/api/artifacts/{artifact_id}/download?format=md&version=1&include_archived=true")
+    assert response.status_code == 200
+    assert response.content == body
+    latest = client.get(f"/api/artifacts/{artifact_id}/download?include_archived=true")
+    assert latest.status_code == 200 and latest.content == body
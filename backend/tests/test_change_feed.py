@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from models.models import ChangeEvent
+from services import change_feed_service
+from services.change_feed_service import event_stream, read_events
+
+
+def add_event(db, event_id, row_id):
+    db.add(ChangeEvent(id=event_id, table_name="jobs", op="update", row_id=row_id, data=None))
+    db.commit()
+
+
+def test_late_commit_with_smaller_id_is_not_skipped(db):
+    add_event(db, 10, row_id=1)
+    [first] = read_events(0)
+    assert (first.id, first.seq) == (10, 1)
+
+    # A transaction that took id 5 before id 10 was written, but committed after a reader moved on.
+    add_event(db, 5, row_id=2)
+    [late] = read_events(first.seq)
+    assert (late.id, late.row_id, late.seq) == (5, 2, 2)
+
+
+def collect_stream(monkeypatch, since):
+    monkeypatch.setattr(change_feed_service, "CHANGE_FEED_HEARTBEAT_SECONDS", 0.01)
+    polls = 0
+
+    async def is_disconnected():
+        nonlocal polls
+        polls += 1
+        return polls > 2
+
+    async def collect():
+        return [chunk async for chunk in event_stream(is_disconnected, since)]
+
+    return asyncio.run(collect())
+
+
+def changes(chunks):
+    return [json.loads(chunk.split("data: ", 1)[1]) for chunk in chunks if "event: change" in chunk]
+
+
+def test_stream_replays_writes_after_the_token(client, seed, monkeypatch):
+    client.put(f"/api/jobs/{seed['job']['id']}", json={"title": "Staff SRE"})
+    client.put(f"/api/jobs/{seed['job']['id']}", json={"title": "Principal SRE"})
+    chunks = collect_stream(monkeypatch, since=0)
+    titles = [change["data"]["title"] for change in changes(chunks) if change["table"] == "jobs" and change["op"] == "update"]
+    assert titles == ["Staff SRE", "Principal SRE"]
+    ids = [change["id"] for change in changes(chunks)]
+    assert ids == sorted(ids)
+
+    resumed = collect_stream(monkeypatch, since=ids[-2])
+    assert [change["id"] for change in changes(resumed)] == ids[-1:]
+
+
+def test_stream_resets_tokens_from_the_future(client, seed, monkeypatch):
+    chunks = collect_stream(monkeypatch, since=10_000)
+    assert chunks[0].startswith("event: reset")
+    assert changes(chunks) == []
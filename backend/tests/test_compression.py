@@ -0,0 +1,46 @@
+import pytest
+
+from middleware import compression
+from middleware.compression import accepts_encoding, choose_encoding
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.0, deflate", False),
+    ("GZIP;Q=0.5", True),
+    ("*", True),
+    ("*, gzip;q=0", False),
+    ("gzip;q=0, *", False),
+    ("identity", False),
+    ("x-gzip", False),
+    ("gzip;q=abc", False),
+    ("", False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_encoding(header, "gzip") is expected
+
+
+def test_choose_encoding_follows_q_values(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip;q=0") is None
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br") is None
+
+
+def test_refused_gzip_is_not_sent(client, seed):
+    for i in range(40):
+        client.post("/api/jobs/", json={"company": f"Co{i}", "title": "SRE", "role_id": seed["role"]["id"]})
+    assert client.get("/api/jobs/", headers={"Accept-Encoding": "gzip"}).headers.get("content-encoding") == "gzip"
+    assert "content-encoding" not in client.get("/api/jobs/", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_refused_gzip_skips_the_precompressed_artifact(client, seed):
+    body = {"username": "heather", "application_id": seed["application"]["id"]}
+    gzipped = client.post("/api/cover-letter/create/md", json=body, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers.get("content-encoding") == "gzip"
+    plain = client.post("/api/cover-letter/create/md", json=body, headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in plain.headers
+    assert "I want the SRE role at Acme." in plain.text
@@ -0,0 +1,32 @@
+def import_csv(client, text):
+    res = client.post("/api/jobs/import", params={"format": "csv"}, content=text.encode())
+    assert res.status_code == 200, res.text
+    return res.json()
+
+
+def test_import_inserts_then_updates_matching_postings(client, seed):
+    result = import_csv(client, (
+        "company,title,posting_url,lane,required_skills\n"
+        "Initech,SRE,https://jobs.example/1,devops,k8s\n"
+        "Globex,Platform Engineer,,devops,terraform\n"
+    ))
+    assert (result["inserted"], result["updated"], result["rejected"]) == (2, 0, 0)
+    before = {job["company"]: job for job in client.get("/api/jobs/").json()}
+    client.put(f"/api/jobs/{before['Initech']['id']}", json={"notes": "referral"})
+
+    result = import_csv(client, (
+        "company,title,posting_url,lane,required_skills\n"
+        "Initech Inc,SRE II,https://jobs.example/1,devops,k8s; go\n"   # same posting_url
+        "Globex,Platform Engineer,,devops,terraform; aws\n"             # same company and title
+        "Hooli,SRE,,devops,\n"
+        "Nobody,,,devops,\n"                                           # no title: rejected
+    ))
+    assert (result["inserted"], result["updated"], result["rejected"]) == (1, 2, 1)
+
+    jobs = client.get("/api/jobs/").json()
+    assert len(jobs) == 4  # the seeded job plus three imported
+    by_id = {job["id"]: job for job in jobs}
+    initech = by_id[before["Initech"]["id"]]
+    assert (initech["company"], initech["title"], initech["required_skills"]) == ("Initech Inc", "SRE II", "k8s; go")
+    assert initech["notes"] == "referral"  # user-owned fields are kept
+    assert by_id[before["Globex"]["id"]]["required_skills"] == "terraform; aws"
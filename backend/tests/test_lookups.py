@@ -0,0 +1,23 @@
+from sqlalchemy import delete
+
+from models.models import Role, User
+from services.database_service import get_user_by_username
+
+
+def test_job_for_role_deleted_by_another_worker_is_404(client, seed, db):
+    role = client.post("/api/roles/", json={"lane": "security", "core_skills": "iam"}).json()
+    assert client.post("/api/jobs/", json={"company": "Initech", "title": "SRE", "role_id": role["id"]}).status_code == 200
+    # Deleted behind this process's back, as by another worker: nothing here is invalidated.
+    db.execute(delete(Role).where(Role.id == role["id"]))
+    db.commit()
+    res = client.post("/api/jobs/", json={"company": "Initech", "title": "SRE II", "role_id": role["id"]})
+    assert res.status_code == 404
+
+
+def test_application_for_user_deleted_by_another_worker_is_404(client, seed, db):
+    user = client.post("/api/users/create", json={"username": "sam", "email": "s@example.com", "full_name": "Sam S"}).json()
+    assert get_user_by_username("sam", db) is not None  # cached, as after a cover-letter render
+    db.execute(delete(User).where(User.id == user["id"]))
+    db.commit()
+    res = client.post("/api/applications/", json={"job_id": seed["job"]["id"], "user_id": user["id"]})
+    assert res.status_code == 404
@@ -0,0 +1,15 @@
+from models.models import ArtifactRender
+from services.prerender_service import claim_queued
+
+
+def test_section_edit_is_handed_to_the_worker_process(client, seed, db):
+    # This process runs without the worker (PRERENDER_ENABLED is off), as API workers do.
+    client.post("/api/cover-letter/create/md", json={
+        "application_id": seed["application"]["id"], "username": seed["user"]["username"],
+    })
+    assert db.get(ArtifactRender, seed["artifact"]["id"]).queued_at is None
+
+    client.put(f"/api/sections/{seed['section']['id']}", json={"content": "Hello {company}."})
+
+    assert claim_queued(db) == [seed["artifact"]["id"]]
+    assert claim_queued(db) == []
@@ -0,0 +1,42 @@
+import itertools
+
+import pytest
+
+from services.query_stats_service import assert_max_queries, count_queries
+
+# Statements per request, independent of how many rows the lists hold.
+BUDGETS = {
+    "/api/jobs/": 3,
+    "/api/applications/": 5,
+    "/api/artifacts/": 6,
+    "/api/artifacts/{artifact}/metrics/": 7,
+    "/api/bootstrap/": 15,
+}
+
+_row_ids = itertools.count()
+
+
+def add_rows(client, seed, n):
+    """n more jobs, each with its own role, an application, a cover letter and a section, and n metrics on the seeded artifact."""
+    for _ in range(n):
+        i = next(_row_ids)
+        role = client.post("/api/roles/", json={"lane": "devops", "core_skills": f"skill{i}"}).json()
+        job = client.post("/api/jobs/", json={"company": f"Co{i}", "title": "SRE", "role_id": role["id"]}).json()
+        application = client.post("/api/applications/", json={"job_id": job["id"], "user_id": seed["user"]["id"]}).json()
+        artifact = client.post("/api/artifacts/", json={
+            "type": "cover_letter", "version_name": "v1", "application_id": application["id"],
+        }).json()
+        client.post(f"/api/artifacts/{artifact['id']}/sections/", json={"name": f"s{i}", "type": "text", "content": "x"})
+        client.post(f"/api/artifacts/{seed['artifact']['id']}/metrics/", json={"name": f"m{i}"})
+
+
+@pytest.mark.parametrize("path", BUDGETS)
+def test_list_query_count_does_not_grow_with_rows(client, seed, path):
+    url = path.format(artifact=seed["artifact"]["id"])
+    add_rows(client, seed, 2)
+    with count_queries() as few:
+        assert client.get(url).status_code == 200
+    add_rows(client, seed, 10)
+    with assert_max_queries(BUDGETS[path]) as many:
+        assert client.get(url).status_code == 200
+    assert many.count == few.count, many.repeated()
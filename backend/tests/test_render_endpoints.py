@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from config.settings import BASE_STORAGE_PATH
+
+
+def test_markdown_render_leaves_no_working_files(client, seed):
+    before = set(Path(BASE_STORAGE_PATH).iterdir())
+    res = client.post("/api/cover-letter/create/md",
+                      json={"username": "heather", "application_id": seed["application"]["id"]})
+    assert res.status_code == 200
+    assert "I want the SRE role at Acme." in res.text
+    added = {p.name for p in set(Path(BASE_STORAGE_PATH).iterdir()) - before}
+    # The latest markdown is published for the ODT/PDF endpoints; the working directory is gone.
+    assert added <= {f"cover_letter_{seed['application']['id']}.md"}
+    assert not any(name.startswith("render-") for name in added)
+
+
+def test_odt_without_markdown_is_404(client, seed):
+    res = client.post("/api/cover_letter/create/odt",
+                      json={"username": "heather", "application_id": seed["application"]["id"] + 1000})
+    assert res.status_code == 404
+
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from services.resume_service import build_md, load_yaml
+from services.resume_store_service import compare_with_yaml, import_yaml, load_resume_data
+
+RESUME_YAML = Path(__file__).resolve().parents[1] / "config" / "resume.yaml"
+
+
+def test_stored_profile_renders_like_the_yaml(db):
+    data = load_yaml(RESUME_YAML)
+    import_yaml(data, "default", db)
+    assert compare_with_yaml(data, "default", db) == []
+
+
+def test_skills_heading_is_dropped_when_the_filter_keeps_no_skills(db):
+    data = {**load_yaml(RESUME_YAML), "skills": [{"header": "Languages", "skill": "Python", "tags": ["python"]}]}
+    import_yaml(data, "default", db)
+    stored = load_resume_data("default", {"teacher"}, set(), "any", db)
+    assert stored["skills"] == []
+    assert "Technical Skills" not in build_md(stored, set(), set(), "any")
+    assert build_md(stored, set(), set(), "any") == build_md(data, {"teacher"}, set(), "any")
+    assert "Technical Skills" in build_md(data, {"python"}, set(), "any")
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from models.models import Job
+
+
+def test_collection_etag_round_trip(client, seed):
+    first = client.get("/api/jobs/")
+    etag = first.headers["etag"]
+    assert client.get("/api/jobs/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"/api/jobs/{seed['job']['id']}", json={"title": "Staff SRE"})
+    changed = client.get("/api/jobs/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()[0]["title"] == "Staff SRE"
+    assert client.get("/api/jobs/", headers={"If-None-Match": changed.headers["etag"]}).status_code == 304
+
+
+def test_collection_etag_changes_when_updated_at_does_not(client, seed, db):
+    job_id = seed["job"]["id"]
+    stamp = db.get(Job, job_id).updated_at
+    etag = client.get("/api/jobs/").headers["etag"]
+
+    client.put(f"/api/jobs/{job_id}", json={"title": "Staff SRE"})
+    # An edit within the same clock tick (updated_at has one-second resolution on SQLite).
+    db.execute(update(Job).where(Job.id == job_id).values(updated_at=stamp))
+    db.commit()
+    changed = client.get("/api/jobs/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()[0]["title"] == "Staff SRE"
+
+
+def test_row_etag_round_trip(client, seed):
+    url = f"/api/jobs/{seed['job']['id']}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.put(url, json={"notes": "referral"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_updated_since_returns_changes_and_deletes(client, seed):
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+    doomed = client.post("/api/jobs/", json={"company": "Initech", "title": "SRE", "role_id": seed["role"]["id"]}).json()
+    client.delete(f"/api/jobs/{doomed['id']}")
+    client.put(f"/api/jobs/{seed['job']['id']}", json={"title": "Staff SRE"})
+
+    body = client.get("/api/jobs/", params={"updated_since": since}).json()
+    assert body["reset"] is False
+    assert [job["title"] for job in body["items"]] == ["Staff SRE"]
+    assert body["deleted"] == [doomed["id"]]
+
+    later = client.get("/api/jobs/", params={"updated_since": body["watermark"]}).json()
+    # The watermark is moved back by SYNC_WATERMARK_OVERLAP_SECONDS, so recent changes are sent again.
+    assert later["deleted"] == [doomed["id"]]
+    assert [job["title"] for job in later["items"]] == ["Staff SRE"]
+
+
+def test_updated_since_before_tombstone_retention_resets(client, seed):
+    client.post("/api/jobs/", json={"company": "Initech", "title": "SRE", "role_id": seed["role"]["id"]})
+    since = (datetime.now(timezone.utc) - timedelta(days=365)).isoformat()
+    body = client.get("/api/jobs/", params={"updated_since": since}).json()
+    assert body["reset"] is True
+    assert body["deleted"] == []
+    assert sorted(job["company"] for job in body["items"]) == ["Acme", "Initech"]
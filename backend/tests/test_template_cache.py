@@ -0,0 +1,23 @@
+def render_cover_letter(client, seed):
+    response = client.post("/api/cover-letter/create/md", json={
+        "application_id": seed["application"]["id"], "username": seed["user"]["username"],
+    })
+    assert response.status_code == 200
+    return response.text
+
+
+def test_section_update_renders_new_content_immediately(client, seed):
+    assert "I want the SRE role at Acme." in render_cover_letter(client, seed)
+
+    # Same second as the create: updated_at (and any key built on it) does not change on SQLite.
+    response = client.put(f"/api/sections/{seed['section']['id']}", json={"content": "Now {company} needs a {title}."})
+    assert response.status_code == 200
+
+    text = render_cover_letter(client, seed)
+    assert "Now Acme needs a SRE." in text
+    assert "I want the SRE role" not in text
+
+
+def test_section_render_unescapes_braces(client, seed):
+    client.put(f"/api/sections/{seed['section']['id']}", json={"content": "Dear {{team}} at {company}"})
+    assert "Dear {team} at Acme" in render_cover_letter(client, seed)
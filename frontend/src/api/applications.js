@@ -1,8 +1,14 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listApplications = async () => {
+export const listApplications = async () => fromBootstrap('applications', async () => {
   const response = await client.get('/applications/');
   return response.data;
+});
+
+export const getApplication = async (applicationId) => {
+  const response = await client.get(`/applications/${applicationId}`);
+  return response.data;
 };
 
 export const createApplication = async (payload) => {
@@ -1,8 +1,14 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listArtifacts = async () => {
+export const listArtifacts = async () => fromBootstrap('artifacts', async () => {
   const response = await client.get('/artifacts/');
   return response.data;
+});
+
+export const getArtifact = async (artifactId) => {
+  const response = await client.get(`/artifacts/${artifactId}`);
+  return response.data;
 };
 
 export const createArtifact = async (payload) => {
@@ -20,9 +26,14 @@ export const deleteArtifact = async (artifactId) => {
   return response.data;
 };
 
-export const listSections = async () => {
+export const listSections = async () => fromBootstrap('sections', async () => {
   const response = await client.get('/sections/');
   return response.data;
+});
+
+export const getSection = async (sectionId) => {
+  const response = await client.get(`/sections/${sectionId}`);
+  return response.data;
 };
 
 export const createSection = async (payload) => {
@@ -0,0 +1,34 @@
+import client from './client';
+
+// Sections mount together and each asks for the lists it needs; answer all of those
+// first-paint calls from one GET /bootstrap/ response. Calls made after the snapshot
+// is MAX_AGE_MS old (refreshes, reloads after edits) go to their own endpoints.
+const MAX_AGE_MS = 5000;
+
+let pending = null;
+let loadedAt = null;
+
+const loadBootstrap = () => {
+  if (!pending) {
+    pending = client.get('/bootstrap/').then((response) => {
+      loadedAt = Date.now();
+      return response.data;
+    });
+    pending.catch(() => {
+      pending = null;
+    });
+  }
+  return pending;
+};
+
+export const fromBootstrap = async (key, fetchList) => {
+  if (loadedAt === null || Date.now() - loadedAt < MAX_AGE_MS) {
+    try {
+      const data = await loadBootstrap();
+      if (Date.now() - loadedAt < MAX_AGE_MS && data[key] !== undefined) return data[key];
+    } catch (err) {
+      console.error(err);
+    }
+  }
+  return fetchList();
+};
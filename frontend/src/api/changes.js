@@ -0,0 +1,34 @@
+const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000/api';
+
+// One EventSource shared by every subscriber; it reconnects on its own and resumes
+// from the last event id it saw.
+let source = null;
+const listeners = new Set();
+
+const dispatch = (change) => {
+  listeners.forEach((listener) => {
+    if (change.op === 'reset' || listener.tables.includes(change.table)) {
+      listener.handler(change);
+    }
+  });
+};
+
+const open = () => {
+  source = new EventSource(`${API_BASE_URL}/changes/stream`);
+  source.addEventListener('change', (event) => dispatch(JSON.parse(event.data)));
+  // Sent when the server no longer holds the events we missed: reload instead.
+  source.addEventListener('reset', () => dispatch({ op: 'reset' }));
+};
+
+export const subscribeToChanges = (tables, handler) => {
+  const listener = { tables, handler };
+  listeners.add(listener);
+  if (!source) open();
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && source) {
+      source.close();
+      source = null;
+    }
+  };
+};
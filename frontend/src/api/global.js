@@ -1,6 +1,7 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listLabels = async () => {
+export const listLabels = async () => fromBootstrap('labels', async () => {
   const response = await client.get('/labels/');
   return response.data;
-};
+});
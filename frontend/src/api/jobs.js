@@ -1,8 +1,14 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listJobs = async () => {
+export const listJobs = async () => fromBootstrap('jobs', async () => {
   const response = await client.get('/jobs/');
   return response.data;
+});
+
+export const getJob = async (jobId) => {
+  const response = await client.get(`/jobs/${jobId}`);
+  return response.data;
 };
 
 export const createJob = async (payload) => {
@@ -1,8 +1,14 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listRoles = async () => {
+export const listRoles = async () => fromBootstrap('roles', async () => {
   const response = await client.get('/roles/');
   return response.data;
+});
+
+export const getRole = async (roleId) => {
+  const response = await client.get(`/roles/${roleId}`);
+  return response.data;
 };
 
 export const createRole = async (payload) => {
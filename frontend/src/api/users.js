@@ -1,9 +1,10 @@
 import client from './client';
+import { fromBootstrap } from './bootstrap';
 
-export const listUsers = async () => {
+export const listUsers = async () => fromBootstrap('users', async () => {
   const response = await client.get('/users');
   return response.data;
-};
+});
 
 export const deleteUser = async (userId) => {
   await client.delete(`/users/${userId}`);
@@ -1,8 +1,9 @@
 import React, { useEffect, useState, useMemo } from 'react';
-import { createApplication, deleteApplication, listApplications, updateApplication } from '../api/applications';
-import { listJobs } from '../api/jobs';
+import { createApplication, deleteApplication, getApplication, listApplications, updateApplication } from '../api/applications';
+import { getJob, listJobs } from '../api/jobs';
 import { listUsers } from '../api/users';
 import { formatDate, toInputDate } from './dateUtils';
+import { applyRowChange, useChangeFeed } from './useChangeFeed';
 
 
 const initialForm = {
@@ -78,6 +79,17 @@ function ApplicationSection({ refreshKey, applicationResponseLabels }) {
     fetchUsers();
   }, []);
 
+  useChangeFeed(['applications', 'jobs'], (change) => {
+    if (change.op === 'reset') {
+      fetchApplications();
+      fetchJobs();
+    } else if (change.table === 'applications') {
+      applyRowChange(setApplications, change, getApplication);
+    } else {
+      applyRowChange(setJobs, change, getJob);
+    }
+  });
+
   useEffect(() => {
     // If users endpoint is unavailable, infer user choices from loaded applications.
     if (users.length === 0 && applications.length > 0) {
@@ -4,13 +4,15 @@ import {
   createArtifact,
   deleteArtifact,
   detachSectionFromArtifact,
+  getArtifact,
   listArtifactSections,
   listArtifacts,
   listSections,
   updateArtifact,
 } from '../api/artifacts';
-import { listApplications } from '../api/applications';
+import { getApplication, listApplications } from '../api/applications';
 import { formatDateTime } from './dateUtils';
+import { applyRowChange, useChangeFeed } from './useChangeFeed';
 
 const TYPE_OPTIONS = [
   { value: 'resume', label: 'Resume' },
@@ -105,6 +107,24 @@ function ArtifactSection({ refreshKey }) {
     fetchArtifactSections(selectedArtifactId);
   }, [selectedArtifactId]);
 
+  useChangeFeed(['artifacts', 'sections', 'applications'], (change) => {
+    if (change.op === 'reset') {
+      fetchArtifacts();
+      fetchSections();
+      fetchApplications();
+      fetchArtifactSections(selectedArtifactId);
+    } else if (change.table === 'artifacts') {
+      applyRowChange(setArtifacts, change, getArtifact);
+    } else if (change.table === 'sections') {
+      applyRowChange(setSections, change);
+      if (artifactSections.some((section) => section.id === change.row_id)) {
+        fetchArtifactSections(selectedArtifactId);
+      }
+    } else {
+      applyRowChange(setApplications, change, getApplication);
+    }
+  });
+
   useEffect(() => {
     const maxOrder = artifactSections.reduce((max, section) => Math.max(max, Number(section.section_order || 0)), 0);
     setSectionOrder(maxOrder + 1);
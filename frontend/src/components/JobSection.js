@@ -1,7 +1,8 @@
 import React, { useEffect, useState, useMemo } from 'react';
-import { createJob, deleteJob, listJobs, updateJob } from '../api/jobs';
+import { createJob, deleteJob, getJob, listJobs, updateJob } from '../api/jobs';
 import { listRoles } from '../api/roles';
 import { formatDate, toInputDate } from './dateUtils';
+import { applyRowChange, useChangeFeed } from './useChangeFeed';
 
 
 
@@ -65,6 +66,17 @@ function JobSection({ refreshKey, jobStatusLabels }) {
     fetchRoles();
   }, []);
 
+  useChangeFeed(['jobs', 'roles'], (change) => {
+    if (change.op === 'reset') {
+      fetchJobs();
+      fetchRoles();
+    } else if (change.table === 'jobs') {
+      applyRowChange(setJobs, change, getJob);
+    } else {
+      applyRowChange(setRoles, change);
+    }
+  });
+
   const formatRoleLabel = (role) => {
     const lane = (role?.lane || '').replaceAll('_', ' ');
     return lane ? `${lane} (ID ${role.id})` : `Role ${role.id}`;
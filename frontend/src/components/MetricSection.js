@@ -1,7 +1,8 @@
 import React, { useEffect, useState } from 'react';
 import { createMetric, deleteMetric, listMetricsForArtifact, updateMetric } from '../api/metrics';
-import { listArtifacts } from '../api/artifacts';
+import { getArtifact, listArtifacts } from '../api/artifacts';
 import { formatDateTime } from './dateUtils';
+import { applyRowChange, useChangeFeed } from './useChangeFeed';
 
 const FONT_OPTIONS = [
   { value: '', label: 'None' },
@@ -90,6 +91,20 @@ function MetricSection({ refreshKey }) {
     fetchArtifacts();
   }, []);
 
+  useChangeFeed(['artifact_metrics', 'artifacts'], (change) => {
+    if (change.op === 'reset') {
+      fetchArtifacts();
+      fetchMetrics(filterArtifactId);
+    } else if (change.table === 'artifacts') {
+      applyRowChange(setArtifacts, change, getArtifact);
+    } else if (change.op === 'delete') {
+      setMetrics((prev) => prev.filter((item) => item.id !== change.row_id));
+    } else if (filterArtifactId && change.data?.artifact_id === Number(filterArtifactId)) {
+      // Metrics are only listed per artifact, so reload that list.
+      fetchMetrics(filterArtifactId);
+    }
+  });
+
   const handleChange = (event) => {
     const { name, value, type, checked } = event.target;
     setFormData((prev) => ({
@@ -1,5 +1,6 @@
 import React, { useEffect, useState, useMemo } from 'react';
 import { createRole, deleteRole, listRoles, updateRole } from '../api/roles';
+import { applyRowChange, useChangeFeed } from './useChangeFeed';
 
 const initialForm = {
   lane: 'software_engineering',
@@ -44,6 +45,14 @@ function RoleSection({ refreshKey, laneLabels }) {
     fetchRoles();
   }, []);
 
+  useChangeFeed(['roles'], (change) => {
+    if (change.op === 'reset') {
+      fetchRoles();
+    } else {
+      applyRowChange(setRoles, change);
+    }
+  });
+
   const handleChange = (event) => {
     const { name, value } = event.target;
     setFormData((prev) => ({
@@ -0,0 +1,85 @@
+import { useEffect, useRef } from 'react';
+import { subscribeToChanges } from '../api/changes';
+
+// Changes are handed over in batches: they are collected until the feed has been quiet for
+// BATCH_WINDOW_MS (at most MAX_BATCH_DELAY_MS), then only the last change per row is delivered.
+// A batch of more than BULK_CHANGES rows (a bulk import, an archive run) is delivered as one
+// { op: 'reset' } instead, so the lists reload once rather than patching row by row.
+const BATCH_WINDOW_MS = 250;
+const MAX_BATCH_DELAY_MS = 2000;
+const BULK_CHANGES = 25;
+
+// Calls handler({ table, op, row_id, data }) for changes to the given tables,
+// and with { op: 'reset' } when the list should be reloaded from scratch.
+export function useChangeFeed(tables, handler) {
+  const handlerRef = useRef(handler);
+  handlerRef.current = handler;
+  const key = tables.join(',');
+
+  useEffect(() => {
+    let pending = new Map();
+    let reset = false;
+    let firstAt = null;
+    let timer = null;
+
+    const flush = () => {
+      const changes = [...pending.values()];
+      const reload = reset || changes.length > BULK_CHANGES;
+      pending = new Map();
+      reset = false;
+      firstAt = null;
+      timer = null;
+      if (reload) {
+        handlerRef.current({ op: 'reset' });
+      } else {
+        changes.forEach((change) => handlerRef.current(change));
+      }
+    };
+
+    const unsubscribe = subscribeToChanges(key.split(','), (change) => {
+      if (change.op === 'reset') {
+        reset = true;
+      } else {
+        const rowKey = `${change.table}:${change.row_id}`;
+        pending.delete(rowKey); // keep batches in feed order by the row's latest change
+        pending.set(rowKey, change);
+      }
+      firstAt = firstAt ?? Date.now();
+      clearTimeout(timer);
+      timer = setTimeout(flush, Math.max(0, Math.min(BATCH_WINDOW_MS, firstAt + MAX_BATCH_DELAY_MS - Date.now())));
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, [key]);
+}
+
+// Applies a change to a list of rows: drops deleted rows, otherwise inserts or replaces the row.
+// Lists of plain rows take it from change.data; lists whose rows nest related objects pass
+// fetchRow to load the row as the API returns it (null means it no longer belongs in the list).
+export async function applyRowChange(setRows, change, fetchRow) {
+  if (change.op === 'delete') {
+    setRows((prev) => prev.filter((item) => item.id !== change.row_id));
+    return;
+  }
+  let row = change.data;
+  if (fetchRow) {
+    try {
+      row = await fetchRow(change.row_id);
+    } catch (err) {
+      if (err.response?.status !== 404) {
+        console.error(err);
+        return;
+      }
+      row = null;
+    }
+  }
+  setRows((prev) => {
+    const rest = prev.filter((item) => item.id !== change.row_id);
+    if (!row) return rest;
+    return prev.some((item) => item.id === change.row_id)
+      ? prev.map((item) => (item.id === change.row_id ? row : item))
+      : [...prev, row];
+  });
+}